@@ -0,0 +1 @@
+"""Bancs d'essai du moteur de recommandation : python -m benchmarks.run"""
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import pickle
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+
+# =========================
+# BANCS D'ESSAI : CHARGEMENT, VECTORISATION, INDEX, REQUÊTES
+# =========================
+
+DEFAULT_SIZES = [8_000, 50_000, 200_000, 500_000]
+N_QUERIES = 200
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+# Latence simulée du traducteur (secondes par appel) : aucun appel réseau
+TRANSLATOR_LATENCY = 0.05
+# Comparaison : ralentissement signalé au-delà de ce ratio, hors latences sous le bruit
+REGRESSION_RATIO = 1.2
+NOISE_FLOOR_MS = 1.0
+# Mesures où une baisse est une régression
+HIGHER_IS_BETTER = {'ann_recall'}
+# Sessions Streamlit simulées (threads) et reruns par session pour le coût du cache
+SESSIONS = 24
+RERUNS = 20
+# Au-delà, les copies simultanées de st.cache_data dépasseraient la mémoire d'une machine de test
+RERUN_MAX_FILMS = 50_000
+
+def timed(func, *args, **kwargs):
+    """(résultat, secondes) d'un appel"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, round(time.perf_counter() - start, 4)
+
+def latencies(func, items):
+    """p50/p95 (ms) de `func` sur chaque élément de `items`"""
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    samples = 1000 * np.array(samples)
+    return {'p50_ms': round(float(np.percentile(samples, 50)), 3),
+            'p95_ms': round(float(np.percentile(samples, 95)), 3)}
+
+def rerun_cost(load, sessions=SESSIONS, reruns=RERUNS):
+    """Coût d'un accès au cache par rerun, `sessions` sessions en parallèle.
+
+    Latence p50/p95 (ms) mesurée sans traçage, puis pic de mémoire allouée
+    (Mo, tracemalloc) pendant une seconde passe.
+    """
+    samples = []
+
+    def session(_):
+        for _ in range(reruns):
+            start = time.perf_counter()
+            load()
+            samples.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(sessions) as pool:
+        list(pool.map(session, range(sessions)))
+    latency = 1000 * np.array(samples)
+    tracemalloc.start()
+    with ThreadPoolExecutor(sessions) as pool:
+        list(pool.map(session, range(sessions)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'p50_ms': round(float(np.percentile(latency, 50)), 3),
+            'p95_ms': round(float(np.percentile(latency, 95)), 3),
+            'peak_alloc_mb': round(peak / 1e6, 1)}
+
+def stub_translator(latency):
+    """Traducteur local : préfixe les textes après une attente fixe par appel"""
+    def translate(texts, target):
+        time.sleep(latency)
+        return [f"[{target}] {text}" for text in texts]
+    return translate
+
+def bench_size(n_films, n_queries=N_QUERIES, translator_latency=TRANSLATOR_LATENCY, seed=0):
+    """Mesures pour un catalogue synthétique de `n_films` films (processus dédié)"""
+    from sklearn.metrics.pairwise import cosine_similarity
+    from benchmarks.synthetic import synthetic_catalog
+    from creuze.catalog_store import RECOMMENDER_COLUMNS, ingest_catalog, load_catalog, read_catalog
+    from creuze.facets import FacetIndex
+    from creuze.shared import cow_view, enable_copy_on_write
+    from creuze.recommender import FieldIndex, LSHIndex, MovieRecommender, get_recommendations
+    from creuze.title_search import TitleSearchIndex
+    from creuze.translation_store import TranslationStore
+
+    metrics = {'films': n_films}
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory(prefix='creuze-bench-') as tmp:
+        csv_path = os.path.join(tmp, 'catalogue.csv')
+        parquet_path = os.path.join(tmp, 'catalogue.parquet')
+        catalog, metrics['generate_s'] = timed(synthetic_catalog, n_films, seed)
+        catalog.to_csv(csv_path, index=False)
+        del catalog
+
+        # Chargement : conversion CSV -> Parquet (une fois), puis lecture comme load_movie_data
+        _, metrics['ingest_s'] = timed(ingest_catalog, csv_path, parquet_path)
+        df, metrics['load_s'] = timed(load_catalog, parquet_path, columns=RECOMMENDER_COLUMNS)
+        features = read_catalog(parquet_path, ['features'])['features']
+
+        # Accès au catalogue à chaque rerun : copie désérialisée (ce que fait st.cache_data)
+        # ou vue Copy-on-Write de l'exemplaire partagé (st.cache_resource + creuze.shared)
+        if n_films <= RERUN_MAX_FILMS:
+            enable_copy_on_write()
+            pickled = pickle.dumps(df)
+            metrics['rerun_cache_data'] = rerun_cost(lambda: pickle.loads(pickled))
+            metrics['rerun_shared_view'] = rerun_cost(lambda: cow_view(df))
+            del pickled
+
+        # Vectorisation TF-IDF et index
+        engine, metrics['vectorize_s'] = timed(MovieRecommender, df, features)
+        del features
+        ann, metrics['index_ann_s'] = timed(LSHIndex, engine.tfidf_matrix)
+        titles, metrics['index_titles_s'] = timed(TitleSearchIndex, df['Titre'])
+        facets, metrics['index_facets_s'] = timed(FacetIndex, df)
+        fields, metrics['index_fields_s'] = timed(FieldIndex, df)
+        metrics['engine_mb'] = round(sum(engine.memory_usage().values()) / 1e6, 1)
+
+        # Latence des requêtes, sur les mêmes films pour toutes les méthodes
+        rows = rng.choice(n_films, size=min(n_queries, n_films), replace=False)
+        matrix = engine.tfidf_matrix
+        metrics['query_cosine_similarity'] = latencies(
+            lambda row: np.argsort(-cosine_similarity(matrix[row], matrix)[0])[:7], rows)
+        metrics['query_exact'] = latencies(lambda row: engine.top_k(row), rows)
+        # Filtres : masque bitmap calculé par requête, appliqué avant la sélection
+        filters = {'annee_min': 2000, 'note_min': 6.5, 'duree_max': 120, 'genre': ['Drama']}
+        metrics['query_exact_filtered'] = latencies(
+            lambda row: engine.top_k(row, allowed=facets.mask(filters)), rows)
+        # Poids par champ : somme pondérée des produits creux, sans revectoriser
+        weights = {'realisateur': 2.0, 'synopsis': 0.5}
+        metrics['query_weighted'] = latencies(
+            lambda row: engine.top_k(row, score=fields.scorer(weights)), rows)
+        engine.ann = ann
+        metrics['query_ann'] = latencies(lambda row: engine.top_k_batch([row], backend='ann'), rows)
+        report = engine.recall_report(n_queries=len(rows), seed=seed)
+        metrics['ann_recall'] = round(report['recall'], 3)
+        metrics['ann_candidates'] = round(report['mean_candidates'])
+        engine.ann = None
+        metrics['get_recommendations'] = latencies(
+            lambda row: get_recommendations(engine.ids[row], df, engine), rows)
+        prefixes = [title[:rng.integers(3, 8)] for title in df['Titre'].iloc[rows]]
+        metrics['title_search'] = latencies(titles.search, prefixes)
+
+        # Traductions (traducteur simulé) : 7 synopsis par page, cache vide puis plein
+        store = TranslationStore(os.path.join(tmp, 'translations.sqlite'),
+                                 backend=stub_translator(translator_latency))
+        pages = [list(df['Synopsis'].iloc[rows[start:start + 7]]) for start in range(0, len(rows), 7)]
+        metrics['translate_page_cold'] = latencies(store.translate_many, pages)
+        metrics['translate_page_warm'] = latencies(store.translate_many, pages)
+        metrics['translate_one_warm'] = latencies(store.translate, [page[0] for page in pages])
+
+    metrics['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return metrics
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_all(sizes, n_queries=N_QUERIES, translator_latency=TRANSLATOR_LATENCY):
+    """Un processus par taille : le pic de mémoire de l'un ne fausse pas les autres"""
+    results = []
+    for n_films in sizes:
+        command = [sys.executable, '-m', 'benchmarks.run', '--single', str(n_films),
+                   '--queries', str(n_queries), '--translator-latency', str(translator_latency)]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+        print(f"{n_films:>8} films : chargement {results[-1]['load_s']:.2f} s, "
+              f"vectorisation {results[-1]['vectorize_s']:.1f} s, "
+              f"top-k exact p95 {results[-1]['query_exact']['p95_ms']:.1f} ms, "
+              f"RSS {results[-1]['peak_rss_mb']:.0f} Mo", file=sys.stderr)
+    return {
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'queries': n_queries,
+        'translator_latency_s': translator_latency,
+        'results': results,
+    }
+
+def compare(baseline, current):
+    """Ratios courant / référence des mesures communes (> 1 : plus lent)"""
+    rows = []
+    base_by_size = {result['films']: result for result in baseline['results']}
+    for result in current['results']:
+        base = base_by_size.get(result['films'])
+        if base is None:
+            continue
+        for name, value in result.items():
+            old = base.get(name)
+            latency = isinstance(value, dict) and isinstance(old, dict)
+            if latency:
+                value, old, name = value['p95_ms'], old['p95_ms'], f"{name}.p95_ms"
+            if name != 'films' and isinstance(value, (int, float)) and old:
+                ratio = value / old
+                worse = old / value if name in HIGHER_IS_BETTER and value else ratio
+                regression = worse > REGRESSION_RATIO and not (latency and value < NOISE_FLOOR_MS)
+                rows.append((result['films'], name, old, value, ratio, regression))
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bancs d'essai sur catalogues synthétiques")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--queries', type=int, default=N_QUERIES)
+    parser.add_argument('--translator-latency', type=float, default=TRANSLATOR_LATENCY)
+    parser.add_argument('--output', help="Fichier JSON (défaut : benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Résultats de référence à comparer (JSON)")
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(bench_size(args.single, args.queries, args.translator_latency)))
+        sys.exit()
+
+    report = run_all(args.sizes, args.queries, args.translator_latency)
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Résultats : {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for n_films, name, old, new, ratio, regression in compare(baseline, report):
+            flag = "  <- régression" if regression else ""
+            print(f"{n_films:>8} {name:<32} {old:>10.3f} -> {new:>10.3f}  x{ratio:.2f}{flag}")
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# CATALOGUES SYNTHÉTIQUES AU SCHÉMA DE Database_finale.csv
+# =========================
+
+GENRES = ['Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary', 'Drama',
+          'Family', 'Fantasy', 'History', 'Horror', 'Music', 'Mystery', 'Romance',
+          'Science Fiction', 'Thriller', 'War', 'Western']
+CATEGORIES = ['Art et Essai', 'Comédie Française', 'Blockbuster Américain']
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ne', 'to', 'su', 'vi', 'de', 'an', 'ber', 'chal',
+             'mon', 'tri', 'gau', 'lier', 'rou', 'fon', 'pel', 'dor']
+# Vocabulaire des synopsis : fréquences de Zipf, et un thème par film pour
+# que les voisins TF-IDF ne soient pas du bruit
+VOCABULARY_SIZE = 30_000
+N_TOPICS = 500
+TOPIC_WORDS = 40
+SYNOPSIS_WORDS = 45
+TOPIC_SHARE = 0.4
+
+def _words(rng, n, syllables=3):
+    """`n` mots pseudo-aléatoires prononçables"""
+    parts = np.array(SYLLABLES, dtype=object)[rng.integers(0, len(SYLLABLES), (n, syllables))]
+    return np.array(["".join(row) for row in parts], dtype=object)
+
+def _people(rng, n):
+    """`n` noms « Prénom Nom »"""
+    return np.array([f"{first.title()} {last.title()}"
+                     for first, last in zip(_words(rng, n, 2), _words(rng, n, 3))], dtype=object)
+
+def synthetic_catalog(n_films, seed=0):
+    """Catalogue de `n_films` films aux colonnes de Database_finale.csv"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.unique(_words(rng, 3 * VOCABULARY_SIZE))[:VOCABULARY_SIZE]
+    rng.shuffle(vocabulary)
+    directors = _people(rng, max(50, n_films // 8))
+    actors = _people(rng, max(200, n_films // 2))
+
+    # Synopsis : mots du thème du film mêlés à des mots courants (loi de Zipf)
+    topics = rng.integers(0, N_TOPICS, n_films)
+    topic_words = rng.integers(0, len(vocabulary), (N_TOPICS, TOPIC_WORDS))
+    common = np.minimum(rng.zipf(1.3, (n_films, SYNOPSIS_WORDS)) - 1, len(vocabulary) - 1)
+    themed = topic_words[topics[:, None], rng.integers(0, TOPIC_WORDS, (n_films, SYNOPSIS_WORDS))]
+    words = np.where(rng.random((n_films, SYNOPSIS_WORDS)) < TOPIC_SHARE, themed, common)
+    synopsis = [" ".join(row) for row in vocabulary[words]]
+
+    # Genres et équipes corrélés au thème, comme dans un vrai catalogue
+    genre_names = np.array(GENRES, dtype=object)
+    genres = [",".join(genre_names[[t % len(GENRES), (t * 7 + k) % len(GENRES)]])
+              for t, k in zip(topics, rng.integers(1, 4, n_films))]
+    cast = actors[(topics[:, None] * 13 + rng.integers(0, 60, (n_films, 5))) % len(actors)]
+    titles = vocabulary[rng.integers(0, 2000, (n_films, 3))]
+    n_words = rng.integers(1, 4, n_films)
+
+    return pd.DataFrame({
+        'Titre': [" ".join(row[:k]).title() for row, k in zip(titles, n_words)],
+        'Genre': genres,
+        'Réalisateur': directors[(topics * 3 + rng.integers(0, 3, n_films)) % len(directors)],
+        'Acteur': [", ".join(row[:3]) for row in cast],
+        'Actrice': [", ".join(row[3:]) for row in cast],
+        'Synopsis': synopsis,
+        'Note': rng.normal(6.3, 1.1, n_films).clip(1, 10).round(1),
+        'Durée': rng.normal(105, 20, n_films).clip(60, 240).round().astype(int),
+        'Année_de_Sortie': rng.integers(1960, 2025, n_films),
+        'Affiche_de_Film': [f"/bench{i}.jpg" for i in range(n_films)],
+        'Catégorie': rng.choice(CATEGORIES, n_films),
+    })
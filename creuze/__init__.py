@@ -0,0 +1,6 @@
+"""Chargement du catalogue et moteur de recommandation, sans dépendance à Streamlit.
+
+Les sous-modules sont importés à la demande (`creuze.recommender`,
+`creuze.service`...) : importer le paquet seul ne charge ni pandas ni
+scikit-learn.
+"""
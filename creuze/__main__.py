@@ -0,0 +1,87 @@
+import argparse
+import json
+import sys
+from .facets import FILTER_NAMES, RANGE_FACETS, VALUE_FACETS
+from .recommender import FIELD_COLUMNS
+from .service import CATALOGS, RecommendationService
+from .server import DEFAULT_HOST, DEFAULT_PORT, make_server
+
+# =========================
+# LIGNE DE COMMANDE : python -m creuze
+# =========================
+
+def film_key(args):
+    return args.id if args.id is not None else args.title
+
+def film_filters(args):
+    return {name: getattr(args, name, None) for name in FILTER_NAMES}
+
+def field_weights(args):
+    return {name: getattr(args, f'poids_{name}') for name in FIELD_COLUMNS}
+
+def print_json(body):
+    print(json.dumps(body, ensure_ascii=False), flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m creuze',
+                                     description="Recommandations de films sans Streamlit")
+    parser.add_argument('--catalog', choices=list(CATALOGS), default='selection')
+    parser.add_argument('--backend', choices=['exact', 'ann'], help="Défaut : selon le catalogue")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    recommend = commands.add_parser('recommend', help="Films similaires (un titre par ligne sur "
+                                                      "l'entrée standard si ni --title ni --id)")
+    recommend.add_argument('--title')
+    recommend.add_argument('--id', type=int)
+    recommend.add_argument('--k', type=int, default=6)
+    for name in RANGE_FACETS:
+        recommend.add_argument(f'--{name}-min', type=float)
+        recommend.add_argument(f'--{name}-max', type=float)
+    for name in VALUE_FACETS:
+        recommend.add_argument(f'--{name}', action='append', help="Répétable : l'une ou l'autre valeur")
+    for name in FIELD_COLUMNS:
+        recommend.add_argument(f'--poids-{name}', type=float,
+                               help="Poids du champ (similarité pondérée par champ)")
+
+    search = commands.add_parser('search', help="Recherche de titres")
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+
+    serve = commands.add_parser('serve', help="Point d'accès HTTP/JSON")
+    serve.add_argument('--host', default=DEFAULT_HOST)
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+
+    args = parser.parse_args(argv)
+    service = RecommendationService(args.catalog, args.backend)
+
+    if args.command == 'search':
+        print_json(service.search(args.query, args.limit))
+    elif args.command == 'serve':
+        server = make_server(service, args.host, args.port)
+        print(f"Écoute sur http://{args.host}:{server.server_port} "
+              f"({len(service.engine.ids)} films)", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    elif args.title is not None or args.id is not None:
+        try:
+            print_json(service.recommend(film_key(args), args.k, film_filters(args),
+                                         field_weights(args)))
+        except (KeyError, ValueError) as exc:
+            parser.exit(1, f"{exc.args[0]}\n")
+    else:
+        # Moteur gardé chaud : une ligne JSON par titre lu
+        for line in sys.stdin:
+            title = line.strip()
+            if not title:
+                continue
+            try:
+                print_json(service.recommend(title, args.k, film_filters(args), field_weights(args)))
+            except (KeyError, ValueError) as exc:
+                print_json({'titre': title, 'erreur': exc.args[0]})
+
+if __name__ == "__main__":
+    main()
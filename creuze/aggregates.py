@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# AGRÉGATS MATÉRIALISÉS DU CATALOGUE (TABLEAU DE BORD KPI)
+# =========================
+
+# Colonnes lues pour recalculer les agrégats d'un catalogue qui ne les a pas encore
+AGGREGATE_COLUMNS = ['Catégorie', 'Genre', 'Année_de_Sortie', 'Pays', 'Note', 'Durée']
+# Bornes des distributions ; la dernière classe de durée est ouverte
+NOTE_BINS = list(range(0, 11))
+DURATION_BINS = [60, 75, 90, 105, 120, 135, 150, 165, 180]
+GENRE_SEPARATOR = ','
+# Indicateurs CNC du tableau de bord : catégorie de part de marché -> libellé
+MARKET_SHARE_KPIS = {'Films Français': "Part Films FR (23)", 'Art et Essai': "Part Art & Essai (23)"}
+LOCAL_ENTITY = 'Creuse (23)'
+NATIONAL_ENTITY = 'Moyenne Nationale'
+
+def _counts(values):
+    """Effectif de chaque valeur, du plus fréquent au moins fréquent"""
+    return {str(value): int(count) for value, count in values.value_counts().items()}
+
+def _distribution(values, bins, open_ended=False):
+    """Histogramme, moyenne et médiane d'une colonne numérique (valeurs manquantes ignorées)"""
+    values = pd.to_numeric(values, errors='coerce').astype('float64').dropna().to_numpy()
+    edges = bins + [np.inf] if open_ended else bins
+    counts, _ = np.histogram(values, bins=edges)
+    # Classes repérées par leur borne inférieure
+    return {
+        'bins': list(bins) if open_ended else list(bins[:-1]),
+        'counts': counts.tolist(),
+        'mean': round(float(values.mean()), 2) if len(values) else None,
+        'median': round(float(np.median(values)), 2) if len(values) else None,
+    }
+
+def catalog_aggregates(df):
+    """Composition du catalogue : films par catégorie, genre, décennie et pays, notes et durées"""
+    aggregates = {'films': len(df)}
+    if 'Catégorie' in df.columns:
+        aggregates['categories'] = _counts(df['Catégorie'].dropna().astype(str))
+    if 'Genre' in df.columns:
+        genres = df['Genre'].astype('string').str.split(GENRE_SEPARATOR).explode().str.strip()
+        aggregates['genres'] = _counts(genres[genres.notna() & (genres != '')])
+    if 'Année_de_Sortie' in df.columns:
+        years = pd.to_numeric(df['Année_de_Sortie'], errors='coerce').dropna()
+        decades = (years // 10 * 10).astype(int).value_counts().sort_index()
+        aggregates['decades'] = {str(decade): int(count) for decade, count in decades.items()}
+    if 'Pays' in df.columns:
+        # Pays de production TMDB (listes de dictionnaires ou codes aplatis)
+        from .etl.tmdb import explode_list
+        countries = explode_list(df['Pays'].reset_index(drop=True), 'iso_3166_1')
+        aggregates['origins'] = _counts(countries.drop_duplicates()['value'])
+    if 'Note' in df.columns:
+        aggregates['note'] = _distribution(df['Note'], NOTE_BINS)
+    if 'Durée' in df.columns:
+        aggregates['duree'] = _distribution(df['Durée'], DURATION_BINS, open_ended=True)
+    return aggregates
+
+def market_kpis(df_creuse, df_nat):
+    """Chiffres clés CNC du tableau de bord : (libellé, valeur, écart) calculés depuis les données"""
+    shares = df_creuse.pivot(index='Catégorie', columns='Entité', values='Part de marché (%)')
+    kpis = []
+    for category, label in MARKET_SHARE_KPIS.items():
+        local, national = shares.loc[category, LOCAL_ENTITY], shares.loc[category, NATIONAL_ENTITY]
+        kpis.append((label, f"{local:g}%", f"{local - national:+.1f}% vs Nat"))
+    latest = df_nat.sort_values('Année').iloc[-1]
+    kpis.append((f"Entrées Nat. {int(latest['Année'])}", f"{latest['Entrées_millions']:g}M",
+                 f"{latest['Evolution_%']:+.1f}%"))
+    return kpis
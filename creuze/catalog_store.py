@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .aggregates import AGGREGATE_COLUMNS, catalog_aggregates
+from .metrics import METRICS
+
+# =========================
+# STOCKAGE LOCAL DU CATALOGUE (PARQUET)
+# =========================
+
+CATALOG_CSV_URL = 'https://raw.githubusercontent.com/Yachre/Creuze/refs/heads/main/Database_finale.csv'
+CATALOG_PATH = 'Database_finale.parquet'
+
+FILM_ID = 'Id_film'
+
+# Catalogue complet produit par l'ETL du notebook (colonnes TMDB/IMDb d'origine)
+FULL_CATALOG_CSV = 'Dataset_1960_Plus.csv'
+FULL_CATALOG_PATH = 'Dataset_1960_Plus.parquet'
+FULL_CATALOG_COLUMNS = {
+    'id': FILM_ID,
+    'original_title': 'Titre',
+    'genres_x': 'Genre',
+    'director_name': 'Réalisateur',
+    'actors_names': 'Acteur',
+    'actresses_names': 'Actrice',
+    'overview': 'Synopsis',
+    'vote_average': 'Note',
+    'runtime': 'Durée',
+    'startYear': 'Année_de_Sortie',
+    'poster_path': 'Affiche_de_Film',
+}
+
+# Colonnes affichées par la page de recommandation ; le texte `features` n'est lu
+# que pour vectoriser, puis libéré
+RECOMMENDER_COLUMNS = [FILM_ID, 'Titre', 'Genre', 'Réalisateur', 'Acteur', 'Actrice', 'Synopsis',
+                       'Note', 'Durée', 'Année_de_Sortie', 'Affiche_de_Film', 'Catégorie']
+
+# Types stockés : champs répétés en catégories, années et durées en entiers nullables.
+# Une colonne n'est catégorielle que si ses valeurs se répètent assez pour y gagner.
+CATEGORY_COLUMNS = ['Genre', 'Réalisateur', 'Acteur', 'Actrice', 'Catégorie']
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+CATALOG_DTYPES = {
+    'Note': 'float32',
+    'Durée': 'Int16',
+    'Année_de_Sortie': 'Int16',
+}
+
+def build_features(df):
+    """Concatène les champs texte utilisés par le moteur de recommandation"""
+    columns_to_combine = ['Genre', 'Réalisateur', 'Acteur', 'Actrice', 'Synopsis']
+    for col in columns_to_combine:
+        df[col] = df[col].fillna('')
+    df['features'] = df['Genre'] + " " + df['Réalisateur'] + " " + \
+                     df['Acteur'] + " " + df['Actrice'] + " " + df['Synopsis']
+    # Identifiant stable du film (TMDB), indépendant de la position de la ligne
+    if FILM_ID not in df.columns:
+        df[FILM_ID] = np.arange(len(df))
+    return df
+
+def catalog_version(df):
+    """Empreinte du catalogue : change dès que le texte des films change"""
+    hashes = pd.util.hash_pandas_object(df['features'], index=False).values
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+def compact_dtypes(df):
+    """Types compacts : nombres réduits, entiers nullables, catégories pour les champs répétés"""
+    for col, dtype in CATALOG_DTYPES.items():
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            df[col] = values.round() if dtype.startswith('Int') else values
+            df[col] = df[col].astype(dtype)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(df):
+            df[col] = df[col].astype('category')
+    return df
+
+def ingest_catalog(source=CATALOG_CSV_URL, dest=CATALOG_PATH, rename=None):
+    """Convertit une fois le CSV du catalogue en Parquet typé avec `features` précalculé"""
+    usecols = list(rename) if rename else None
+    df = pd.read_csv(source, usecols=usecols)
+    if rename:
+        df = df.rename(columns=rename)
+        df = df.drop_duplicates(subset=[FILM_ID], keep='first').reset_index(drop=True)
+    df = compact_dtypes(build_features(df))
+
+    # La version et les agrégats du tableau de bord sont stockés dans les métadonnées :
+    # les relire ne coûte qu'un accès au schéma
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), b'catalog_version': catalog_version(df).encode(),
+                b'catalog_aggregates': json.dumps(catalog_aggregates(df), ensure_ascii=False).encode()}
+    pq.write_table(table.replace_schema_metadata(metadata), dest)
+    return dest
+
+def read_catalog_version(path=CATALOG_PATH):
+    """Version du catalogue Parquet, lue dans ses métadonnées"""
+    metadata = pq.read_schema(path).metadata or {}
+    if b'catalog_version' in metadata:
+        return metadata[b'catalog_version'].decode()
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+def read_catalog_aggregates(path=CATALOG_PATH):
+    """Agrégats matérialisés à l'ingestion ; recalculés s'ils manquent (Parquet plus ancien)"""
+    metadata = pq.read_schema(path).metadata or {}
+    if b'catalog_aggregates' in metadata:
+        return json.loads(metadata[b'catalog_aggregates'])
+    return catalog_aggregates(read_catalog(path, AGGREGATE_COLUMNS))
+
+def read_catalog(path=CATALOG_PATH, columns=None):
+    """Lit le catalogue Parquet local (mappé en mémoire), seulement les colonnes demandées"""
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in available]
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+def ensure_catalog(path=CATALOG_PATH, source=CATALOG_CSV_URL, rename=None):
+    """Convertit le catalogue depuis `source` s'il n'existe pas encore localement"""
+    if not os.path.exists(path):
+        with METRICS.span('ingest_catalog'):
+            ingest_catalog(source, path, rename=rename)
+    return path
+
+def load_catalog(path=CATALOG_PATH, source=CATALOG_CSV_URL, rename=None, columns=None):
+    """Lit le catalogue local, converti une seule fois depuis `source` s'il est absent"""
+    ensure_catalog(path, source, rename)
+    with METRICS.span('read_catalog'):
+        return read_catalog(path, columns)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convertit le catalogue CSV en Parquet local")
+    parser.add_argument('--source', default=CATALOG_CSV_URL, help="CSV source (URL ou chemin)")
+    parser.add_argument('--dest', default=CATALOG_PATH, help="Fichier Parquet produit")
+    parser.add_argument('--full', action='store_true',
+                        help="Convertit Dataset_1960_Plus.csv (schéma TMDB/IMDb)")
+    args = parser.parse_args()
+
+    if args.full:
+        source = FULL_CATALOG_CSV if args.source == CATALOG_CSV_URL else args.source
+        dest = FULL_CATALOG_PATH if args.dest == CATALOG_PATH else args.dest
+        written = ingest_catalog(source, dest, rename=FULL_CATALOG_COLUMNS)
+    else:
+        written = ingest_catalog(args.source, args.dest)
+    print(f"Catalogue écrit : {written} ({os.path.getsize(written) / 1e6:.1f} Mo)")
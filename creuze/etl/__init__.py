@@ -0,0 +1,4 @@
+"""Chaîne ETL du catalogue : fichiers IMDb (TSV compressés) vers tables Parquet.
+
+Chaque source est un module importable séparément ; rien n'est lu à l'import.
+"""
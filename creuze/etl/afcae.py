@@ -0,0 +1,218 @@
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pandas as pd
+import requests
+from ..metrics import METRICS
+
+# =========================
+# SCRAPING DES FILMS RECOMMANDÉS AFCAE (CONCURRENT, REPRENABLE)
+# =========================
+
+AFCAE_URL = 'https://www.art-et-essai.org/les-films-recommandes'
+AFCAE_PAGES = 355
+AFCAE_CACHE_DIR = os.path.join('data', 'afcae')
+AFCAE_CSV = 'films_afcae_complet.csv'
+# Politesse : requêtes simultanées et débit global (requêtes par seconde, tous workers confondus)
+AFCAE_WORKERS = 4
+AFCAE_RATE = 2.0
+AFCAE_TIMEOUT = 30
+# Réponses « ralentissez » : pause de tous les workers puis nouvel essai de la page
+RETRY_STATUS = {403, 429, 500, 502, 503, 504}
+BLOCKED_PAUSE = 30
+MAX_ATTEMPTS = 4
+
+# Colonnes du tableau des films : classe CSS de la cellule -> colonne produite
+AFCAE_FIELDS = {
+    'Titre': 'views-field-title',
+    'Réalisateur': 'views-field-field-director-text',
+    'Date_Sortie': 'views-field-field-release-date',
+    'Distributeur': 'views-field-field-distributeur-text',
+    'Label': 'views-field-field-label',
+    'VISA': 'views-field-field-visa',
+}
+
+def parse_page(html, page):
+    """Films du tableau d'une page de résultats ("N/A" pour une cellule absente).
+
+    Une réponse sans tableau de résultats (page de défi Cloudflare, gabarit
+    modifié) lève ValueError : la page compte comme un échec et n'est pas
+    sauvegardée, elle sera retentée à la prochaine exécution.
+    """
+    from bs4 import BeautifulSoup
+    body = BeautifulSoup(html, 'html.parser').find('tbody')
+    if body is None:
+        raise ValueError(f"Page {page} : tableau des résultats absent")
+    films = []
+    for row in body.find_all('tr'):
+        film = {}
+        for column, css_class in AFCAE_FIELDS.items():
+            cell = row.find('td', class_=css_class)
+            film[column] = cell.get_text(strip=True) if cell else "N/A"
+        film['Source_Page'] = page
+        films.append(film)
+    return films
+
+def make_session():
+    """Session HTTP : cloudscraper (protection Cloudflare du site) s'il est installé"""
+    if importlib.util.find_spec('cloudscraper') is not None:
+        import cloudscraper
+        return cloudscraper.create_scraper(browser={'browser': 'chrome', 'platform': 'windows',
+                                                    'desktop': True})
+    return requests.Session()
+
+class RateLimiter:
+    """Débit global partagé par les threads : au plus `rate` départs par seconde"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(max(0.0, start - now))
+
+    def pause(self, seconds):
+        """Repousse tous les départs (serveur qui bloque ou sature)"""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+class AfcaeScraper:
+    """Pages AFCAE téléchargées par un pool de threads borné, analysées en parallèle.
+
+    Chaque page analysée est sauvegardée sous `cache_dir` (films, empreinte
+    du HTML, ETag / Last-Modified) : une nouvelle exécution ne télécharge
+    que les pages manquantes, ou revalide les autres avec `refresh` par
+    requêtes conditionnelles. `base_url` peut pointer vers un serveur HTTP
+    local qui sert des pages enregistrées.
+    """
+
+    def __init__(self, cache_dir=AFCAE_CACHE_DIR, base_url=AFCAE_URL, workers=AFCAE_WORKERS,
+                 rate=AFCAE_RATE, timeout=AFCAE_TIMEOUT, blocked_pause=BLOCKED_PAUSE, log=print):
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.workers = workers
+        self.timeout = timeout
+        self.blocked_pause = blocked_pause
+        self.limiter = RateLimiter(rate)
+        self.log = log
+        self._session = make_session()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, page):
+        return os.path.join(self.cache_dir, f"page-{page:04d}.json")
+
+    def checkpoint(self, page):
+        """Sauvegarde d'une page, ou None si elle n'a jamais été analysée"""
+        try:
+            with open(self._path(page), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, entry):
+        """Écriture via un fichier temporaire : une interruption ne laisse pas de page tronquée"""
+        path = self._path(entry['page'])
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def fetch(self, page, previous=None):
+        """(statut, HTML, en-têtes de cache) d'une page ; 304 si `previous` est toujours valide"""
+        headers = {}
+        if previous and previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous and previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+        for attempt in range(MAX_ATTEMPTS):
+            self.limiter.wait()
+            response = self._session.get(self.base_url, params={'page': page}, headers=headers,
+                                         timeout=self.timeout)
+            if response.status_code not in RETRY_STATUS:
+                break
+            self.log(f"Page {page} : HTTP {response.status_code}, pause de {self.blocked_pause} s")
+            self.limiter.pause(self.blocked_pause * (attempt + 1))
+        if response.status_code == 304:
+            return 304, None, {}
+        response.raise_for_status()
+        return response.status_code, response.text, {'etag': response.headers.get('ETag'),
+                                                      'last_modified': response.headers.get('Last-Modified')}
+
+    def run(self, pages=range(AFCAE_PAGES), refresh=False):
+        """Met à jour les sauvegardes des `pages` ; renvoie le nombre de pages par issue"""
+        pages = list(pages)
+        todo = pages if refresh else [page for page in pages if self.checkpoint(page) is None]
+        stats = {'en cache': len(pages) - len(todo), 'téléchargées': 0, 'inchangées': 0, 'échecs': 0}
+        lock = threading.Lock()
+
+        # L'analyse (CPU) tourne dans d'autres processus pendant que les threads téléchargent
+        with ProcessPoolExecutor(max_workers=min(self.workers, os.cpu_count() or 1)) as parsers, \
+                ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='afcae') as fetchers:
+
+            def process(page):
+                previous = self.checkpoint(page)
+                try:
+                    with METRICS.span('afcae_fetch'):
+                        status, html, cache_headers = self.fetch(page, previous)
+                    digest = html and hashlib.sha1(html.encode('utf-8')).hexdigest()
+                    if status == 304 or (previous and digest == previous['sha1']):
+                        result = 'inchangées'
+                    else:
+                        films = parsers.submit(parse_page, html, page).result()
+                        self._save({'page': page, 'sha1': digest, **cache_headers, 'films': films})
+                        result = 'téléchargées'
+                except Exception as error:
+                    self.log(f"Erreur à la page {page} : {error}")
+                    result = 'échecs'
+                METRICS.count('afcae_pages', result)
+                with lock:
+                    stats[result] += 1
+                    done = stats['téléchargées'] + stats['inchangées'] + stats['échecs']
+                if done % 10 == 0:
+                    self.log(f"Progression : {done}/{len(todo)} pages")
+
+            list(fetchers.map(process, todo))
+        return stats
+
+    def films(self, pages=None):
+        """Films de toutes les pages sauvegardées, dans l'ordre des pages.
+
+        Un film revu sur une autre page (pagination décalée entre deux
+        téléchargements) n'est gardé qu'une fois, à sa première page.
+        """
+        entries = [self.checkpoint(page) for page in pages] if pages is not None else [
+            self.checkpoint(int(os.path.basename(path)[5:9]))
+            for path in sorted(glob.glob(os.path.join(self.cache_dir, 'page-*.json')))]
+        rows = [film for entry in entries if entry for film in entry['films']]
+        films = pd.DataFrame(rows, columns=[*AFCAE_FIELDS, 'Source_Page'])
+        return films.drop_duplicates(subset=['Titre', 'VISA'], keep='first').reset_index(drop=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Récupère les films recommandés AFCAE (reprenable)")
+    parser.add_argument('--pages', type=int, default=AFCAE_PAGES, help="Nombre de pages de résultats")
+    parser.add_argument('--base-url', default=AFCAE_URL)
+    parser.add_argument('--cache-dir', default=AFCAE_CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=AFCAE_WORKERS)
+    parser.add_argument('--rate', type=float, default=AFCAE_RATE, help="Requêtes par seconde au plus")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Revalide aussi les pages déjà sauvegardées (requêtes conditionnelles)")
+    parser.add_argument('--dest', default=AFCAE_CSV, help="CSV des films produit")
+    args = parser.parse_args()
+
+    scraper = AfcaeScraper(args.cache_dir, args.base_url, args.workers, args.rate)
+    stats = scraper.run(range(args.pages), refresh=args.refresh)
+    print(", ".join(f"{name} : {count}" for name, count in stats.items()))
+    films = scraper.films(range(args.pages))
+    films.to_csv(args.dest, index=False, encoding='utf-8-sig')
+    print(f"{len(films)} films écrits : {args.dest}")
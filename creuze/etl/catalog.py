@@ -0,0 +1,170 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from .afcae import AFCAE_CSV
+from .imdb import BASICS, NAMES, PRINCIPALS, YEAR_MIN, imdb_source, run_imdb_pipeline
+from .linkage import MATCH_THRESHOLD, afcae_records, catalog_records, link_records
+from .pipeline import ETL_DIR, Pipeline, Stage
+from .tmdb import FilmLinks, explode_list, film_links, joined_values
+
+# =========================
+# CONSTRUCTION DU CATALOGUE : ÉTAPES DU NOTEBOOK
+# =========================
+
+BLOCKBUSTER_VOTE_THRESHOLD = 2000
+MIN_RUNTIME = 60
+
+TMDB_CSV = 'tmdb_final.csv'
+# Artefacts exportés en CSV, aux noms des fichiers produits par le notebook
+EXPORTS = {'films': 'Dataset_1960_Plus.csv', 'finale': 'Database_finale.csv'}
+
+TMDB_DROP = ['homepage', 'video', 'backdrop_path', 'status']
+# Titre et réalisateur AFCAE retirés : ceux de TMDB/IMDb prennent ces noms au renommage
+FINAL_DROP = ['Titre', 'Réalisateur', 'production_companies', 'adult', 'budget', 'genres_y',
+              'release_date', 'title', 'production_companies_name', 'production_companies_country',
+              'countries_clean', 'tagline', 'runtimeMinutes', 'release_date_y', 'director_birth',
+              'row_left', 'row_right', 'title_score', 'director_score', 'year_gap', 'link_score']
+# Réalisateurs absents d'IMDb, complétés à la main dans le notebook
+DIRECTOR_FIXES = {
+    'Ugly Melanie': 'Allan Mauduit',
+    'The Shiny Shrimps': 'Mathias Le Goff',
+    'Fake News': 'Mouloud Achour|Dominique Baumard',
+    'The Adventures of Felix': 'Olivier Ducastel|Jacques Martineau',
+    "Côte d'Azur": 'Olivier Ducastel|Jacques Martineau',
+}
+UNKNOWN_COLUMNS = ['actors_ids', 'actors_names', 'actresses_ids', 'actresses_names', 'director_id',
+                   'overview', 'poster_path', 'Distributeur']
+FINAL_COLUMNS = {
+    'startYear': 'Année_de_Sortie', 'genres_x': 'Genre', 'director_id': 'Réalisateur_id',
+    'director_name': 'Réalisateur', 'actors_ids': 'Acteur_Id', 'actors_names': 'Acteur',
+    'actresses_ids': 'Actrice_Id', 'actresses_names': 'Actrice', 'id': 'Id_film',
+    'original_title': 'Titre', 'overview': 'Synopsis', 'popularity': 'Popularité',
+    'revenue': 'Revenues', 'runtime': 'Durée', 'spoken_languages': 'Langues', 'vote_average': 'Note',
+    'vote_count': 'Nombre_de_Vote', 'production_countries': 'Pays', 'poster_path': 'Affiche_de_Film',
+    'category': 'Catégorie',
+}
+
+# =========================
+# ÉTAPES
+# =========================
+
+def tmdb_stage(*, tmdb_csv):
+    """Export TMDB, avec les noms des sociétés et pays joints par des virgules"""
+    df = pd.read_csv(tmdb_csv)
+    for column, clean in (('production_companies', 'companies_clean'),
+                          ('production_countries', 'countries_clean')):
+        if column in df.columns:
+            df[clean] = joined_values(explode_list(df[column], 'name'), df.index)
+    return df.drop(columns=[col for col in TMDB_DROP if col in df.columns])
+
+def imdb_stage(tmdb, *, imdb_dir, year_min):
+    """Films IMDb des identifiants TMDB, avec réalisateur et têtes d'affiche"""
+    tconsts = tmdb['imdb_id'].dropna().unique()
+    return run_imdb_pipeline(imdb_source(BASICS, imdb_dir), imdb_source(PRINCIPALS, imdb_dir),
+                             imdb_source(NAMES, imdb_dir), tconsts=tconsts, year_min=year_min)
+
+def films_stage(imdb, tmdb):
+    """Fusion IMDb x TMDB (Dataset_1960_Plus) ; la durée TMDB est complétée par IMDb"""
+    df = imdb.merge(tmdb, left_on='tconst', right_on='imdb_id', how='inner')
+    df = df.drop(columns=['imdb_id'])
+    df['runtimeMinutes'] = pd.to_numeric(df['runtimeMinutes'], errors='coerce')
+    if 'runtime' in df.columns:
+        df['runtime'] = pd.to_numeric(df['runtime'], errors='coerce')
+        df['duration'] = df['runtime'].fillna(df['runtimeMinutes'])
+    else:
+        df['duration'] = df['runtimeMinutes']
+    return df
+
+def links_stage(films):
+    """Tables film -> genre, société, pays et pays des sociétés, en codes entiers"""
+    return film_links(films)
+
+def categories_stage(films, links, *, blockbuster_vote_threshold):
+    """Comédies françaises et blockbusters américains, sélectionnés par les tables de liens"""
+    index = FilmLinks(links)
+    french = index.ids('company_country', 'FR')
+    comedies = films[films['id'].isin(np.intersect1d(french, index.ids('genre', 'Comedy')))]
+    blockbusters = films[films['id'].isin(index.ids('company_country', 'US'))
+                         & (films['vote_count'] >= blockbuster_vote_threshold)]
+    return pd.concat([comedies.assign(category='Comédie Française'),
+                      blockbusters.assign(category='Blockbuster Américain')], ignore_index=True)
+
+def afcae_stage(*, afcae_csv):
+    """Films recommandés AFCAE"""
+    return pd.read_csv(afcae_csv)
+
+def art_essai_stage(afcae, films, *, link_threshold, log=print):
+    """Films AFCAE rapprochés du catalogue (titre, réalisateur et année approchés)"""
+    matches, stats = link_records(afcae_records(afcae), catalog_records(films), link_threshold)
+    log("Rapprochement AFCAE : " + ", ".join(f"{name} {value}" for name, value in stats.items()))
+    df = pd.concat([afcae.iloc[matches['row_left']].reset_index(drop=True),
+                    films.iloc[matches['row_right']].reset_index(drop=True),
+                    matches.rename(columns={'score': 'link_score'})], axis=1)
+    return df[(df['runtime'] >= MIN_RUNTIME) | df['runtime'].isna()].reset_index(drop=True)
+
+def finale_stage(art_essai, categories):
+    """Catalogue final de l'application (Database_finale)"""
+    df = pd.concat([art_essai, categories], ignore_index=True)
+    df = df.drop(columns=[col for col in FINAL_DROP if col in df.columns])
+    df = df.drop_duplicates(subset=['id'], keep='first')
+    for title, director in DIRECTOR_FIXES.items():
+        df.loc[df['primaryTitle'] == title, 'director_name'] = director
+    df['category'] = df['category'].fillna('Art et Essai')
+    for col in UNKNOWN_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna('UNKNOWN')
+    df = df.rename(columns=FINAL_COLUMNS).drop(columns=['primaryTitle', 'duration'], errors='ignore')
+    return df[df['Durée'] >= MIN_RUNTIME].reset_index(drop=True)
+
+STAGES = [
+    Stage('tmdb', tmdb_stage, sources=['tmdb_csv']),
+    Stage('imdb', imdb_stage, inputs=['tmdb'], params=['year_min'], sources=['imdb_dir']),
+    Stage('films', films_stage, inputs=['imdb', 'tmdb']),
+    Stage('links', links_stage, inputs=['films']),
+    Stage('categories', categories_stage, inputs=['films', 'links'], params=['blockbuster_vote_threshold']),
+    Stage('afcae', afcae_stage, sources=['afcae_csv']),
+    Stage('art_essai', art_essai_stage, inputs=['afcae', 'films'], params=['link_threshold']),
+    Stage('finale', finale_stage, inputs=['art_essai', 'categories']),
+]
+
+def catalog_pipeline(tmdb_csv=TMDB_CSV, afcae_csv=AFCAE_CSV, imdb_dir=None, year_min=YEAR_MIN,
+                     blockbuster_vote_threshold=BLOCKBUSTER_VOTE_THRESHOLD, link_threshold=MATCH_THRESHOLD,
+                     workdir=ETL_DIR):
+    """Pipeline du catalogue ; `imdb_dir` None : TSV téléchargés depuis IMDb"""
+    return Pipeline(STAGES, workdir=workdir,
+                    params={'year_min': year_min, 'blockbuster_vote_threshold': blockbuster_vote_threshold,
+                            'link_threshold': link_threshold},
+                    sources={'tmdb_csv': tmdb_csv, 'afcae_csv': afcae_csv, 'imdb_dir': imdb_dir})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruit le catalogue (seules les étapes invalidées)")
+    parser.add_argument('targets', nargs='*', help="Étapes voulues (défaut : toutes)")
+    parser.add_argument('--tmdb', default=TMDB_CSV, help="Export TMDB (CSV)")
+    parser.add_argument('--afcae', default=AFCAE_CSV, help="Films AFCAE (CSV de creuze.etl.afcae)")
+    parser.add_argument('--imdb-dir', help="TSV IMDb locaux (défaut : téléchargement)")
+    parser.add_argument('--year-min', type=int, default=YEAR_MIN)
+    parser.add_argument('--blockbuster-votes', type=int, default=BLOCKBUSTER_VOTE_THRESHOLD)
+    parser.add_argument('--link-threshold', type=float, default=MATCH_THRESHOLD,
+                        help="Score minimal d'un rapprochement AFCAE <-> catalogue")
+    parser.add_argument('--workdir', default=ETL_DIR, help="Répertoire des artefacts Parquet")
+    parser.add_argument('--force', nargs='*', default=[], help="Étapes à relancer quoi qu'il arrive")
+    parser.add_argument('--export', help="Répertoire où écrire Dataset_1960_Plus.csv et Database_finale.csv")
+    parser.add_argument('--status', action='store_true', help="Affiche les étapes à jour sans rien exécuter")
+    args = parser.parse_args()
+
+    pipeline = catalog_pipeline(args.tmdb, args.afcae, args.imdb_dir, args.year_min,
+                                args.blockbuster_votes, args.link_threshold, args.workdir)
+    targets = args.targets or None
+    if args.status:
+        for name in pipeline.required(targets):
+            print(f"{name:<12} {'à jour' if pipeline.is_fresh(name) else 'à reconstruire'}")
+    else:
+        for name, state in pipeline.run(targets, force=args.force).items():
+            print(f"{name:<12} {state}")
+        if args.export:
+            os.makedirs(args.export, exist_ok=True)
+            for name, filename in EXPORTS.items():
+                if name in pipeline.required(targets):
+                    pipeline.load(name).to_csv(os.path.join(args.export, filename), index=False,
+                                               encoding='utf-8')
@@ -0,0 +1,193 @@
+import argparse
+import os
+import urllib.request
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from ..metrics import METRICS
+
+# =========================
+# ETL IMDB EN FLUX (TSV COMPRESSÉS, LECTURE PAR BLOCS PYARROW)
+# =========================
+
+IMDB_BASE_URL = 'https://datasets.imdbws.com'
+BASICS = 'title.basics'
+PRINCIPALS = 'title.principals'
+NAMES = 'name.basics'
+IMDB_PATH = 'imdb_films.parquet'
+
+# Filtres appliqués pendant la lecture, bloc par bloc
+YEAR_MIN = 1950
+TITLE_TYPES = ['movie']
+DIRECTOR = 'director'
+CAST_CATEGORIES = ['actor', 'actress']
+TOP_CAST = 5
+# Taille des blocs lus puis filtrés : borne la mémoire, quelle que soit la taille du fichier
+BLOCK_SIZE = 16 << 20
+
+# Colonnes lues dans chaque fichier (les autres ne sont jamais converties)
+BASICS_COLUMNS = ['tconst', 'titleType', 'primaryTitle', 'startYear', 'runtimeMinutes', 'genres']
+PRINCIPALS_COLUMNS = ['tconst', 'ordering', 'nconst', 'category']
+NAMES_COLUMNS = ['nconst', 'primaryName', 'birthYear']
+COLUMN_TYPES = {
+    'tconst': pa.string(), 'nconst': pa.string(), 'titleType': pa.string(),
+    'primaryTitle': pa.string(), 'genres': pa.string(), 'category': pa.string(),
+    'primaryName': pa.string(), 'startYear': pa.int16(), 'runtimeMinutes': pa.int32(),
+    'ordering': pa.int16(), 'birthYear': pa.int16(),
+}
+
+def imdb_source(name, directory=None):
+    """Chemin local `<directory>/<name>.tsv(.gz)` s'il existe, sinon l'URL officielle"""
+    if directory:
+        for filename in (f"{name}.tsv.gz", f"{name}.tsv"):
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"{name}.tsv(.gz) absent de {directory}")
+    return f"{IMDB_BASE_URL}/{name}.tsv.gz"
+
+def _open(source):
+    """Flux décompressé par Arrow : fichier local ou téléchargement, sans copie intermédiaire"""
+    if source.startswith(('http://', 'https://')):
+        stream = pa.PythonFile(urllib.request.urlopen(source), mode='r')
+        return pa.CompressedInputStream(stream, 'gzip') if source.endswith('.gz') else stream
+    return pa.input_stream(source, compression='detect')
+
+def _value_set(values):
+    """Ensemble de référence pour `pc.is_in` (liste, tableau NumPy ou colonne Arrow)"""
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks()
+    return pa.array(values, pa.string())
+
+def iter_tsv(source, columns, block_size=BLOCK_SIZE):
+    """Lots Arrow des seules `columns` d'un TSV IMDb (`\\N` = valeur manquante)"""
+    with _open(source) as stream:
+        reader = pv.open_csv(
+            stream,
+            read_options=pv.ReadOptions(block_size=block_size),
+            # Les TSV IMDb ne sont pas entre guillemets : un " dans un titre est littéral
+            parse_options=pv.ParseOptions(delimiter='\t', quote_char=False),
+            convert_options=pv.ConvertOptions(
+                include_columns=columns, null_values=['\\N'], strings_can_be_null=True,
+                column_types={column: COLUMN_TYPES[column] for column in columns}))
+        yield from reader
+
+def read_filtered(source, columns, predicate, block_size=BLOCK_SIZE):
+    """Table des lignes retenues par `predicate(lot) -> masque`, filtrées bloc par bloc"""
+    batches = []
+    schema = None
+    for batch in iter_tsv(source, columns, block_size):
+        schema = batch.schema
+        kept = batch.filter(predicate(batch))
+        if kept.num_rows:
+            batches.append(kept)
+    if schema is None:
+        schema = pa.schema([(column, COLUMN_TYPES[column]) for column in columns])
+    return pa.Table.from_batches(batches, schema=schema)
+
+def read_basics(source, year_min=YEAR_MIN, title_types=TITLE_TYPES, tconsts=None, block_size=BLOCK_SIZE):
+    """Films de `title.basics` : type, année minimale et, si fournis, identifiants retenus"""
+    title_types = pa.array(title_types, pa.string())
+    tconsts = None if tconsts is None else _value_set(tconsts)
+
+    def keep(batch):
+        mask = pc.and_(pc.is_in(batch['titleType'], value_set=title_types),
+                       pc.greater_equal(batch['startYear'], year_min))
+        if tconsts is not None:
+            mask = pc.and_(mask, pc.is_in(batch['tconst'], value_set=tconsts))
+        return pc.fill_null(mask, False)
+
+    with METRICS.span('etl_imdb_basics'):
+        return read_filtered(source, BASICS_COLUMNS, keep, block_size).drop_columns(['titleType'])
+
+def read_principals(source, tconsts, categories=(DIRECTOR, *CAST_CATEGORIES), block_size=BLOCK_SIZE):
+    """Réalisateurs et interprètes des films `tconsts` dans `title.principals`"""
+    tconsts = _value_set(tconsts)
+    categories = pa.array(categories, pa.string())
+
+    def keep(batch):
+        return pc.fill_null(pc.and_(pc.is_in(batch['category'], value_set=categories),
+                                    pc.is_in(batch['tconst'], value_set=tconsts)), False)
+
+    with METRICS.span('etl_imdb_principals'):
+        return read_filtered(source, PRINCIPALS_COLUMNS, keep, block_size)
+
+def read_names(source, nconsts, block_size=BLOCK_SIZE):
+    """Nom et année de naissance des seules personnes `nconsts` (semi-jointure en flux)"""
+    nconsts = _value_set(nconsts)
+
+    def keep(batch):
+        return pc.fill_null(pc.is_in(batch['nconst'], value_set=nconsts), False)
+
+    with METRICS.span('etl_imdb_names'):
+        return read_filtered(source, NAMES_COLUMNS, keep, block_size)
+
+def select_crew(principals, top_cast=TOP_CAST):
+    """Premier réalisateur de chaque film et ses `top_cast` premiers acteurs et actrices"""
+    crew = principals.to_pandas().sort_values(['tconst', 'ordering'], kind='stable')
+    directors = crew[crew['category'] == DIRECTOR].drop_duplicates('tconst')
+    cast = crew[crew['category'].isin(CAST_CATEGORIES)]
+    cast = cast[cast.groupby(['tconst', 'category']).cumcount() < top_cast]
+    return pd.concat([directors, cast], ignore_index=True)
+
+def _join_by_film(people, column, name):
+    """Valeurs de `column` jointes par '|' pour chaque film, dans l'ordre du générique.
+
+    Agrégation Arrow en un seul thread (l'ordre des lignes est conservé) : pas
+    d'appel Python par film.
+    """
+    table = pa.Table.from_pandas(people[['tconst', column]], preserve_index=False).cast(
+        pa.schema([('tconst', pa.string()), (column, pa.string())]))
+    grouped = table.group_by('tconst', use_threads=False).aggregate([(column, 'list')])
+    joined = pc.binary_join(grouped[f'{column}_list'], '|')
+    return pd.Series(joined.to_pandas().to_numpy(), index=grouped['tconst'].to_pandas(), name=name)
+
+def build_imdb_table(basics, crew, names):
+    """Une ligne par film, aux colonnes de l'ETL du notebook (director_*, actors_*, actresses_*)"""
+    films = basics.to_pandas()
+    people = crew.merge(names.to_pandas(), on='nconst', how='left')
+
+    directors = people[people['category'] == DIRECTOR].set_index('tconst')
+    films = films.join(directors[['nconst', 'primaryName', 'birthYear']].rename(columns={
+        'nconst': 'director_id', 'primaryName': 'director_name', 'birthYear': 'director_birth'}),
+        on='tconst')
+
+    for category, prefix in (('actor', 'actors'), ('actress', 'actresses')):
+        cast = people[people['category'] == category]
+        films = films.join(_join_by_film(cast, 'nconst', f'{prefix}_ids'), on='tconst')
+        films = films.join(_join_by_film(cast.dropna(subset=['primaryName']), 'primaryName',
+                                         f'{prefix}_names'), on='tconst')
+    return films.reset_index(drop=True)
+
+def run_imdb_pipeline(basics_source, principals_source, names_source, tconsts=None,
+                      year_min=YEAR_MIN, block_size=BLOCK_SIZE):
+    """Films IMDb (fichiers locaux ou URL) ; `tconsts` restreint aux films connus de TMDB"""
+    with METRICS.span('etl_imdb'):
+        basics = read_basics(basics_source, year_min, tconsts=tconsts, block_size=block_size)
+        crew = select_crew(read_principals(principals_source, basics['tconst'],
+                                           block_size=block_size))
+        # Seules les personnes réellement citées sont gardées de name.basics
+        names = read_names(names_source, crew['nconst'].unique(), block_size=block_size)
+        return build_imdb_table(basics, crew, names)
+
+def tmdb_imdb_ids(path):
+    """Identifiants IMDb (`imdb_id`) d'un export TMDB en CSV"""
+    ids = pd.read_csv(path, usecols=['imdb_id'])['imdb_id'].dropna()
+    return ids[ids.str.startswith('tt')].unique()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extrait les films IMDb des TSV officiels (en flux)")
+    parser.add_argument('--dir', help="Répertoire des TSV locaux (défaut : téléchargement IMDb)")
+    parser.add_argument('--tmdb', help="CSV TMDB : ne garder que ses films (colonne imdb_id)")
+    parser.add_argument('--year-min', type=int, default=YEAR_MIN)
+    parser.add_argument('--dest', default=IMDB_PATH, help="Fichier Parquet produit")
+    args = parser.parse_args()
+
+    table = run_imdb_pipeline(imdb_source(BASICS, args.dir), imdb_source(PRINCIPALS, args.dir),
+                              imdb_source(NAMES, args.dir),
+                              tconsts=tmdb_imdb_ids(args.tmdb) if args.tmdb else None,
+                              year_min=args.year_min)
+    pq.write_table(pa.Table.from_pandas(table, preserve_index=False), args.dest)
+    print(f"{len(table)} films écrits : {args.dest} ({os.path.getsize(args.dest) / 1e6:.1f} Mo)")
@@ -0,0 +1,195 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from ..metrics import METRICS
+
+# =========================
+# RAPPROCHEMENT AFCAE <-> CATALOGUE (BLOCAGE PUIS SIMILARITÉ)
+# =========================
+
+# Fenêtre de blocage sur l'année : sortie française souvent postérieure à la sortie d'origine
+YEAR_TOLERANCE = 2
+# Clé ignorée si elle désigne trop de films du catalogue (mot courant, nom fréquent)
+MAX_BLOCK_SIZE = 200
+# Score = poids titre x similarité titre + poids réalisateur x similarité réalisateur
+# - pénalité par année d'écart ; un couple est retenu à partir du seuil
+TITLE_WEIGHT = 0.6
+DIRECTOR_WEIGHT = 0.4
+YEAR_PENALTY = 0.03
+MATCH_THRESHOLD = 0.8
+# Titre traduit (« Le Parrain » / « The Godfather ») : couple retenu sous le seuil si le
+# réalisateur concorde, à une année près, et qu'il n'a qu'un film candidat de part et d'autre
+DIRECTOR_MATCH = 0.9
+DIRECTOR_YEAR_GAP = 1
+# Mots vides exclus des clés de blocage (gardés pour le calcul de similarité)
+STOP_WORDS = {'le', 'la', 'les', 'l', 'un', 'une', 'des', 'de', 'du', 'd', 'et', 'a', 'au', 'aux',
+              'en', 'the', 'an', 'of', 'and', 'in', 'to'}
+MIN_TOKEN_LENGTH = 3
+
+# Alphabet des textes normalisés (espace, a-z, 0-9) : un trigramme tient dans un entier < 37^3
+ALPHABET = ' abcdefghijklmnopqrstuvwxyz0123456789'
+_CODES = np.zeros(256, dtype=np.int32)
+_CODES[np.frombuffer(ALPHABET.encode('ascii'), dtype=np.uint8)] = np.arange(len(ALPHABET))
+
+def normalize_text(values):
+    """Minuscules sans accents ni ponctuation, espaces simples"""
+    values = pd.Series(values, dtype='object').fillna('').astype(str)
+    values = (values.str.normalize('NFKD').str.encode('ascii', errors='ignore')
+              .str.decode('utf-8').str.lower())
+    return values.str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+
+def name_key(values):
+    """Nom normalisé aux mots triés : « TAN Royston » et « Royston Tan » se confondent"""
+    return normalize_text(values).str.split().map(lambda parts: " ".join(sorted(parts)))
+
+def release_year(values, dayfirst=False):
+    """Année d'une date texte (NaN si illisible)"""
+    return pd.to_datetime(values, dayfirst=dayfirst, errors='coerce').dt.year
+
+def _tokens(values):
+    """Mots significatifs de chaque valeur : une ligne par (row, token)"""
+    words = values.str.split().explode().dropna()
+    words = words[(words.str.len() >= MIN_TOKEN_LENGTH) & ~words.isin(STOP_WORDS)]
+    return pd.DataFrame({'row': words.index, 'token': words.values}).drop_duplicates()
+
+def blocking_keys(records, tolerance=0):
+    """(ligne, clé) : mots du titre et du réalisateur par année, et titre complet sans année"""
+    keys = []
+    years = records['year'].astype('Int64')
+    for prefix, column in (('t', 'title'), ('d', 'director')):
+        frame = _tokens(records[column])
+        frame = frame.assign(token=prefix + ':' + frame['token'],
+                             year=years.loc[frame['row']].values).dropna()
+        for shift in range(-tolerance, tolerance + 1):
+            keys.append(pd.DataFrame({'row': frame['row'].values, 'token': frame['token'].values,
+                                      'year': (frame['year'] + shift).values}))
+    titles = records['title'][records['title'] != '']
+    keys.append(pd.DataFrame({'row': titles.index, 'token': 'x:' + titles.values, 'year': -1}))
+    keys = pd.concat(keys, ignore_index=True)
+    keys['year'] = keys['year'].astype('int64')
+    return keys
+
+def candidate_pairs(left, right, tolerance=YEAR_TOLERANCE, max_block_size=MAX_BLOCK_SIZE):
+    """Couples (gauche, droite) partageant au moins une clé de blocage"""
+    left_keys = blocking_keys(left, tolerance)
+    right_keys = blocking_keys(right)
+    sizes = right_keys.groupby(['token', 'year'])['row'].transform('size')
+    right_keys = right_keys[sizes <= max_block_size]
+    pairs = left_keys.merge(right_keys, on=['token', 'year'], suffixes=('_left', '_right'))
+    return pairs[['row_left', 'row_right']].drop_duplicates().reset_index(drop=True)
+
+def trigram_matrix(values):
+    """Trigrammes de caractères de chaque texte normalisé : lignes binaires de norme 1.
+
+    Calcul NumPy sur la concaténation des textes, sans boucle Python par trigramme.
+    """
+    padded = [f" {value} " for value in values]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    codes = _CODES[np.frombuffer("".join(padded).encode('ascii'), dtype=np.uint8)]
+    rows = np.repeat(np.arange(len(padded)), lengths)
+    # Un trigramme est valide s'il ne chevauche pas deux textes
+    valid = np.flatnonzero(rows[:-2] == rows[2:]) if len(rows) > 2 else np.array([], dtype=np.int64)
+    base = len(ALPHABET)
+    trigrams = (codes[valid] * base + codes[valid + 1]) * base + codes[valid + 2]
+    matrix = sp.csr_matrix((np.ones(len(valid), dtype=np.float32), (rows[valid], trigrams)),
+                           shape=(len(padded), base ** 3))
+    matrix.data[:] = 1.0
+    return normalize(matrix)
+
+def _similarity(left_values, right_values, left_rows, right_rows):
+    """Cosinus des trigrammes de caractères, couple par couple (chaînes distinctes vectorisées)"""
+    left_values, right_values = left_values.values[left_rows], right_values.values[right_rows]
+    values = pd.unique(np.concatenate([left_values, right_values]))
+    matrix = trigram_matrix(values)
+    index = pd.Index(values)
+    left_codes, right_codes = index.get_indexer(left_values), index.get_indexer(right_values)
+    return np.asarray(matrix[left_codes].multiply(matrix[right_codes]).sum(axis=1)).ravel()
+
+def score_pairs(left, right, pairs):
+    """Similarités titre (meilleur des titres proposés), réalisateur, écart d'années et score"""
+    left_rows, right_rows = pairs['row_left'].to_numpy(), pairs['row_right'].to_numpy()
+    title = np.zeros(len(pairs), dtype=np.float32)
+    for column in [col for col in right.columns if col.startswith('title')]:
+        title = np.maximum(title, _similarity(left['title'], right[column], left_rows, right_rows))
+    director = _similarity(left['director'], right['director'], left_rows, right_rows)
+    gap = np.abs(left['year'].to_numpy(dtype=float)[left_rows] - right['year'].to_numpy(dtype=float)[right_rows])
+    gap = np.nan_to_num(gap, nan=YEAR_TOLERANCE)
+    scored = pairs.assign(title_score=title, director_score=director, year_gap=gap)
+    scored['score'] = TITLE_WEIGHT * title + DIRECTOR_WEIGHT * director - YEAR_PENALTY * gap
+    return scored
+
+def director_year_matches(scored):
+    """Couples sans titre commun mais de même réalisateur et même année, sans ambiguïté"""
+    same = (scored['director_score'] >= DIRECTOR_MATCH) & (scored['year_gap'] <= DIRECTOR_YEAR_GAP)
+    # Deux films du réalisateur à ces dates : seul le titre pourrait les départager
+    unique = ((same.groupby(scored['row_left']).transform('sum') == 1)
+              & (same.groupby(scored['row_right']).transform('sum') == 1))
+    return same & unique
+
+def best_matches(scored, threshold=MATCH_THRESHOLD):
+    """Couples au-dessus du seuil ou retenus par réalisateur et année, chaque film n'étant
+    apparié qu'une fois (meilleurs scores d'abord)"""
+    kept = scored[(scored['score'] >= threshold) | director_year_matches(scored)]
+    kept = kept.sort_values('score', ascending=False, kind='stable')
+    kept = kept.drop_duplicates('row_left').drop_duplicates('row_right')
+    return kept.sort_values('row_left').reset_index(drop=True)
+
+def link_records(left, right, threshold=MATCH_THRESHOLD):
+    """(couples retenus, statistiques) entre deux tables aux colonnes title(_*), director, year"""
+    with METRICS.span('linkage'):
+        pairs = candidate_pairs(left, right)
+        scored = score_pairs(left, right, pairs)
+        matches = best_matches(scored, threshold)
+    exact = ((matches['title_score'] > 0.999) & (matches['director_score'] > 0.999)).sum()
+    stats = {
+        'films': len(left),
+        'catalogue': len(right),
+        'couples_candidats': len(pairs),
+        'candidats_par_film': round(len(pairs) / max(len(left), 1), 1),
+        'appariés': len(matches),
+        'taux': round(len(matches) / max(len(left), 1), 3),
+        'exacts': int(exact),
+        'approchés': int(len(matches) - exact),
+        'par_réalisateur': int((matches['score'] < threshold).sum()),
+        'score_médian': round(float(matches['score'].median()), 3) if len(matches) else None,
+    }
+    return matches, stats
+
+def afcae_records(afcae):
+    """Films AFCAE au format du rapprochement"""
+    return pd.DataFrame({'title': normalize_text(afcae['Titre']).values,
+                         'director': name_key(afcae['Réalisateur']).values,
+                         'year': release_year(afcae['Date_Sortie'], dayfirst=True).values})
+
+def catalog_records(films):
+    """Films du catalogue (TMDB x IMDb) au format du rapprochement : titre d'origine et titre TMDB"""
+    year = release_year(films['release_date']) if 'release_date' in films.columns else films['startYear']
+    records = pd.DataFrame({'title': normalize_text(films['original_title']).values,
+                            'director': name_key(films['director_name']).values,
+                            'year': pd.Series(year).fillna(films['startYear']).values})
+    if 'title' in films.columns:
+        records['title_tmdb'] = normalize_text(films['title']).values
+    return records
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rapproche les films AFCAE du catalogue TMDB/IMDb")
+    parser.add_argument('--afcae', default='films_afcae_complet.csv')
+    parser.add_argument('--films', default='Dataset_1960_Plus.csv')
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD)
+    parser.add_argument('--output', help="CSV des couples retenus (titres, scores)")
+    args = parser.parse_args()
+
+    afcae = pd.read_csv(args.afcae)
+    films = pd.read_csv(args.films, low_memory=False)
+    start = time.perf_counter()
+    matches, stats = link_records(afcae_records(afcae), catalog_records(films), args.threshold)
+    for name, value in stats.items():
+        print(f"{name:<20} {value}")
+    print(f"{'durée_s':<20} {time.perf_counter() - start:.2f}")
+    if args.output:
+        report = matches.assign(Titre=afcae['Titre'].values[matches['row_left']],
+                                original_title=films['original_title'].values[matches['row_right']])
+        report.to_csv(args.output, index=False)
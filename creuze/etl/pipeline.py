@@ -0,0 +1,184 @@
+import hashlib
+import inspect
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from ..metrics import METRICS
+
+# =========================
+# ÉTAPES ETL NOMMÉES, ARTEFACTS PARQUET CLÉS PAR EMPREINTE
+# =========================
+
+ETL_DIR = os.path.join('data', 'etl')
+# Paquet dont les modules entrent dans l'empreinte des étapes ; pris du pipeline lui-même :
+# sous `python -m creuze.etl.catalog`, le module des étapes s'appelle '__main__'
+PACKAGE = __name__.split('.')[0]
+
+def content_hash(df):
+    """Empreinte du contenu d'un DataFrame (valeurs et noms de colonnes)"""
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def source_fingerprint(source):
+    """Empreinte d'une source externe : taille et date des fichiers, ou l'URL elle-même.
+
+    Les fichiers bruts (TSV IMDb de plusieurs Go) ne sont pas relus pour
+    être hachés : une copie modifiée change de taille ou de date.
+    """
+    if source is None or not os.path.exists(str(source)):
+        return repr(source)
+    paths = [source]
+    if os.path.isdir(source):
+        paths = sorted(os.path.join(root, name) for root, _, names in os.walk(source) for name in names)
+    return ";".join(f"{os.path.relpath(path, source) if path != source else os.path.basename(path)}:"
+                    f"{os.stat(path).st_size}-{os.stat(path).st_mtime_ns}" for path in paths)
+
+def _names(code):
+    """Noms globaux utilisés par un code objet et ses fonctions imbriquées"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _names(const)
+    return names
+
+def code_fingerprint(func):
+    """Empreinte du code d'une étape : sa source, celle des modules du paquet qu'elle
+    appelle (entiers : leurs fonctions s'appellent entre elles) et ses constantes.
+
+    Modifier un assistant (rapprochement, lecture IMDb) invalide l'étape qui
+    s'en sert, sans toucher les étapes voisines du même module.
+    """
+    parts = {func.__qualname__: inspect.getsource(func)}
+    for name in sorted(_names(func.__code__)):
+        if name not in func.__globals__:
+            continue
+        value = func.__globals__[name]
+        module = value if inspect.ismodule(value) else inspect.getmodule(value)
+        if not inspect.ismodule(value) and getattr(value, '__module__', None) == func.__module__:
+            parts[name] = inspect.getsource(value)
+        elif module is None or module.__name__.split('.')[0] != PACKAGE:
+            # Constante de module (liste de colonnes, seuil) ou fonction d'une bibliothèque
+            if not callable(value) and not inspect.ismodule(value):
+                parts[name] = repr(value)
+        else:
+            parts[module.__name__] = inspect.getsource(module)
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+class Stage:
+    """Étape nommée : `func(*artefacts amont, **paramètres et sources)` -> DataFrame.
+
+    Une fonction qui accepte un argument `log` reçoit celui du pipeline
+    pour ses messages (statistiques, avertissements). `version` force
+    l'invalidation quand le résultat dépend d'un code non suivi par
+    `code_fingerprint` (fonction d'un autre paquet, fichier de règles).
+    """
+
+    def __init__(self, name, func, inputs=(), params=(), sources=(), version=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.params = list(params)
+        self.sources = list(sources)
+        self.version = version
+        # Modifier le code de l'étape l'invalide, comme un changement de paramètre
+        self.code_hash = code_fingerprint(func)
+
+class Pipeline:
+    """Étapes exécutées dans l'ordre, chacune seulement si sa clé a changé.
+
+    La clé d'une étape est l'empreinte de son code, de ses paramètres, de
+    ses sources externes et du contenu de ses artefacts amont : une étape
+    relancée qui produit le même résultat n'invalide pas la suite. Chaque
+    artefact est écrit de façon atomique ; après une interruption, une
+    nouvelle exécution reprend à la première étape sans artefact valide.
+    """
+
+    def __init__(self, stages, params=None, sources=None, workdir=ETL_DIR):
+        self.stages = {stage.name: stage for stage in stages}
+        self.params = dict(params or {})
+        self.sources = dict(sources or {})
+        self.workdir = workdir
+
+    def path(self, name):
+        return os.path.join(self.workdir, f"{name}.parquet")
+
+    def _metadata(self, name):
+        """Métadonnées ETL de l'artefact (`stage_key`, `content_hash`), vides s'il est absent"""
+        if not os.path.exists(self.path(name)):
+            return {}
+        metadata = pq.read_schema(self.path(name)).metadata or {}
+        return {key.decode(): value.decode() for key, value in metadata.items()
+                if key in (b'stage_key', b'content_hash')}
+
+    def stage_key(self, name):
+        """Empreinte des entrées de l'étape ; None si un artefact amont manque"""
+        stage = self.stages[name]
+        upstream = [self._metadata(dep).get('content_hash') for dep in stage.inputs]
+        if None in upstream:
+            return None
+        payload = {
+            'stage': name,
+            'code': stage.code_hash,
+            'version': stage.version,
+            'params': {param: self.params[param] for param in stage.params},
+            'sources': {source: source_fingerprint(self.sources.get(source)) for source in stage.sources},
+            'inputs': dict(zip(stage.inputs, upstream)),
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def is_fresh(self, name):
+        """Artefact présent, produit à partir des entrées actuelles, et amont à jour"""
+        key = self.stage_key(name)
+        return (key is not None and self._metadata(name).get('stage_key') == key
+                and all(self.is_fresh(dep) for dep in self.stages[name].inputs))
+
+    def required(self, targets=None):
+        """Étapes nécessaires aux `targets` (toutes par défaut), dans l'ordre du pipeline"""
+        if targets is None:
+            return list(self.stages)
+        needed, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].inputs)
+        return [name for name in self.stages if name in needed]
+
+    def load(self, name):
+        """Artefact d'une étape"""
+        return pq.read_table(self.path(name)).to_pandas()
+
+    def _write(self, name, df, key):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), b'stage_key': key.encode(),
+                    b'content_hash': content_hash(df).encode()}
+        # Écriture puis renommage : un artefact à moitié écrit n'est jamais lu
+        tmp = f"{self.path(name)}.tmp"
+        pq.write_table(table.replace_schema_metadata(metadata), tmp)
+        os.replace(tmp, self.path(name))
+
+    def run(self, targets=None, force=(), log=print):
+        """Exécute les étapes invalidées ; renvoie {étape: 'à jour' | 'exécutée'}"""
+        os.makedirs(self.workdir, exist_ok=True)
+        status = {}
+        for name in self.required(targets):
+            stage = self.stages[name]
+            key = self.stage_key(name)
+            if name not in force and self._metadata(name).get('stage_key') == key:
+                status[name] = 'à jour'
+                continue
+            with METRICS.span(f"etl:{name}"):
+                frames = [self.load(dep) for dep in stage.inputs]
+                kwargs = {param: self.params[param] for param in stage.params}
+                kwargs.update({source: self.sources.get(source) for source in stage.sources})
+                if 'log' in inspect.signature(stage.func).parameters:
+                    kwargs['log'] = log or (lambda message: None)
+                df = stage.func(*frames, **kwargs)
+                self._write(name, df, key)
+            status[name] = 'exécutée'
+            if log:
+                log(f"{name} : {len(df)} lignes")
+        return status
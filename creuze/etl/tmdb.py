@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# =========================
+# NORMALISATION DES LISTES TMDB (GENRES, SOCIÉTÉS, PAYS) EN TABLES DE LIENS
+# =========================
+
+# Champ lié -> (colonne du catalogue, clé lue dans les listes de dictionnaires TMDB)
+LINK_FIELDS = {
+    'genre': ('genres_x', 'name'),
+    'company': ('production_companies', 'name'),
+    'country': ('production_countries', 'iso_3166_1'),
+    'company_country': ('production_companies_country', 'iso_3166_1'),
+}
+# Séparateur des éléments d'une liste TMDB, et des listes déjà aplaties (« Comedy,Drama », « FR, US »)
+ITEM_SEPARATOR = r"\}\s*,\s*\{"
+PLAIN_SEPARATOR = r"\s*[,|]\s*"
+
+def _item_pattern(key):
+    """Valeur de `key` dans « {'key': 'valeur'} » (repr Python) ou « {"key": "valeur"} » (JSON)"""
+    key = key.replace('_', r'\_')
+    return rf"""['"]{key}['"]\s*:\s*(?:'(?P<single>(?:[^'\\]|\\.)*)'|"(?P<double>(?:[^"\\]|\\.)*)")"""
+
+def _exploded(selected, items, flat):
+    """(row, value) : ligne d'origine de chaque élément aplati"""
+    rows = selected.index.to_numpy()[pc.list_parent_indices(items).to_numpy()]
+    return pd.DataFrame({'row': rows, 'value': flat.to_pandas()})
+
+def explode_list(values, key='name'):
+    """Une ligne (row, value) par élément : listes de dictionnaires TMDB ou texte séparé par des virgules.
+
+    Découpage et extraction se font par les noyaux Arrow (RE2) sur toute la
+    colonne, sans `json.loads` ligne à ligne : les apostrophes des noms
+    (« L'Atelier ») ne font plus échouer la ligne.
+    """
+    values = pd.Series(values, dtype='object').dropna().astype(str)
+    is_list = values.str.lstrip().str.startswith('[').to_numpy(dtype=bool)
+    is_dicts = is_list & values.str.contains('{', regex=False).to_numpy(dtype=bool)
+
+    # Listes de dictionnaires : valeur de `key` dans chaque élément
+    selected = values[is_dicts]
+    items = pc.split_pattern_regex(pa.array(selected.to_numpy(dtype=object), pa.string()), ITEM_SEPARATOR)
+    found = pc.extract_regex(pc.list_flatten(items), _item_pattern(key))
+    flat = pc.if_else(pc.not_equal(found.field('single'), ''), found.field('single'), found.field('double'))
+    parts = [_exploded(selected, items, pc.replace_substring_regex(flat, r"\\(['\"])", r"\1"))]
+
+    # Texte aplati, ou liste de chaînes (« ['FR', 'US'] ») dont crochets et guillemets sont retirés
+    selected = values[~is_dicts]
+    column = pa.array(selected.to_numpy(dtype=object), pa.string())
+    column = pc.if_else(pa.array(is_list[~is_dicts]), pc.replace_substring_regex(column, r"[\[\]'\"]", ""),
+                        column)
+    items = pc.split_pattern_regex(column, PLAIN_SEPARATOR)
+    parts.append(_exploded(selected, items, pc.utf8_trim_whitespace(pc.list_flatten(items))))
+
+    exploded = pd.concat(parts, ignore_index=True)
+    exploded = exploded[exploded['value'].notna() & (exploded['value'] != '')]
+    return exploded.sort_values('row', kind='stable').reset_index(drop=True)
+
+def joined_values(exploded, index, sep=", "):
+    """Éléments de chaque ligne rejoints (colonnes *_clean du notebook), NaN si aucun"""
+    rows, starts = np.unique(exploded['row'].to_numpy(), return_index=True)
+    offsets = np.append(starts, len(exploded)).astype(np.int32)
+    lists = pa.ListArray.from_arrays(offsets, pa.array(exploded['value'].to_numpy(dtype=object), pa.string()))
+    joined = pd.Series(pc.binary_join(lists, sep).to_numpy(zero_copy_only=False), index=rows, dtype='object')
+    return joined.reindex(index)
+
+def film_links(films, fields=LINK_FIELDS, id_column='id'):
+    """Table film -> valeur de chaque champ, avec un code entier par valeur distincte du champ"""
+    tables = []
+    for field, (column, key) in fields.items():
+        if column not in films.columns:
+            continue
+        exploded = explode_list(films[column], key)
+        codes, _ = pd.factorize(exploded['value'], sort=True)
+        tables.append(pd.DataFrame({
+            'field': field,
+            'code': codes.astype(np.int32),
+            'value': exploded['value'].values,
+            id_column: films[id_column].to_numpy()[films.index.get_indexer(exploded['row'])],
+        }).drop_duplicates(['code', id_column]))
+    if not tables:
+        return pd.DataFrame(columns=['field', 'code', 'value', id_column])
+    # Triée par champ puis code : chaque valeur occupe une plage contiguë de lignes
+    links = pd.concat(tables, ignore_index=True).sort_values(['field', 'code', id_column])
+    return links.reset_index(drop=True)
+
+class FilmLinks:
+    """Index des tables de liens : films d'une valeur retrouvés par code, sans parcours de texte.
+
+    Pour chaque champ, le dictionnaire (valeur -> code) est un dict Python et
+    les identifiants sont rangés par code : une valeur correspond à une
+    tranche, localisée par recherche dichotomique.
+    """
+
+    def __init__(self, links, id_column='id'):
+        self.fields = {}
+        for field, rows in links.groupby('field', sort=False, observed=True):
+            codes = rows['code'].to_numpy()
+            dictionary = rows.drop_duplicates('code')
+            self.fields[field] = (
+                {value.lower(): code for value, code in zip(dictionary['value'], dictionary['code'])},
+                codes,
+                rows[id_column].to_numpy(),
+            )
+
+    def values(self, field):
+        """Valeurs connues du champ (en minuscules)"""
+        return sorted(self.fields[field][0]) if field in self.fields else []
+
+    def ids(self, field, values):
+        """Identifiants des films liés à l'une des `values` du champ (casse ignorée)"""
+        if field not in self.fields:
+            return np.array([], dtype=np.int64)
+        dictionary, codes, ids = self.fields[field]
+        values = [values] if isinstance(values, str) else values
+        wanted = [dictionary[value.lower()] for value in values if value.lower() in dictionary]
+        slices = [ids[np.searchsorted(codes, code, 'left'):np.searchsorted(codes, code, 'right')]
+                  for code in wanted]
+        if len(slices) == 1:
+            return slices[0]
+        return np.unique(np.concatenate(slices)) if slices else np.array([], dtype=ids.dtype)
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# FILTRES DE RECOMMANDATION (INDEX BITMAP PRÉCALCULÉS)
+# =========================
+
+# Filtres par intervalle : paramètres `<nom>_min` / `<nom>_max` -> (colonne, pas des niveaux)
+RANGE_FACETS = {
+    'annee': ('Année_de_Sortie', 1),
+    'note': ('Note', 0.1),
+    'duree': ('Durée', 1),
+}
+# Filtres par valeur (plusieurs valeurs : l'une ou l'autre) : paramètre -> (colonne, séparateur)
+VALUE_FACETS = {
+    'genre': ('Genre', ','),
+    'categorie': ('Catégorie', None),
+}
+FILTER_NAMES = ([f"{name}_{bound}" for name in RANGE_FACETS for bound in ('min', 'max')]
+                + list(VALUE_FACETS))
+
+def _levels(values, step):
+    """Niveau entier de chaque valeur (arrondie au pas), -1 si manquante"""
+    values = pd.to_numeric(pd.Series(values), errors='coerce').astype('float64').to_numpy()
+    present = ~np.isnan(values)
+    levels = np.full(len(values), -1, dtype=np.int64)
+    levels[present] = np.round(values[present] / step).astype(np.int64)
+    return levels, present
+
+class FacetIndex:
+    """Bitmaps précalculés une fois par version du catalogue, un bit par film.
+
+    Filtres par valeur : un bitmap par genre ou catégorie. Filtres par
+    intervalle : codage par intervalles, le bitmap `i` marque les films dont
+    la valeur atteint le i-ème niveau présent ; une borne ne coûte qu'une
+    recherche dichotomique et un ET sur N/8 octets. Les bornes sont prises
+    à la précision du pas (0,1 point pour la note).
+    """
+
+    def __init__(self, df):
+        self.n_films = len(df)
+        self.ranges = {}
+        for name, (column, step) in RANGE_FACETS.items():
+            if column in df.columns:
+                self.ranges[name] = self._range_bitmaps(df[column], step)
+        self.values = {}
+        for name, (column, separator) in VALUE_FACETS.items():
+            if column in df.columns:
+                self.values[name] = self._value_bitmaps(df[column], separator)
+
+    def _pack(self, bits):
+        return np.packbits(bits, axis=-1)
+
+    def _range_bitmaps(self, values, step):
+        levels, present = _levels(values, step)
+        distinct = np.unique(levels[present])
+        rank = np.full(self.n_films, -1, dtype=np.int64)
+        rank[present] = np.searchsorted(distinct, levels[present])
+        # Ligne i : rang >= i (la ligne 0 marque les valeurs renseignées)
+        bits = np.arange(len(distinct))[:, None] <= rank[None, :]
+        return step, distinct, self._pack(bits)
+
+    def _value_bitmaps(self, values, separator):
+        values = pd.Series(values, dtype='string').reset_index(drop=True)
+        if separator:
+            values = values.str.split(separator).explode()
+        values = values.str.strip()
+        values = values[values.notna() & (values != '')]
+        codes, labels = pd.factorize(values, sort=True)
+        bits = np.zeros((len(labels), self.n_films), dtype=bool)
+        bits[codes, values.index.to_numpy()] = True
+        codes = {label.lower(): code for code, label in enumerate(labels)}
+        return list(labels), codes, self._pack(bits)
+
+    def bounds(self, name):
+        """Valeurs extrêmes d'un filtre par intervalle (None si la colonne manque)"""
+        if name not in self.ranges:
+            return None
+        step, distinct, _ = self.ranges[name]
+        if not len(distinct):
+            return None
+        return tuple((distinct[[0, -1]] * step).round(6).tolist())
+
+    def options(self, name):
+        """Valeurs d'un filtre par valeur, triées"""
+        return self.values[name][0] if name in self.values else []
+
+    def _range_mask(self, name, low, high):
+        step, distinct, bitmaps = self.ranges[name]
+        empty = np.zeros(bitmaps.shape[1], dtype=np.uint8)
+        start = 0 if low is None else np.searchsorted(distinct, round(low / step), side='left')
+        packed = bitmaps[start] if start < len(distinct) else empty
+        if high is not None:
+            stop = np.searchsorted(distinct, round(high / step), side='right')
+            if stop < len(distinct):
+                packed = packed & ~bitmaps[stop]
+        return packed
+
+    def _value_mask(self, name, wanted):
+        _, codes, bitmaps = self.values[name]
+        rows = [codes[value.lower()] for value in wanted if value.lower() in codes]
+        if not rows:
+            return np.zeros(bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(bitmaps[rows], axis=0)
+
+    def mask(self, filters=None):
+        """Masque booléen des films retenus, None si aucun filtre n'est actif.
+
+        `filters` : dictionnaire de FILTER_NAMES (ex. {'annee_min': 2000,
+        'genre': ['Drama']}) ; les filtres se combinent par ET.
+        """
+        filters = {name: value for name, value in (filters or {}).items()
+                   if value is not None and (not isinstance(value, (list, tuple)) or len(value))}
+        unknown = set(filters) - set(FILTER_NAMES)
+        if unknown:
+            raise ValueError(f"Filtre inconnu : {', '.join(sorted(unknown))} "
+                             f"(filtres : {', '.join(FILTER_NAMES)})")
+        missing = {name for name in filters
+                   if name.rsplit('_', 1)[0] not in self.ranges and name not in self.values}
+        if missing:
+            raise ValueError(f"Filtre indisponible pour ce catalogue : {', '.join(sorted(missing))}")
+        if not filters:
+            return None
+        packed = None
+        for name in self.ranges:
+            low, high = filters.get(f"{name}_min"), filters.get(f"{name}_max")
+            if low is not None or high is not None:
+                packed = self._and(packed, self._range_mask(name, low, high))
+        for name in self.values:
+            wanted = filters.get(name)
+            if wanted is not None:
+                wanted = [wanted] if isinstance(wanted, str) else wanted
+                packed = self._and(packed, self._value_mask(name, wanted))
+        return np.unpackbits(packed, count=self.n_films).view(bool)
+
+    @staticmethod
+    def _and(packed, other):
+        return other if packed is None else packed & other
+
+    def memory_usage(self):
+        """Octets occupés par les bitmaps"""
+        return (sum(bitmaps.nbytes for _, _, bitmaps in self.ranges.values())
+                + sum(bitmaps.nbytes for _, _, bitmaps in self.values.values()))
@@ -0,0 +1,77 @@
+import hashlib
+import importlib.util
+import threading
+from .metrics import METRICS
+
+# =========================
+# CACHE DES FIGURES PLOTLY
+# =========================
+
+# Formats de rendu : graphique interactif, ou image statique pour les connexions lentes
+FIGURE_FORMATS = ['interactif', 'svg', 'png']
+# Largeur des images statiques (px) ; la hauteur vient de la mise en page de la figure
+STATIC_WIDTH = 900
+
+def static_export_available():
+    """Export SVG/PNG possible : Plotly le délègue au paquet optionnel kaleido"""
+    return importlib.util.find_spec('kaleido') is not None
+
+def data_version(*frames):
+    """Empreinte des DataFrames sources : une figure est reconstruite si elles changent"""
+    import pandas as pd
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+        digest.update(",".join(map(str, frame.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+class FigureCache:
+    """Figures construites une seule fois par (nom, version des données), partagées entre sessions.
+
+    `build` n'est appelé qu'en cas d'absence du cache, hors du verrou global :
+    une session n'attend que la construction de la figure qu'elle demande.
+    Les images statiques sont produites à la première demande de chaque format.
+
+    Seul l'objet Figure est gardé : `st.plotly_chart` n'accepte pas de JSON
+    déjà sérialisé (il repasse toujours par `plotly.io.to_json`), un JSON en
+    cache ne serait donc jamais servi.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._figures = {}
+        self._images = {}
+
+    def _cached(self, store, key, make):
+        """(valeur, trouvée) de `store[key]`, calculée une seule fois par un verrou propre à la clé"""
+        with self._lock:
+            if key in store:
+                return store[key], True
+            key_lock = self._pending.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in store:
+                    return store[key], True
+            value = make()
+            with self._lock:
+                store[key] = value
+                self._pending.pop(key, None)
+        return value, False
+
+    def figure(self, name, version, build):
+        """Figure Plotly, construite au premier appel"""
+        def make():
+            with METRICS.span('figure_build'):
+                return build()
+
+        figure, found = self._cached(self._figures, (name, version), make)
+        METRICS.count('figures', 'hit' if found else 'miss')
+        return figure
+
+    def image(self, name, version, build, fmt='svg', width=STATIC_WIDTH):
+        """Image statique (octets SVG ou PNG) de la figure"""
+        figure = self.figure(name, version, build)
+        image, _ = self._cached(self._images, (name, version, fmt, width),
+                                lambda: figure.to_image(format=fmt, width=width))
+        return image
@@ -0,0 +1,62 @@
+import argparse
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# =========================
+# IMPORTS PAR PAGE ET BUDGET DE DÉMARRAGE
+# =========================
+
+# Modules lourds chargés par chaque page de l'application, à sa première visite
+PAGE_IMPORTS = {
+    "Accueil": [],
+    "Étude de Marché": ['pandas', 'plotly.express', 'plotly.graph_objects', 'plotly.subplots'],
+    "KPI Stratégiques": ['pandas', 'plotly.express', 'creuze.catalog_store'],
+    "Recommandation de Films": ['pandas', 'creuze.catalog_store', 'creuze.recommender',
+                                'creuze.title_search', 'creuze.translation_store',
+                                'creuze.poster_cache'],
+}
+# Imports tolérés (secondes) avant le premier affichage : Streamlit + page d'accueil
+STARTUP_BUDGET = 1.5
+
+# Durée de la première visite de chaque page, pour ce processus
+IMPORT_TIMES = {}
+
+@contextmanager
+def timed_imports(page):
+    """Mesure les imports d'une page ; seule la première visite (imports à froid) est gardée"""
+    start = time.perf_counter()
+    yield
+    IMPORT_TIMES.setdefault(page, time.perf_counter() - start)
+
+def cold_import_time(modules, python=sys.executable):
+    """Temps d'import de `modules` dans un interpréteur neuf"""
+    code = ("import time; start = time.perf_counter()\n"
+            + "".join(f"import {module}\n" for module in modules)
+            + "print(time.perf_counter() - start)")
+    result = subprocess.run([python, '-c', code], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip())
+
+def startup_report(repeat=3):
+    """Temps d'import à froid de Streamlit puis de chaque page (meilleur de `repeat` essais)"""
+    base = min(cold_import_time(['streamlit']) for _ in range(repeat))
+    report = {'Démarrage (streamlit)': base}
+    for page, modules in PAGE_IMPORTS.items():
+        total = min(cold_import_time(['streamlit', *modules]) for _ in range(repeat))
+        report[page] = max(total - base, 0.0)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps d'import à froid par page de l'application")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET,
+                        help="Budget du premier affichage, en secondes")
+    args = parser.parse_args()
+
+    report = startup_report(args.repeat)
+    for name, seconds in report.items():
+        print(f"{name:<28} {1000 * seconds:8.0f} ms")
+    first_paint = report['Démarrage (streamlit)'] + report["Accueil"]
+    print(f"Premier affichage : {1000 * first_paint:.0f} ms (budget {1000 * args.budget:.0f} ms)")
+    sys.exit(0 if first_paint <= args.budget else 1)
@@ -0,0 +1,176 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# =========================
+# MESURES DE PERFORMANCE (SECTIONS CHRONOMÉTRÉES, COMPTEURS DE CACHE)
+# =========================
+
+# Si défini, les exports JSON lines et Prometheus y sont écrits après chaque exécution
+METRICS_DIR = os.environ.get('CREUZE_METRICS_DIR')
+JSONL_NAME = 'creuze_runs.jsonl'
+PROMETHEUS_NAME = 'creuze.prom'
+# Exécutions gardées en mémoire pour le panneau de débogage
+RECENT_RUNS = 50
+
+def _label(value):
+    """Valeur d'étiquette Prometheus échappée"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Metrics:
+    """Sections chronométrées et compteurs, agrégés pour tout le processus.
+
+    Une « exécution » (un rerun Streamlit, une requête) regroupe les
+    sections mesurées dans son thread entre `begin_run` et `end_run` ;
+    les sections hors exécution ne comptent que dans les agrégats.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.span_count = defaultdict(int)
+        self.span_total = defaultdict(float)
+        self.span_max = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.runs = []
+
+    @contextmanager
+    def span(self, name):
+        """Chronomètre le bloc ; les sections imbriquées sont indentées dans l'exécution"""
+        run = getattr(self._local, 'run', None)
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._local.depth = depth
+            self._record(name, seconds)
+            if run is not None:
+                run['spans'].append({'name': name, 'depth': depth, 'ms': round(1000 * seconds, 3),
+                                     'start_ms': round(1000 * (start - run['_start']), 3)})
+
+    def _record(self, name, seconds):
+        with self._lock:
+            self.span_count[name] += 1
+            self.span_total[name] += seconds
+            self.span_max[name] = max(self.span_max[name], seconds)
+
+    def count(self, name, result, n=1):
+        """Incrémente un compteur (par exemple cache 'hit' / 'miss')"""
+        if n:
+            with self._lock:
+                self.counters[(name, result)] += n
+            run = getattr(self._local, 'run', None)
+            if run is not None:
+                key = f"{name}:{result}"
+                run['counters'][key] = run['counters'].get(key, 0) + n
+
+    def cached(self, name, cache):
+        """Décorateur : applique `cache` (ex. st.cache_data) et compte succès et échecs.
+
+        Le corps de la fonction ne s'exécute qu'en cas d'absence du cache :
+        c'est ce qui distingue un 'miss' d'un 'hit'.
+        """
+        def decorate(func):
+            executed = threading.local()
+
+            @functools.wraps(func)
+            def body(*args, **kwargs):
+                executed.flag = True
+                return func(*args, **kwargs)
+
+            cached_body = cache(body)
+
+            @functools.wraps(func)
+            def call(*args, **kwargs):
+                executed.flag = False
+                with self.span(name):
+                    result = cached_body(*args, **kwargs)
+                self.count(name, 'miss' if executed.flag else 'hit')
+                return result
+
+            call.clear = getattr(cached_body, 'clear', None)
+            return call
+        return decorate
+
+    def begin_run(self, **labels):
+        """Début d'une exécution dans ce thread (une exécution inachevée est abandonnée)"""
+        self._local.run = {'ts': time.time(), 'labels': labels, 'spans': [], 'counters': {},
+                           '_start': time.perf_counter()}
+        self._local.depth = 0
+
+    def end_run(self, **labels):
+        """Clôt l'exécution du thread, la garde pour le panneau et l'exporte si demandé"""
+        run = getattr(self._local, 'run', None)
+        if run is None:
+            return None
+        self._local.run = None
+        run['labels'].update(labels)
+        seconds = time.perf_counter() - run.pop('_start')
+        run['total_ms'] = round(1000 * seconds, 3)
+        with self._lock:
+            self.runs = (self.runs + [run])[-RECENT_RUNS:]
+        # Durée totale par page (ou par route) : la section 'page:<nom>'
+        self._record(f"page:{run['labels']['page']}" if 'page' in run['labels'] else 'run', seconds)
+        if METRICS_DIR:
+            self.export(METRICS_DIR, run)
+        return run
+
+    def summary(self):
+        """Agrégats par section : nombre, total, moyenne et maximum (ms)"""
+        with self._lock:
+            return [{'section': name, 'appels': self.span_count[name],
+                     'total_ms': round(1000 * self.span_total[name], 1),
+                     'moyenne_ms': round(1000 * self.span_total[name] / self.span_count[name], 2),
+                     'max_ms': round(1000 * self.span_max[name], 1)}
+                    for name in sorted(self.span_count)]
+
+    def cache_summary(self):
+        """Succès, échecs et taux de succès de chaque cache compté"""
+        with self._lock:
+            counters = dict(self.counters)
+        names = sorted({name for name, result in counters if result in ('hit', 'miss')})
+        rows = []
+        for name in names:
+            hits, misses = counters.get((name, 'hit'), 0), counters.get((name, 'miss'), 0)
+            rows.append({'cache': name, 'hit': hits, 'miss': misses,
+                         'taux_hit': round(hits / (hits + misses), 3) if hits + misses else None})
+        return rows
+
+    def to_prometheus(self):
+        """Agrégats au format texte Prometheus"""
+        with self._lock:
+            counts, totals = dict(self.span_count), dict(self.span_total)
+            counters = dict(self.counters)
+        lines = ["# HELP creuze_span_seconds Durée des sections instrumentées",
+                 "# TYPE creuze_span_seconds summary"]
+        for name in sorted(counts):
+            lines.append(f'creuze_span_seconds_sum{{span="{_label(name)}"}} {totals[name]:.6f}')
+            lines.append(f'creuze_span_seconds_count{{span="{_label(name)}"}} {counts[name]}')
+        lines += ["# HELP creuze_events_total Compteurs (succès/échecs de cache)",
+                  "# TYPE creuze_events_total counter"]
+        for (name, result), value in sorted(counters.items()):
+            lines.append(f'creuze_events_total{{name="{_label(name)}",result="{_label(result)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory, run=None):
+        """Ajoute l'exécution au fichier JSON lines et réécrit le fichier Prometheus"""
+        os.makedirs(directory, exist_ok=True)
+        if run is not None:
+            with self._lock, open(os.path.join(directory, JSONL_NAME), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run, ensure_ascii=False) + "\n")
+        # Remplacement atomique : un collecteur ne lit jamais un fichier à moitié écrit
+        path = os.path.join(directory, PROMETHEUS_NAME)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+# Registre unique du processus, partagé par l'application, le service et le moteur
+METRICS = Metrics()
@@ -0,0 +1,131 @@
+import hashlib
+import io
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import requests
+from PIL import Image, features
+from .metrics import METRICS
+
+# =========================
+# CACHE LOCAL DES AFFICHES TMDB
+# =========================
+
+POSTER_BASE_URL = "https://image.tmdb.org/t/p/w500"
+POSTER_CACHE_DIR = 'posters'
+# Largeur des vignettes : les cartes affichent les affiches sur 350-400 px de haut
+THUMBNAIL_WIDTH = 320
+POSTER_WORKERS = 4
+POSTER_TIMEOUT = 10
+# Attente maximale d'une vignette pendant le rendu ; au-delà, la page affiche l'URL TMDB
+# et la vignette se termine en arrière-plan pour les affichages suivants
+THUMBNAIL_WAIT = 0.3
+
+def is_valid_poster(path):
+    """Chemin d'affiche TMDB exploitable (ni vide, ni 'UNKNOWN')"""
+    if not isinstance(path, str):
+        return False
+    path = path.strip()
+    return path != "" and "unknown" not in path.lower()
+
+class PosterCache:
+    """Télécharge chaque affiche une seule fois et sert des vignettes redimensionnées.
+
+    Les originaux et les vignettes (WebP, JPEG à défaut) sont stockés sous
+    `cache_dir`. `base_url` peut pointer vers un serveur HTTP local dans
+    les tests. `prefetch` remplit le cache en arrière-plan.
+    """
+
+    def __init__(self, cache_dir=POSTER_CACHE_DIR, base_url=POSTER_BASE_URL,
+                 width=THUMBNAIL_WIDTH, max_workers=POSTER_WORKERS, timeout=POSTER_TIMEOUT,
+                 wait=THUMBNAIL_WAIT):
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.width = width
+        self.timeout = timeout
+        self.wait = wait
+        self.format, self.extension = ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+        self._session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='affiches')
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        os.makedirs(os.path.join(cache_dir, 'original'), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, str(width)), exist_ok=True)
+
+    def _name(self, path):
+        """Nom de fichier sûr dérivé du chemin TMDB"""
+        name = path.strip().lstrip('/')
+        if not re.fullmatch(r'[A-Za-z0-9_.-]+', name):
+            name = hashlib.sha1(name.encode('utf-8')).hexdigest()
+        return os.path.splitext(name)[0]
+
+    def _write_atomic(self, dest, data):
+        """Écriture via un fichier temporaire : pas de fichier partiel entre workers"""
+        tmp = f"{dest}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, dest)
+
+    def original(self, path):
+        """Chemin local de l'affiche d'origine, téléchargée au premier appel"""
+        dest = os.path.join(self.cache_dir, 'original', self._name(path))
+        if not os.path.exists(dest):
+            response = self._session.get(self.base_url + path.strip(), timeout=self.timeout)
+            response.raise_for_status()
+            self._write_atomic(dest, response.content)
+        return dest
+
+    def _thumbnail_path(self, path):
+        return os.path.join(self.cache_dir, str(self.width), f"{self._name(path)}.{self.extension}")
+
+    def _build_thumbnail(self, path):
+        dest = self._thumbnail_path(path)
+        if os.path.exists(dest):
+            return dest
+        with Image.open(self.original(path)) as image:
+            image = image.convert('RGB')
+            if image.width > self.width:
+                height = round(image.height * self.width / image.width)
+                image = image.resize((self.width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, self.format, quality=80)
+        self._write_atomic(dest, buffer.getvalue())
+        return dest
+
+    def thumbnail(self, path):
+        """Chemin local de la vignette, ou None si elle n'est pas prête sous `wait` secondes
+        (l'appelant affiche alors l'affiche distante) ou si l'affiche est indisponible"""
+        if not is_valid_poster(path):
+            return None
+        dest = self._thumbnail_path(path)
+        if os.path.exists(dest):
+            return dest
+        try:
+            with METRICS.span('poster_thumbnail'):
+                return self._submit(path).result(timeout=self.wait)
+        except TimeoutError:
+            METRICS.count('posters', 'fallback')
+            return None
+        except Exception:
+            return None
+
+    def _submit(self, path):
+        """Une seule tâche en cours par affiche, même si plusieurs sessions la demandent"""
+        with self._lock:
+            future = self._in_flight.get(path)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._build_thumbnail, path)
+            self._in_flight[path] = future
+        # Hors du verrou : le rappel s'exécute tout de suite si la tâche est déjà finie
+        future.add_done_callback(lambda _, p=path: self._forget(p))
+        return future
+
+    def _forget(self, path):
+        with self._lock:
+            self._in_flight.pop(path, None)
+
+    def prefetch(self, paths):
+        """Lance en arrière-plan la préparation des vignettes manquantes"""
+        return [self._submit(path) for path in paths if is_valid_poster(path)]
@@ -0,0 +1,546 @@
+import argparse
+import os
+import re
+import sys
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+from .catalog_store import CATALOG_PATH, FILM_ID, build_features, read_catalog
+from .metrics import METRICS
+
+# =========================
+# MOTEUR DE RECOMMANDATION
+# =========================
+
+# Nombre maximal de scores denses calculés à la fois en mode batch (~128 Mo en float64)
+BATCH_SCORE_BUDGET = 16_000_000
+# Index incrémental persistant et taille de l'espace de hachage
+INDEX_PATH = 'recommender_index.joblib'
+HASHING_FEATURES = 2 ** 20
+# Vocabulaire TF-IDF plafonné : les termes les plus fréquents sont gardés
+MAX_VOCABULARY = 100_000
+# Recherche approchée (LSH) : en dessous de cette taille, l'index inversé exact est plus
+# rapide et sans perte de rappel (recall_report sur les catalogues synthétiques)
+ANN_MIN_FILMS = 100_000
+# Champs vectorisés séparément pour la similarité pondérée : nom de poids -> colonne.
+# Les listes (genres, noms) sont découpées aux virgules et barres : un nom complet = un terme
+FIELD_COLUMNS = {
+    'genre': 'Genre',
+    'realisateur': 'Réalisateur',
+    'acteur': 'Acteur',
+    'actrice': 'Actrice',
+    'synopsis': 'Synopsis',
+}
+TEXT_FIELDS = ['synopsis']
+DEFAULT_FIELD_WEIGHT = 1.0
+LIST_SEPARATOR = re.compile(r'[|,]')
+# Valeurs de remplissage du notebook (fillna('UNKNOWN')...) : champ vide, pas un terme commun
+MISSING_VALUES = {'unknown', 'n/a', 'na', 'nan', 'none', 'null'}
+
+def nbytes(obj):
+    """Taille mémoire approximative d'un tableau, d'une matrice creuse ou d'un dictionnaire"""
+    if obj is None:
+        return 0
+    if sp.issparse(obj):
+        return obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sys.getsizeof(v) for v in obj.values())
+    return sys.getsizeof(obj)
+
+def split_list(text):
+    """Termes d'un champ liste (« Drama, Comedy », « Nom Un|Nom Deux »)"""
+    items = (item.strip() for item in LIST_SEPARATOR.split(text))
+    return [item for item in items if item and item.lower() not in MISSING_VALUES]
+
+def _select_top_k(scores, k):
+    """Sélection partielle O(N) par ligne, puis tri des seuls k candidats"""
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+class LSHIndex:
+    """Index approché : plongement TruncatedSVD puis LSH par hyperplans aléatoires.
+
+    Compromis rappel/latence : plus de tables (`n_tables`) ou de sondes
+    (`n_probes`, bits les moins sûrs retournés) augmentent le rappel ; plus
+    de bits (`n_bits`) réduisent la taille des seaux, donc la latence.
+    Par défaut, `n_bits` vise des seaux d'environ 8 films : les plongements
+    TF-IDF sont groupés, des seaux plus larges ramenaient 10 % du catalogue
+    à chaque requête. Les candidats sont préclassés sur le plongement et
+    seuls les `n_rerank` meilleurs sont gardés pour le rescorage exact.
+    """
+
+    def __init__(self, matrix, n_components=128, n_tables=16, n_bits=None, n_probes=2,
+                 n_rerank=512, seed=0):
+        n_films, n_terms = matrix.shape
+        n_components = max(1, min(n_components, n_terms - 1, n_films - 1))
+        if n_bits is None:
+            n_bits = int(np.clip(np.log2(max(n_films, 2) / 8), 1, 24))
+        svd = TruncatedSVD(n_components=n_components, random_state=seed)
+        self.embedding = normalize(svd.fit_transform(matrix)).astype(np.float32)
+        self.n_probes = n_probes
+        self.n_rerank = n_rerank
+
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_tables, n_components, n_bits)).astype(np.float32)
+        self.bit_values = 1 << np.arange(n_bits, dtype=np.int64)
+        # Chaque table : codes triés + permutation, un seau = une plage contiguë
+        self.tables = []
+        for planes in self.planes:
+            codes = ((self.embedding @ planes) > 0) @ self.bit_values
+            order = np.argsort(codes, kind='stable')
+            self.tables.append((codes[order], order))
+
+    def candidates(self, row):
+        """Films partageant un seau (ou un seau voisin sondé) avec `row`"""
+        projections = np.einsum('d,tdb->tb', self.embedding[row], self.planes)
+        found = []
+        for projection, (codes, order) in zip(projections, self.tables):
+            code = (projection > 0) @ self.bit_values
+            flipped = self.bit_values[np.argsort(np.abs(projection))[:self.n_probes]]
+            probes = np.concatenate([[code], code ^ flipped])
+            starts = np.searchsorted(codes, probes, side='left')
+            ends = np.searchsorted(codes, probes, side='right')
+            found.extend(order[start:end] for start, end in zip(starts, ends))
+        return np.unique(np.concatenate(found))
+
+    def shortlist(self, row, allowed=None):
+        """Candidats LSH préclassés sur le plongement (au plus `n_rerank`)"""
+        candidates = self.candidates(row)
+        candidates = candidates[candidates != row]
+        # Filtres appliqués avant le préclassement : le budget de rescorage va aux films retenus
+        if allowed is not None:
+            candidates = candidates[allowed[candidates]]
+        if len(candidates) <= self.n_rerank:
+            return candidates
+        approx = self.embedding[candidates] @ self.embedding[row]
+        return candidates[np.argpartition(-approx, self.n_rerank - 1)[:self.n_rerank]]
+
+class FieldIndex:
+    """Une matrice TF-IDF par champ, ajustée une fois ; les poids sont choisis à la requête.
+
+    Score d'un film = somme pondérée des cosinus par champ (poids ramenés à
+    une somme de 1) : un synopsis long ne noie plus le réalisateur ni la
+    distribution, et changer un poids ne coûte qu'une requête.
+    """
+
+    def __init__(self, df, max_features=MAX_VOCABULARY):
+        self.n_films = len(df)
+        self.vectorizers, self.matrices, self.inverted = {}, {}, {}
+        with METRICS.span('vectorize_fields'):
+            for name, column in FIELD_COLUMNS.items():
+                if column not in df.columns:
+                    continue
+                if name in TEXT_FIELDS:
+                    vectorizer = TfidfVectorizer(stop_words='english', max_features=max_features,
+                                                 dtype=np.float32)
+                else:
+                    vectorizer = TfidfVectorizer(tokenizer=split_list, token_pattern=None,
+                                                 max_features=max_features, dtype=np.float32)
+                texts = df[column].astype('string').fillna('')
+                texts = texts.mask(texts.str.strip().str.lower().isin(MISSING_VALUES), '')
+                try:
+                    matrix = vectorizer.fit_transform(texts).tocsr()
+                except ValueError:
+                    # Champ vide dans tout le catalogue : il ne contribue à aucun score
+                    continue
+                self.vectorizers[name], self.matrices[name] = vectorizer, matrix
+                self.inverted[name] = matrix.T.tocsr()
+
+    def weights(self, weights=None):
+        """Poids complétés (DEFAULT_FIELD_WEIGHT) puis normalisés, champs nuls retirés"""
+        unknown = set(weights or {}) - set(FIELD_COLUMNS)
+        if unknown:
+            raise ValueError(f"Champ inconnu : {', '.join(sorted(unknown))} "
+                             f"(champs : {', '.join(FIELD_COLUMNS)})")
+        full = {name: DEFAULT_FIELD_WEIGHT for name in self.matrices}
+        full.update({name: float(weight) for name, weight in (weights or {}).items()
+                     if weight is not None and name in self.matrices})
+        if any(weight < 0 for weight in full.values()):
+            raise ValueError("Les poids doivent être positifs ou nuls")
+        total = sum(full.values())
+        if total <= 0:
+            raise ValueError("Au moins un poids doit être strictement positif")
+        return {name: weight / total for name, weight in full.items() if weight}
+
+    def score(self, rows, weights=None):
+        """Scores denses (len(rows), N) : somme pondérée des produits creux par champ"""
+        rows = np.asarray(rows, dtype=np.intp)
+        scores = np.zeros((len(rows), self.n_films), dtype=np.float32)
+        for name, weight in self.weights(weights).items():
+            product = (self.matrices[name][rows] @ self.inverted[name]).tocsr()
+            query_rows = np.repeat(np.arange(len(rows)), np.diff(product.indptr))
+            scores[query_rows, product.indices] += weight * product.data
+        return scores
+
+    def scorer(self, weights=None):
+        """Fonction lignes -> scores pour `MovieRecommender.top_k_batch(score=...)`"""
+        weights = self.weights(weights)
+        return lambda rows: self.score(rows, weights)
+
+    def memory_usage(self):
+        return {f"Matrice TF-IDF : {name}": nbytes(matrix) + nbytes(self.inverted[name])
+                for name, matrix in self.matrices.items()}
+
+class MovieRecommender:
+    """Moteur TF-IDF ajusté une seule fois par version du catalogue.
+
+    Les lignes de la matrice TF-IDF sont normalisées (L2) : le produit
+    scalaire creux d'une ligne avec la matrice donne directement la
+    similarité cosinus, sans matrice dense N×N.
+
+    Avec `backend='ann'`, les candidats viennent d'un `LSHIndex` (options
+    dans `ann_params`) et seuls ceux-ci sont rescorés en cosinus exact.
+    En dessous de `ann_min_films` films, l'index n'est pas construit et la
+    recherche reste exacte : à vérifier avec `recall_report` avant de
+    l'activer sur un catalogue.
+
+    Le texte à vectoriser vient de `features` (sinon de `df['features']`) ;
+    il n'est pas conservé, la matrice est en float32 et le vocabulaire
+    plafonné à `max_features` termes.
+    """
+
+    def __init__(self, df, features=None, backend='exact', ann_params=None,
+                 max_features=MAX_VOCABULARY, ann_min_films=ANN_MIN_FILMS):
+        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=max_features,
+                                          dtype=np.float32)
+        if backend not in ('exact', 'ann'):
+            raise ValueError(f"Backend inconnu : {backend!r}")
+        with METRICS.span('vectorize'):
+            self.tfidf_matrix = self.vectorizer.fit_transform(
+                df['features'] if features is None else features).tocsr()
+        if backend == 'ann' and self.tfidf_matrix.shape[0] < ann_min_films:
+            backend = 'exact'
+        self.backend = backend
+        with METRICS.span('index'):
+            self.ann = LSHIndex(self.tfidf_matrix, **(ann_params or {})) if backend == 'ann' else None
+            # Index inversé terme -> films : une requête ne parcourt que les films
+            # partageant au moins un terme avec elle
+            self.inverted_index = self.tfidf_matrix.T.tocsr()
+
+        self.ids = np.empty(0, dtype=df[FILM_ID].to_numpy().dtype)
+        self.id_to_row = {}
+        self.title_to_rows = {}
+        self._index_films(df)
+
+    def _index_films(self, df):
+        """Ajoute les films aux index identifiant -> ligne et titre -> lignes"""
+        offset = len(self.ids)
+        new_ids = df[FILM_ID].to_numpy()
+        self.ids = np.concatenate([self.ids, new_ids]) if offset else new_ids
+        for row, film_id in enumerate(new_ids, start=offset):
+            self.id_to_row[film_id] = row
+        for row, titre in enumerate(df['Titre'], start=offset):
+            self.title_to_rows.setdefault(titre, []).append(row)
+
+    @property
+    def dtype(self):
+        return self.tfidf_matrix.dtype
+
+    def _query_vectors(self, rows):
+        """Vecteurs TF-IDF des films `rows`"""
+        return self.tfidf_matrix[rows]
+
+    def _score(self, queries):
+        """Scores denses (len(queries), N) de vecteurs requêtes contre tout le catalogue"""
+        return (queries @ self.inverted_index).toarray()
+
+    def lookup(self, key):
+        """Position d'un film à partir de son identifiant ou de son titre"""
+        if key in self.id_to_row and not isinstance(key, str):
+            return self.id_to_row[key]
+        rows = self.title_to_rows.get(key)
+        if not rows:
+            raise KeyError(f"Film introuvable : {key!r}")
+        if len(rows) > 1:
+            raise ValueError(f"Titre ambigu {key!r}, préciser l'identifiant parmi "
+                             f"{self.ids[rows].tolist()}")
+        return rows[0]
+
+    def scores(self, idx):
+        """Similarité cosinus entre le film `idx` et tout le catalogue"""
+        return self._score(self._query_vectors([idx]))[0]
+
+    def top_k(self, idx, k=6, allowed=None, score=None):
+        """Les k films les plus proches de `idx` (lui-même exclu), triés"""
+        top, scores = self.top_k_batch([idx], k, allowed=allowed, score=score)
+        if allowed is not None:
+            # Moins de k films retenus par les filtres : les places vides sont retirées
+            found = np.isfinite(scores[0])
+            return top[0][found], scores[0][found]
+        return top[0], scores[0]
+
+    def top_k_batch(self, rows, k=6, chunk_size=None, backend=None, allowed=None, score=None):
+        """Top-k pour plusieurs films : matrices (len(rows), k) de lignes et scores.
+
+        En mode exact, les requêtes sont traitées par blocs de `chunk_size`
+        lignes pour que le bloc de scores dense (chunk_size × N) reste borné
+        en mémoire.
+
+        `allowed` (masque booléen de N films, voir `FacetIndex.mask`) exclut
+        les autres films avant la sélection : même coût qu'une requête sans
+        filtre. S'il reste moins de k films, les places vides ont un score -inf.
+
+        `score` (lignes -> scores denses, voir `FieldIndex.scorer`) remplace
+        le cosinus sur le texte combiné ; la recherche est alors exacte.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        n_films = len(self.ids)
+        k = max(min(k, n_films - 1), 0)
+        if allowed is not None:
+            k = min(k, int(np.count_nonzero(allowed)))
+        if k == 0:
+            return (np.empty((len(rows), 0), dtype=np.intp),
+                    np.empty((len(rows), 0), dtype=self.dtype))
+        if (backend or self.backend) == 'ann' and score is None:
+            with METRICS.span('top_k_ann'):
+                return self._ann_top_k_batch(rows, k, allowed)
+        if chunk_size is None:
+            chunk_size = max(1, BATCH_SCORE_BUDGET // n_films)
+        excluded = None if allowed is None else ~allowed
+
+        top = np.empty((len(rows), k), dtype=np.intp)
+        top_scores = np.empty((len(rows), k), dtype=self.dtype)
+        with METRICS.span('top_k'):
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                if score is None:
+                    scores = self._score(self._query_vectors(chunk))
+                else:
+                    scores = score(chunk)
+                scores[np.arange(len(chunk)), chunk] = -np.inf
+                if excluded is not None:
+                    np.copyto(scores, -np.inf, where=excluded)
+                top[start:start + len(chunk)], top_scores[start:start + len(chunk)] = \
+                    _select_top_k(scores, k)
+        return top, top_scores
+
+    def _ann_top_k_batch(self, rows, k, allowed=None):
+        """Top-k approché : candidats LSH rescorés en cosinus TF-IDF exact"""
+        top = np.empty((len(rows), k), dtype=np.intp)
+        top_scores = np.empty((len(rows), k), dtype=self.tfidf_matrix.dtype)
+        for i, row in enumerate(rows):
+            candidates = self.ann.shortlist(row, allowed)
+            if len(candidates) < k:
+                # Seau trop petit (ou trop filtré) : repli sur la recherche exacte pour ce film
+                top[i:i + 1], top_scores[i:i + 1] = self.top_k_batch([row], k, backend='exact',
+                                                                     allowed=allowed)
+                continue
+            scores = (self.tfidf_matrix[candidates] @ self.tfidf_matrix[row].T).toarray().T
+            best, top_scores[i:i + 1] = _select_top_k(scores, k)
+            top[i] = candidates[best[0]]
+        return top, top_scores
+
+    def recall_report(self, k=6, n_queries=200, seed=0):
+        """Rappel@k et latence moyenne du mode approché face à la recherche exacte"""
+        if self.ann is None:
+            raise ValueError("Le rapport de rappel nécessite backend='ann' "
+                             "(et un catalogue d'au moins `ann_min_films` films)")
+        rng = np.random.default_rng(seed)
+        n_films = self.tfidf_matrix.shape[0]
+        rows = rng.choice(n_films, size=min(n_queries, n_films), replace=False)
+
+        start = time.perf_counter()
+        exact, _ = self.top_k_batch(rows, k, backend='exact')
+        exact_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        approx, _ = self.top_k_batch(rows, k, backend='ann')
+        ann_seconds = time.perf_counter() - start
+
+        hits = sum(len(np.intersect1d(e, a)) for e, a in zip(exact, approx))
+        return {
+            'recall': hits / exact.size if exact.size else 1.0,
+            'exact_ms_per_query': 1000 * exact_seconds / len(rows),
+            'ann_ms_per_query': 1000 * ann_seconds / len(rows),
+            'mean_candidates': float(np.mean([len(self.ann.candidates(r)) for r in rows])),
+        }
+
+    def memory_usage(self):
+        """Octets occupés par chaque structure du moteur"""
+        usage = {
+            'Matrice TF-IDF': nbytes(self.tfidf_matrix),
+            'Index inversé': nbytes(self.inverted_index),
+            'Vocabulaire': nbytes(getattr(self.vectorizer, 'vocabulary_', None)),
+        }
+        if self.ann is not None:
+            usage['Index LSH'] = (nbytes(self.ann.embedding) + nbytes(self.ann.planes)
+                                  + sum(nbytes(codes) + nbytes(order) for codes, order in self.ann.tables))
+        usage['Identifiants'] = nbytes(self.ids)
+        usage['Index identifiant -> ligne'] = nbytes(self.id_to_row)
+        usage['Index titre -> lignes'] = nbytes(self.title_to_rows)
+        return usage
+
+class IncrementalRecommender(MovieRecommender):
+    """Index incrémental : espace de hachage fixe et fréquences documentaires stockées.
+
+    `add` n'encode que les nouveaux films, dans un segment supplémentaire
+    pondéré avec l'IDF courant : son coût dépend de la taille du delta,
+    pas du catalogue. Les segments existants gardent leur pondération
+    jusqu'au prochain `compact`, qui les fusionne et les repondère.
+    Recherche exacte uniquement.
+    """
+
+    def __init__(self, df, features=None, n_features=HASHING_FEATURES):
+        self.vectorizer = HashingVectorizer(stop_words='english', n_features=n_features,
+                                            alternate_sign=False, norm=None, dtype=np.float32)
+        self.backend = 'exact'
+        self.ann = None
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        # Segments : (comptes bruts, matrice TF-IDF normalisée, index inversé)
+        self.segments = []
+        self.segment_starts = np.empty(0, dtype=np.intp)
+        self.ids = np.empty(0, dtype=df[FILM_ID].to_numpy().dtype)
+        self.id_to_row = {}
+        self.title_to_rows = {}
+        self.add(df, features)
+
+    def idf(self):
+        """IDF lissé, même formule que TfidfVectorizer"""
+        return (np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1).astype(np.float32)
+
+    def _segment(self, counts):
+        matrix = normalize(counts @ sp.diags(self.idf())).tocsr()
+        return counts, matrix, matrix.T.tocsr()
+
+    def add(self, df, features=None):
+        """Ajoute des films (texte dans `features` ou `df['features']`) sans toucher aux segments existants"""
+        if len(df) == 0:
+            return self
+        with METRICS.span('vectorize'):
+            counts = self.vectorizer.transform(df['features'] if features is None else features).tocsr()
+        self.doc_freq += np.bincount(counts.indices, minlength=len(self.doc_freq))
+        self.n_docs += counts.shape[0]
+        self.segment_starts = np.append(self.segment_starts, len(self.ids))
+        with METRICS.span('index'):
+            self.segments.append(self._segment(counts))
+        self._index_films(df)
+        return self
+
+    def compact(self):
+        """Fusionne les segments et les repondère avec l'IDF courant"""
+        counts = sp.vstack([segment[0] for segment in self.segments]).tocsr()
+        self.segments = [self._segment(counts)]
+        self.segment_starts = np.zeros(1, dtype=np.intp)
+        return self
+
+    @property
+    def tfidf_matrix(self):
+        return sp.vstack([segment[1] for segment in self.segments]).tocsr()
+
+    @property
+    def dtype(self):
+        return self.segments[0][1].dtype
+
+    def _query_vectors(self, rows):
+        rows = np.asarray(rows, dtype=np.intp)
+        owner = np.searchsorted(self.segment_starts, rows, side='right') - 1
+        parts, positions = [], []
+        for seg in np.unique(owner):
+            mask = owner == seg
+            parts.append(self.segments[seg][1][rows[mask] - self.segment_starts[seg]])
+            positions.append(np.flatnonzero(mask))
+        stacked = sp.vstack(parts).tocsr()
+        return stacked[np.argsort(np.concatenate(positions))]
+
+    def _score(self, queries):
+        return np.hstack([(queries @ inverted).toarray() for _, _, inverted in self.segments])
+
+    def memory_usage(self):
+        return {
+            'Comptes bruts (segments)': sum(nbytes(counts) for counts, _, _ in self.segments),
+            'Matrice TF-IDF (segments)': sum(nbytes(matrix) for _, matrix, _ in self.segments),
+            'Index inversé (segments)': sum(nbytes(inverted) for _, _, inverted in self.segments),
+            'Fréquences documentaires': nbytes(self.doc_freq),
+            'Identifiants': nbytes(self.ids),
+            'Index identifiant -> ligne': nbytes(self.id_to_row),
+            'Index titre -> lignes': nbytes(self.title_to_rows),
+        }
+
+    def save(self, path=INDEX_PATH):
+        joblib.dump(self, path)
+        return path
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        return joblib.load(path)
+
+def build_engine(df, path=CATALOG_PATH, backend='exact', index_path=INDEX_PATH):
+    """Moteur du catalogue `path` : index incrémental sauvegardé s'il le couvre, sinon TF-IDF"""
+    if backend == 'exact' and index_path and os.path.exists(index_path):
+        engine = IncrementalRecommender.load(index_path)
+        if np.array_equal(engine.ids, df[FILM_ID].to_numpy()):
+            return engine
+    # Le texte `features` n'est lu que le temps de la vectorisation
+    features = read_catalog(path, ['features'])['features']
+    return MovieRecommender(df, features, backend=backend)
+
+def memory_report(df, engine, title_index=None, facets=None, fields=None):
+    """Mémoire par structure : colonnes du catalogue, moteur, index de titres, filtres et champs"""
+    rows = [(f"Catalogue : {col} ({df[col].dtype})", 'Catalogue', int(size))
+            for col, size in df.memory_usage(index=False, deep=True).items()]
+    rows += [(name, 'Moteur', int(size)) for name, size in engine.memory_usage().items()]
+    if fields is not None:
+        rows += [(name, 'Moteur', int(size)) for name, size in fields.memory_usage().items()]
+    if title_index is not None:
+        rows.append(('Index de titres', 'Recherche', sum(
+            nbytes(value) for value in vars(title_index).values())))
+    if facets is not None:
+        rows.append(('Index des filtres', 'Recherche', facets.memory_usage()))
+    report = pd.DataFrame(rows, columns=['Structure', 'Groupe', 'Octets'])
+    report['Mo'] = (report['Octets'] / 1e6).round(2)
+    return report.sort_values('Octets', ascending=False, ignore_index=True)
+
+def get_recommendations(title, df, engine, k=6, allowed=None, score=None):
+    """Obtient les recommandations de films similaires (titre ou identifiant), filtrées par `allowed`"""
+    rows, _ = engine.top_k(engine.lookup(title), k, allowed, score)
+    return df.iloc[rows]
+
+def get_recommendations_batch(titles_or_ids, engine, k=6, allowed=None):
+    """Recommandations pour une liste de films en un seul appel.
+
+    Renvoie deux tableaux (len(titles_or_ids), k) : identifiants des films
+    recommandés et scores de similarité associés.
+    """
+    rows = [engine.lookup(key) for key in titles_or_ids]
+    top, scores = engine.top_k_batch(rows, k, allowed=allowed)
+    return engine.ids[top], scores
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintenance de l'index incrémental de recommandation")
+    parser.add_argument('action', choices=['build', 'add', 'compact', 'memory'])
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="Catalogue Parquet (build)")
+    parser.add_argument('--delta', help="CSV des nouveaux films au schéma du catalogue (add)")
+    parser.add_argument('--index', default=INDEX_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.action == 'memory':
+        # Même chargement que l'application : texte lu à part, libéré après vectorisation
+        catalog = read_catalog(args.catalog)
+        engine = MovieRecommender(catalog, catalog.pop('features'))
+        report = memory_report(catalog, engine, fields=FieldIndex(catalog))
+        print(report.to_string(index=False))
+        print(f"Total : {report['Octets'].sum() / 1e6:.1f} Mo")
+    else:
+        if args.action == 'build':
+            engine = IncrementalRecommender(read_catalog(args.catalog, [FILM_ID, 'Titre', 'features']))
+        else:
+            engine = IncrementalRecommender.load(args.index)
+            if args.action == 'add':
+                delta = build_features(pd.read_csv(args.delta))
+                known = delta[FILM_ID].isin(engine.id_to_row.keys())
+                engine.add(delta[~known])
+            else:
+                engine.compact()
+        engine.save(args.index)
+        print(f"{args.action} : {len(engine.ids)} films, {len(engine.segments)} segment(s), "
+              f"{time.perf_counter() - start:.1f} s")
@@ -0,0 +1,115 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from .facets import FILTER_NAMES, VALUE_FACETS
+from .metrics import METRICS
+from .recommender import FIELD_COLUMNS
+
+# =========================
+# POINT D'ACCÈS HTTP/JSON
+# =========================
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+MAX_K = 100
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    """Routes GET : /recommend?title=...|id=...&k=6, /search?q=...&limit=20, /health, /metrics.
+
+    Filtres de /recommend : annee_min, annee_max, note_min, note_max,
+    duree_min, duree_max, genre et categorie (répétables). Poids par champ :
+    poids_genre, poids_realisateur, poids_acteur, poids_actrice, poids_synopsis.
+    """
+
+    # Connexions persistantes : un client enchaîne ses requêtes sans renégocier
+    protocol_version = 'HTTP/1.1'
+    # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, Nagle ajoute ~40 ms
+    disable_nagle_algorithm = True
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        params = {key: values[-1] for key, values in query.items()}
+        if url.path == '/metrics':
+            self._send(200, METRICS.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+            return
+        METRICS.begin_run(page=url.path)
+        try:
+            if url.path == '/recommend':
+                status, body = 200, self.service.recommend(self._film_key(params),
+                                                           self._int(params, 'k', 6),
+                                                           self._filters(query),
+                                                           self._weights(params))
+            elif url.path == '/search':
+                status, body = 200, self.service.search(params.get('q', ''),
+                                                        self._int(params, 'limit', 20))
+            elif url.path == '/health':
+                status, body = 200, self.service.info()
+            else:
+                status, body = 404, {'erreur': f"Route inconnue : {url.path}"}
+        except KeyError as exc:
+            status, body = 404, {'erreur': exc.args[0]}
+        except ValueError as exc:
+            status, body = 400, {'erreur': str(exc)}
+        METRICS.end_run(status=status)
+        self._send_json(status, body)
+
+    @staticmethod
+    def _film_key(params):
+        if 'id' in params:
+            return int(params['id'])
+        if 'title' in params:
+            return params['title']
+        raise ValueError("Paramètre 'title' ou 'id' requis")
+
+    @staticmethod
+    def _filters(query):
+        filters = {}
+        for name in FILTER_NAMES:
+            if name not in query:
+                continue
+            if name in VALUE_FACETS:
+                filters[name] = query[name]
+            else:
+                filters[name] = RecommendationHandler._float(query[name][-1], name)
+        return filters
+
+    @staticmethod
+    def _weights(params):
+        return {name: RecommendationHandler._float(params[f'poids_{name}'], f'poids_{name}')
+                for name in FIELD_COLUMNS if f'poids_{name}' in params}
+
+    @staticmethod
+    def _float(value, name):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"'{name}' doit être un nombre") from None
+
+    @staticmethod
+    def _int(params, name, default):
+        value = int(params.get(name, default))
+        if not 1 <= value <= MAX_K:
+            raise ValueError(f"'{name}' doit être compris entre 1 et {MAX_K}")
+        return value
+
+    def _send_json(self, status, body):
+        self._send(status, json.dumps(body, ensure_ascii=False).encode('utf-8'),
+                   'application/json; charset=utf-8')
+
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Pas de journal par requête : le débit compte plus que la trace
+        pass
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serveur multi-thread partageant un même service déjà chargé"""
+    handler = type('BoundRecommendationHandler', (RecommendationHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,99 @@
+import threading
+import pandas as pd
+from .catalog_store import (CATALOG_CSV_URL, CATALOG_PATH, FILM_ID, FULL_CATALOG_COLUMNS,
+                            FULL_CATALOG_CSV, FULL_CATALOG_PATH, RECOMMENDER_COLUMNS,
+                            load_catalog, read_catalog_version)
+from .facets import FacetIndex
+from .recommender import INDEX_PATH, FieldIndex, build_engine
+from .title_search import SEARCH_LIMIT, TitleSearchIndex
+
+# =========================
+# SERVICE DE RECOMMANDATION (SANS STREAMLIT)
+# =========================
+
+# Catalogues disponibles : (Parquet local, source CSV, renommage, backend par défaut)
+CATALOGS = {
+    'selection': (CATALOG_PATH, CATALOG_CSV_URL, None, 'exact'),
+    'complet': (FULL_CATALOG_PATH, FULL_CATALOG_CSV, FULL_CATALOG_COLUMNS, 'exact'),
+}
+# Champs renvoyés pour chaque film
+FILM_FIELDS = [FILM_ID, 'Titre', 'Année_de_Sortie', 'Genre', 'Réalisateur', 'Note', 'Durée', 'Catégorie',
+               'Affiche_de_Film']
+
+def json_values(series):
+    """Valeurs d'une colonne en objets Python sérialisables en JSON (NA -> None)"""
+    if pd.api.types.is_float_dtype(series.dtype):
+        series = series.astype('float64').round(4)
+    values = series.astype(object)
+    return values.where(series.notna(), None).tolist()
+
+class RecommendationService:
+    """Catalogue, moteur et index de titres chargés une fois et gardés en mémoire.
+
+    Utilisable depuis un traitement batch, la CLI (`python -m creuze`) ou
+    le serveur HTTP : chaque requête ne coûte qu'une recherche top-k.
+    Les structures sont en lecture seule, partagées sans verrou entre threads.
+    """
+
+    def __init__(self, catalog='selection', backend=None, index_path=INDEX_PATH):
+        if catalog not in CATALOGS:
+            raise ValueError(f"Catalogue inconnu : {catalog!r} ({', '.join(CATALOGS)})")
+        path, source, rename, default_backend = CATALOGS[catalog]
+        self.catalog = catalog
+        self.df = load_catalog(path, source, rename, RECOMMENDER_COLUMNS)
+        self.version = read_catalog_version(path)
+        self.engine = build_engine(self.df, path, backend or default_backend,
+                                   index_path if catalog == 'selection' else None)
+        self.facets = FacetIndex(self.df)
+        # Colonnes renvoyées converties une fois : une fiche ne coûte plus qu'un accès par champ
+        self._fields = {col: json_values(self.df[col]) for col in FILM_FIELDS if col in self.df.columns}
+        self._title_index = None
+        self._title_lock = threading.Lock()
+        self._field_index = None
+        self._field_lock = threading.Lock()
+
+    @property
+    def title_index(self):
+        """Index de titres, construit à la première recherche"""
+        with self._title_lock:
+            if self._title_index is None:
+                self._title_index = TitleSearchIndex(self.df['Titre'])
+        return self._title_index
+
+    @property
+    def field_index(self):
+        """Matrices TF-IDF par champ, construites à la première requête pondérée"""
+        with self._field_lock:
+            if self._field_index is None:
+                self._field_index = FieldIndex(self.df)
+        return self._field_index
+
+    def films(self, rows, scores=None):
+        """Fiches des films aux lignes `rows`, avec leur score éventuel"""
+        records = [{col: values[row] for col, values in self._fields.items()} for row in rows]
+        if scores is not None:
+            for record, score in zip(records, scores):
+                record['score'] = round(float(score), 4)
+        return records
+
+    def recommend(self, key, k=6, filters=None, weights=None):
+        """Film demandé (identifiant ou titre) et ses k recommandations.
+
+        `filters` : voir FILTER_NAMES ; `weights` : poids par champ
+        (FIELD_COLUMNS), sinon similarité sur le texte combiné.
+        """
+        row = self.engine.lookup(key)
+        weights = {name: weight for name, weight in (weights or {}).items() if weight is not None}
+        score = self.field_index.scorer(weights) if weights else None
+        rows, scores = self.engine.top_k(row, k, self.facets.mask(filters), score)
+        return {'film': self.films([row])[0], 'recommandations': self.films(rows, scores)}
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Films dont le titre correspond le mieux à la requête"""
+        return self.films(self.title_index.search(query, limit))
+
+    def info(self):
+        return {'catalogue': self.catalog, 'version': self.version,
+                'films': len(self.engine.ids), 'backend': self.engine.backend,
+                'filtres': {**{name: self.facets.bounds(name) for name in self.facets.ranges},
+                            **{name: self.facets.options(name) for name in self.facets.values}}}
@@ -0,0 +1,40 @@
+import functools
+
+# =========================
+# DONNÉES PARTAGÉES ENTRE SESSIONS (LECTURE SEULE, COPY-ON-WRITE)
+# =========================
+
+@functools.lru_cache(maxsize=None)
+def enable_copy_on_write():
+    """Active Copy-on-Write (toujours actif à partir de pandas 3)"""
+    import pandas as pd
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+def cow_view(value):
+    """Vue d'une valeur partagée : DataFrame et Series en copie superficielle, tuples parcourus.
+
+    Avec Copy-on-Write, la vue ne copie aucune donnée ; une modification
+    (colonne ajoutée, valeur changée) ne copie que les colonnes touchées,
+    dans la vue seulement : l'original partagé reste intact.
+    """
+    import pandas as pd
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(cow_view(item) for item in value)
+    return value
+
+def shared(func):
+    """Décorateur d'un chargeur en `st.cache_resource` : un seul exemplaire par processus.
+
+    Chaque appel reçoit une vue Copy-on-Write au lieu de la copie complète
+    (désérialisation) que `st.cache_data` fait à chaque rerun de chaque session.
+    """
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        enable_copy_on_write()
+        return cow_view(func(*args, **kwargs))
+
+    call.clear = getattr(func, 'clear', None)
+    return call
@@ -0,0 +1,114 @@
+import re
+import unicodedata
+import numpy as np
+
+# =========================
+# RECHERCHE DE TITRES CÔTÉ SERVEUR
+# =========================
+
+SEARCH_LIMIT = 20
+# Similarité trigramme minimale pour qu'un titre soit proposé en correspondance floue
+MIN_SIMILARITY = 0.3
+# Part maximale du catalogue qu'une liste de trigramme peut couvrir pour être parcourue
+MAX_POSTING_SHARE = 0.05
+
+def normalize_title(title):
+    """Minuscules, sans accents ni ponctuation : 'L'Été meurtrier' -> 'l ete meurtrier'"""
+    if not isinstance(title, str):
+        return ""
+    text = unicodedata.normalize('NFKD', title)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r'[a-z0-9]+', text))
+
+def trigrams(text):
+    """Trigrammes de chaque mot, complétés comme pg_trgm ('  mot ')"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class TitleSearchIndex:
+    """Index préconstruit des titres normalisés : préfixes et trigrammes.
+
+    Un titre qui commence par la requête passe devant un titre dont un mot
+    commence par la requête, lui-même devant les correspondances floues
+    (similarité de Dice sur les trigrammes, tolérante aux fautes de frappe).
+    """
+
+    def __init__(self, titles):
+        normalized = [normalize_title(title) for title in titles]
+        self.lengths = np.array([len(title) for title in normalized], dtype=np.int32)
+
+        # Préfixe du titre entier : titres triés, recherche par dichotomie
+        self.sorted_titles = np.array(normalized, dtype=object)
+        self.title_order = np.argsort(self.sorted_titles, kind='stable')
+        self.sorted_titles = self.sorted_titles[self.title_order]
+
+        # Préfixe d'un mot quelconque : (mot, ligne) triés par mot
+        words, word_rows = [], []
+        for row, title in enumerate(normalized):
+            for word in set(title.split()):
+                words.append(word)
+                word_rows.append(row)
+        words = np.array(words, dtype=object)
+        order = np.argsort(words, kind='stable')
+        self.words = words[order]
+        self.word_rows = np.array(word_rows, dtype=np.int32)[order]
+
+        # Trigrammes : listes de lignes par trigramme
+        postings = {}
+        self.n_trigrams = np.zeros(len(normalized), dtype=np.int32)
+        for row, title in enumerate(normalized):
+            grams = trigrams(title)
+            self.n_trigrams[row] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    @staticmethod
+    def _prefix_range(sorted_values, prefix):
+        start = np.searchsorted(sorted_values, prefix, side='left')
+        end = np.searchsorted(sorted_values, prefix + '\uffff', side='right')
+        return start, end
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Lignes des `limit` titres les plus proches de la requête"""
+        query = normalize_title(query)
+        if not query:
+            return np.arange(min(limit, len(self.lengths)))
+        scores = {}
+
+        # Correspondances floues (requêtes de 3 caractères ou plus) : trigrammes partagés
+        grams = trigrams(query)
+        lists = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        # Trigrammes très fréquents (' le', 'the'...) ignorés, sauf le plus rare s'ils le sont tous
+        frequent = MAX_POSTING_SHARE * len(self.lengths)
+        lists = [postings for postings in lists if len(postings) <= frequent] or lists[:1]
+        if lists and len(query) >= 3:
+            rows = np.concatenate(lists)
+            if len(rows) < len(self.lengths) // 8:
+                candidates, shared = np.unique(rows, return_counts=True)
+            else:
+                shared = np.bincount(rows, minlength=len(self.lengths))
+                candidates = np.flatnonzero(shared)
+                shared = shared[candidates]
+            similarity = 2 * shared / (len(grams) + self.n_trigrams[candidates])
+            keep = similarity >= MIN_SIMILARITY
+            # Au-delà de `limit` candidats flous, seuls les meilleurs comptent
+            best = np.argsort(-similarity[keep], kind='stable')[:limit]
+            for row, sim in zip(candidates[keep][best], similarity[keep][best]):
+                scores[int(row)] = float(sim)
+
+        # Préfixes : le dernier mot peut être incomplet pendant la frappe
+        last_word = query.split()[-1]
+        start, end = self._prefix_range(self.words, last_word)
+        for row in self.word_rows[start:min(end, start + 4 * limit)]:
+            scores[int(row)] = max(scores.get(int(row), 0.0), 1.0)
+        start, end = self._prefix_range(self.sorted_titles, query)
+        for row in self.title_order[start:min(end, start + limit)]:
+            scores[int(row)] = 2.0
+
+        # Score décroissant, puis titres courts d'abord
+        ranked = sorted(scores, key=lambda row: (-scores[row], self.lengths[row], row))
+        return np.array(ranked[:limit], dtype=np.intp)
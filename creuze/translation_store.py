@@ -0,0 +1,185 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, as_completed
+from .metrics import METRICS
+
+# =========================
+# CACHE DE TRADUCTIONS PERSISTANT (SQLITE)
+# =========================
+
+TRANSLATIONS_PATH = 'translations.sqlite'
+# Limite de variables par requête SQLite : les recherches se font par lots
+LOOKUP_BATCH = 500
+# Appels concurrents au backend et délai au-delà duquel on garde le texte d'origine
+TRANSLATION_WORKERS = 8
+TRANSLATION_TIMEOUT = 3.0
+
+def google_backend(texts, target):
+    """Backend par défaut : traduction par lot via Google Translate"""
+    # Importé au premier appel : deep_translator charge requests et BeautifulSoup
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source="auto", target=target).translate_batch(list(texts))
+
+def text_key(text):
+    """Clé de cache d'un texte (empreinte SHA-1)"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class TranslationStore:
+    """Traductions persistées sur disque et partagées par tous les workers.
+
+    Le backend est un appelable `(texts, target) -> list[str]`, remplaçable
+    par un traducteur local dans les tests. Les échecs du backend ne sont
+    pas mis en cache : le texte d'origine est renvoyé.
+
+    `submit_many` lance les traductions absentes du cache sur un pool de
+    threads borné ; `iter_completed` restitue les groupes de textes dès
+    qu'ils sont prêts, avec repli sur l'original passé `timeout` secondes.
+    """
+
+    def __init__(self, path=TRANSLATIONS_PATH, backend=google_backend,
+                 max_workers=TRANSLATION_WORKERS, timeout=TRANSLATION_TIMEOUT):
+        self.path = path
+        self.backend = backend
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='traduction')
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS translations (
+                                key TEXT NOT NULL,
+                                target TEXT NOT NULL,
+                                translation TEXT NOT NULL,
+                                PRIMARY KEY (key, target))""")
+
+    def _connection(self):
+        """Une connexion par thread (WAL : lectures concurrentes entre processus)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, texts, target='fr'):
+        """Traductions déjà connues : dict texte -> traduction"""
+        keys = {text_key(text): text for text in texts}
+        found = {}
+        key_list = list(keys)
+        conn = self._connection()
+        for start in range(0, len(key_list), LOOKUP_BATCH):
+            batch = key_list[start:start + LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT key, translation FROM translations "
+                f"WHERE target = ? AND key IN ({placeholders})", [target, *batch])
+            for key, translation in rows:
+                found[keys[key]] = translation
+        return found
+
+    def store(self, translations, target='fr'):
+        """Enregistre un dict texte -> traduction"""
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, target, translation) VALUES (?, ?, ?)",
+                [(text_key(text), target, translation) for text, translation in translations.items()])
+
+    def translate_many(self, texts, target='fr'):
+        """Traduit une liste de textes : cache d'abord, un seul appel backend pour les absents"""
+        with METRICS.span('translate'):
+            unique = list(dict.fromkeys(t for t in texts if isinstance(t, str) and t.strip()))
+            known = self.lookup(unique, target)
+            missing = [text for text in unique if text not in known]
+            METRICS.count('translations', 'hit', len(unique) - len(missing))
+            METRICS.count('translations', 'miss', len(missing))
+            if missing:
+                try:
+                    with METRICS.span('translate_backend'):
+                        translated = self.backend(missing, target)
+                except Exception:
+                    translated = None
+                if translated is not None:
+                    fresh = {text: result for text, result in zip(missing, translated) if result}
+                    self.store(fresh, target)
+                    known.update(fresh)
+            return [known.get(text, text) if isinstance(text, str) and text.strip() else ""
+                    for text in texts]
+
+    def translate(self, text, target='fr'):
+        """Traduit un seul texte (passe par le cache)"""
+        return self.translate_many([text], target)[0]
+
+    def _translate_one(self, text, target):
+        """Appel backend pour un texte, exécuté dans le pool de threads"""
+        with METRICS.span('translate_backend'):
+            translation = self.backend([text], target)[0]
+        if translation:
+            self.store({text: translation}, target)
+        return translation or text
+
+    def submit_many(self, texts, target='fr'):
+        """Une Future par texte : déjà résolue si en cache, sinon traduite en parallèle"""
+        with METRICS.span('translate'):
+            valid = [t for t in texts if isinstance(t, str) and t.strip()]
+            unique = list(dict.fromkeys(valid))
+            known = self.lookup(unique, target)
+            METRICS.count('translations', 'hit', len(known))
+            METRICS.count('translations', 'miss', len(unique) - len(known))
+            pending = {}
+            futures = []
+            for text in texts:
+                if not (isinstance(text, str) and text.strip()) or text in known:
+                    future = Future()
+                    future.set_result(known.get(text, "") if isinstance(text, str) else "")
+                else:
+                    if text not in pending:
+                        pending[text] = self._executor.submit(self._translate_one, text, target)
+                    future = pending[text]
+                futures.append(future)
+            return futures
+
+    def iter_completed(self, groups, timeout=None):
+        """Produit (clé, traductions) pour chaque groupe dès que ses Futures sont prêtes.
+
+        `groups` associe une clé à une liste de couples (future, texte).
+        Passé le délai, les traductions manquantes sont remplacées par le
+        texte d'origine : la page attend au plus le plus lent des appels.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        keys_by_future = {}
+        for key, items in groups.items():
+            for future, _ in items:
+                keys_by_future.setdefault(future, []).append(key)
+        emitted = set()
+
+        def resolve(key):
+            emitted.add(key)
+            return key, [_result_or_original(future, text) for future, text in groups[key]]
+
+        for key, items in groups.items():
+            if all(future.done() for future, _ in items):
+                yield resolve(key)
+        waiting = [f for f in keys_by_future if not f.done()]
+        try:
+            for future in as_completed(waiting, timeout=max(0.0, deadline - time.monotonic())):
+                for key in keys_by_future[future]:
+                    if key not in emitted and all(f.done() for f, _ in groups[key]):
+                        yield resolve(key)
+        except TimeoutError:
+            pass
+        late = {future for future in keys_by_future if not future.done()}
+        METRICS.count('translations', 'timeout', len(late))
+        for key in groups:
+            if key not in emitted:
+                yield resolve(key)
+
+def _result_or_original(future, text):
+    """Traduction si l'appel a abouti à temps, texte d'origine sinon"""
+    if not future.done():
+        return text if isinstance(text, str) else ""
+    try:
+        return future.result()
+    except Exception:
+        return text
@@ -1,13 +1,14 @@
+import json
+import os
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib as plt
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from deep_translator import GoogleTranslator
+# Dépendances lourdes (pandas, plotly, scikit-learn...) importées par chaque page
+# à sa première visite : l'accueil s'affiche sans les charger
+from creuze.imports import IMPORT_TIMES, STARTUP_BUDGET, timed_imports
+from creuze.metrics import METRICS
+from creuze.shared import shared
+
+# Chaque rerun est une exécution mesurée (sections détaillées dans le panneau ?debug=1)
+METRICS.begin_run()
 
 # =========================
 # CONFIGURATION DE LA PAGE
@@ -121,6 +122,7 @@ st.markdown("""
 
 class INSEEDataExtractor:
     def get_population_data(self):
+        import pandas as pd
         data = {
             'Tranche_age': ['0-14 ans', '15-29 ans', '30-44 ans', '45-59 ans', '60-74 ans', '75 ans et +'],
             'Population': [13800, 12500, 15200, 22100, 28400, 23500],
@@ -130,6 +132,7 @@ class INSEEDataExtractor:
 
 class CNCDataExtractor:
     def get_top_films_2024(self):
+        import pandas as pd
         data = {
             'Film': ['Un p\'tit truc en plus', 'Le Comte de Monte-Cristo', 'Vice-versa 2', 'Vaiana 2', 
                      "L'Amour Ouf", 'Moi, moche et méchant 4', 'Dune 2', 'Deadpool & Wolverine', 
@@ -142,6 +145,7 @@ class CNCDataExtractor:
         return pd.DataFrame(data)
 
     def get_frequentation_nationale(self):
+        import pandas as pd
         data = {
             'Année': [2019, 2020, 2021, 2022, 2023, 2024],
             'Entrées_millions': [213.3, 65.1, 95.5, 152.1, 180.4, 181.5],
@@ -152,6 +156,7 @@ class CNCDataExtractor:
         return df
 
     def get_frequentation_creuse(self):
+        import pandas as pd
         data = {
           'Catégorie': ['Art et Essai', 'Art et Essai', 'Films Français', 'Films Français', 
                         'Films Américains', 'Films Américains'],
@@ -163,21 +168,30 @@ class CNCDataExtractor:
 
 
 # FONCTIONS DE CHARGEMENT DES DONNÉES
-
-@st.cache_data
-def load_movie_data():
-    """Charge les données pour le système de recommandation"""
-    df = pd.read_csv('https://raw.githubusercontent.com/Yachre/Creuze/refs/heads/main/Database_finale.csv')
-    columns_to_combine = ['Genre', 'Réalisateur', 'Acteur', 'Actrice', 'Synopsis']
-    for col in columns_to_combine:
-        df[col] = df[col].fillna('')
-    df['features'] = df['Genre'] + " " + df['Réalisateur'] + " " + \
-                     df['Acteur'] + " " + df['Actrice'] + " " + df['Synopsis']
-    return df
-
-@st.cache_data
+# Données chargées une fois par processus (st.cache_resource) et partagées par toutes les
+# sessions : chaque rerun en reçoit une vue Copy-on-Write, sans copie ni désérialisation
+
+@shared
+@METRICS.cached('load_movie_data', st.cache_resource)
+def load_movie_data(columns=None):
+    """Charge le catalogue local (Parquet), converti une seule fois depuis le CSV si absent"""
+    from creuze.catalog_store import CATALOG_CSV_URL, CATALOG_PATH, RECOMMENDER_COLUMNS, load_catalog
+    return load_catalog(CATALOG_PATH, CATALOG_CSV_URL, columns=list(columns or RECOMMENDER_COLUMNS))
+
+@shared
+@METRICS.cached('load_full_catalog', st.cache_resource)
+def load_full_catalog(columns=None):
+    """Charge le catalogue complet (Dataset_1960_Plus) au schéma de l'application"""
+    from creuze.catalog_store import (FULL_CATALOG_COLUMNS, FULL_CATALOG_CSV, FULL_CATALOG_PATH,
+                                      RECOMMENDER_COLUMNS, load_catalog)
+    return load_catalog(FULL_CATALOG_PATH, FULL_CATALOG_CSV, FULL_CATALOG_COLUMNS,
+                        list(columns or RECOMMENDER_COLUMNS))
+
+@shared
+@METRICS.cached('load_market_data', st.cache_resource)
 def load_market_data():
     """Charge toutes les données pour l'étude de marché"""
+    import pandas as pd
     df_population = pd.DataFrame({
         'Tranche_age': ['0-14 ans', '15-29 ans', '30-44 ans', '45-59 ans', '60-74 ans', '75 ans et +'],
         'Population': [13800, 12500, 15200, 22100, 28400, 23500],
@@ -250,23 +264,102 @@ def load_market_data():
     return (df_population, df_revenus, df_csp, df_internet, df_freq_creuse, 
             df_genres, df_top_films, df_freq_nat, df_saison)
 
+@st.cache_data
+def market_data_version():
+    """Version des données de l'étude de marché, clé du cache de figures"""
+    from creuze.figures import data_version
+    return data_version(*load_market_data())
+
+@shared
+@METRICS.cached('load_kpi_data', st.cache_resource)
+def load_kpi_data():
+    """Données CNC et INSEE du tableau de bord KPI, chiffres clés calculés une fois, et leur version"""
+    from creuze.aggregates import market_kpis
+    from creuze.figures import data_version
+    cnc = CNCDataExtractor()
+    insee = INSEEDataExtractor()
+    frames = (cnc.get_top_films_2024(), cnc.get_frequentation_nationale(),
+              cnc.get_frequentation_creuse(), insee.get_population_data())
+    return frames, market_kpis(frames[2], frames[1]), data_version(*frames)
+
+@METRICS.cached('load_catalog_aggregates', st.cache_data)
+def load_catalog_aggregates(version):
+    """Composition du catalogue, matérialisée à l'ingestion (métadonnées Parquet)"""
+    from creuze.catalog_store import CATALOG_PATH, read_catalog_aggregates
+    return read_catalog_aggregates(CATALOG_PATH)
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Figures Plotly construites une fois, partagées entre sessions"""
+    from creuze.figures import FigureCache
+    return FigureCache()
+
+def figure_format_selector():
+    """Choix du rendu des graphiques ; images statiques seulement si kaleido est installé"""
+    from creuze.figures import FIGURE_FORMATS, static_export_available
+    if static_export_available():
+        st.sidebar.radio("Graphiques :", FIGURE_FORMATS, key='figure_format', horizontal=True,
+                         help="SVG/PNG : images statiques, plus légères pour les connexions lentes")
+
+def show_figure(build, version):
+    """Affiche une figure du cache (nommée d'après son constructeur), construite au premier appel"""
+    cache = get_figure_cache()
+    fmt = st.session_state.get('figure_format', 'interactif')
+    if fmt == 'interactif':
+        st.plotly_chart(cache.figure(build.__name__, version, build), use_container_width=True)
+    else:
+        image = cache.image(build.__name__, version, build, fmt)
+        st.image(image.decode('utf-8') if fmt == 'svg' else image, use_container_width=True)
+
+def film_label(df, row):
+    """Libellé d'un film dans la liste : titre et année (les titres se répètent)"""
+    import pandas as pd
+    annee = df['Année_de_Sortie'].iat[row]
+    titre = df['Titre'].iat[row]
+    return f"{titre} ({int(annee)})" if pd.notnull(annee) else str(titre)
+
+@METRICS.cached('load_title_index', st.cache_resource(show_spinner=False))
+def load_title_index(version, _df):
+    """Index de recherche des titres, construit une fois par version du catalogue"""
+    from creuze.title_search import TitleSearchIndex
+    return TitleSearchIndex(_df['Titre'])
+
+@st.cache_resource(show_spinner=False)
+def get_translation_store():
+    """Cache de traductions sur disque, partagé entre sessions et workers"""
+    from creuze.translation_store import TRANSLATIONS_PATH, TranslationStore
+    return TranslationStore(TRANSLATIONS_PATH)
+
+@st.cache_resource(show_spinner=False)
+def get_poster_cache():
+    """Cache disque des affiches TMDB et vignettes, partagé entre sessions"""
+    from creuze.poster_cache import POSTER_CACHE_DIR, PosterCache
+    return PosterCache(POSTER_CACHE_DIR)
+
+@METRICS.cached('load_recommender', st.cache_resource(show_spinner=False))
+def load_recommender(version, _df, path, backend='exact'):
+    """Construit le moteur une fois par version, partagé entre sessions"""
+    from creuze.recommender import build_engine
+    # Index incrémental maintenu hors ligne (python -m creuze.recommender), s'il couvre ce catalogue
+    return build_engine(_df, path, backend)
+
+@METRICS.cached('load_facets', st.cache_resource(show_spinner=False))
+def load_facets(version, _df):
+    """Index bitmap des filtres (année, note, durée, genre, catégorie), une fois par version"""
+    from creuze.facets import FacetIndex
+    return FacetIndex(_df)
+
+@METRICS.cached('load_field_index', st.cache_resource(show_spinner=False))
+def load_field_index(version, _df):
+    """Matrices TF-IDF par champ, construites une fois par version au premier usage"""
+    from creuze.recommender import FieldIndex
+    return FieldIndex(_df)
+
 @st.cache_data(show_spinner=False)
-def traduire_en_francais(texte):
-    """Traduit le texte en français"""
-    if not isinstance(texte, str) or texte.strip() == "":
-        return ""
-    try:
-        return GoogleTranslator(source="auto", target="fr").translate(texte)
-    except Exception:
-        return texte
-
-def get_recommendations(title, df, sig):
-    """Obtient les recommandations de films similaires"""
-    idx = df.index[df['Titre'] == title].tolist()[0]
-    sig_scores = list(enumerate(sig[idx]))
-    sig_scores = sorted(sig_scores, key=lambda x: x[1], reverse=True)
-    movie_indices = [i[0] for i in sig_scores[1:7]]
-    return df.iloc[movie_indices]
+def load_memory_report(version, _df, _engine, _title_index, _facets):
+    """Rapport mémoire par structure, calculé une fois par version du catalogue"""
+    from creuze.recommender import memory_report
+    return memory_report(_df, _engine, _title_index, _facets)
 
 # =========================
 # SIDEBAR - MENU DE NAVIGATION
@@ -351,12 +444,18 @@ if menu == "Accueil":
 # =========================
 
 elif menu == "Étude de Marché":
+    with timed_imports(menu):
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
     st.title("Étude de Marché : Cinéma en Creuse")
     st.markdown("---")
     
-    # Chargement des données
+    # Chargement des données ; les graphiques sont mis en cache par version des données
     (df_population, df_revenus, df_csp, df_internet, df_freq_creuse, 
      df_genres, df_top_films, df_freq_nat, df_saison) = load_market_data()
+    version = market_data_version()
+    figure_format_selector()
     
     # Sous-menu
     section = st.radio(
@@ -389,29 +488,35 @@ elif menu == "Étude de Marché":
         
         with col1:
             st.subheader("Fréquentation par Cinéma (2024)")
-            fig = px.bar(df_freq_creuse.sort_values('Entrées_2024', ascending=True),
-                        x='Entrées_2024', y='Cinema', orientation='h',
-                        color='Entrées_2024', color_continuous_scale='Teal', text='Entrées_2024')
-            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-            fig.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_ensemble_cinemas():
+                fig = px.bar(df_freq_creuse.sort_values('Entrées_2024', ascending=True),
+                            x='Entrées_2024', y='Cinema', orientation='h',
+                            color='Entrées_2024', color_continuous_scale='Teal', text='Entrées_2024')
+                fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+                fig.update_layout(showlegend=False, height=400)
+                return fig
+            show_figure(fig_ensemble_cinemas, version)
         
         with col2:
             st.subheader("Structure de la Population")
-            fig = px.pie(df_population, values='Population', names='Tranche_age', hole=0.4,
-                        color_discrete_sequence=px.colors.qualitative.Set3)
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_ensemble_population():
+                fig = px.pie(df_population, values='Population', names='Tranche_age', hole=0.4,
+                            color_discrete_sequence=px.colors.qualitative.Set3)
+                fig.update_traces(textposition='inside', textinfo='percent+label')
+                fig.update_layout(height=400)
+                return fig
+            show_figure(fig_ensemble_population, version)
         
         st.subheader("Évolution de la Fréquentation Nationale")
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df_freq_nat['Année'], y=df_freq_nat['Entrées_millions'],
-                                mode='lines+markers', name='Entrées (millions)',
-                                line=dict(color='#1f77b4', width=3), marker=dict(size=10)))
-        fig.update_layout(xaxis_title="Année", yaxis_title="Entrées (millions)",
-                         height=400, hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        def fig_ensemble_nationale():
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=df_freq_nat['Année'], y=df_freq_nat['Entrées_millions'],
+                                    mode='lines+markers', name='Entrées (millions)',
+                                    line=dict(color='#1f77b4', width=3), marker=dict(size=10)))
+            fig.update_layout(xaxis_title="Année", yaxis_title="Entrées (millions)",
+                             height=400, hovermode='x unified')
+            return fig
+        show_figure(fig_ensemble_nationale, version)
     
     # DÉMOGRAPHIE INSEE
     elif section == "Démographie INSEE":
@@ -424,12 +529,14 @@ elif menu == "Étude de Marché":
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                fig = px.bar(df_population, x='Pourcentage', y='Tranche_age', orientation='h',
-                            text='Pourcentage', color='Pourcentage', color_continuous_scale='Greens')
-                fig.update_traces(texttemplate='%{text}%', textposition='outside')
-                fig.update_layout(xaxis_title="Pourcentage de la population (%)",
-                                 yaxis_title="Tranche d'âge", showlegend=False, height=500)
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_demo_ages():
+                    fig = px.bar(df_population, x='Pourcentage', y='Tranche_age', orientation='h',
+                                text='Pourcentage', color='Pourcentage', color_continuous_scale='Greens')
+                    fig.update_traces(texttemplate='%{text}%', textposition='outside')
+                    fig.update_layout(xaxis_title="Pourcentage de la population (%)",
+                                     yaxis_title="Tranche d'âge", showlegend=False, height=500)
+                    return fig
+                show_figure(fig_demo_ages, version)
             
             with col2:
                 st.dataframe(df_population[['Tranche_age', 'Population', 'Pourcentage']],
@@ -445,39 +552,45 @@ elif menu == "Étude de Marché":
             st.subheader("Comparaison des Revenus")
             df_rev_comp = df_revenus[df_revenus['Indicateur'].isin(['Revenu médian', 'Revenu moyen'])]
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Creuse', x=df_rev_comp['Indicateur'], 
-                                y=df_rev_comp['Creuse'], marker_color='coral'))
-            fig.add_trace(go.Bar(name='Nouvelle-Aquitaine', x=df_rev_comp['Indicateur'],
-                                y=df_rev_comp['Nouvelle-Aquitaine'], marker_color='steelblue'))
-            fig.add_trace(go.Bar(name='France', x=df_rev_comp['Indicateur'],
-                                y=df_rev_comp['France'], marker_color='seagreen'))
-            fig.update_layout(barmode='group', yaxis_title="Revenu (€/an)", height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_demo_revenus():
+                fig = go.Figure()
+                fig.add_trace(go.Bar(name='Creuse', x=df_rev_comp['Indicateur'], 
+                                    y=df_rev_comp['Creuse'], marker_color='coral'))
+                fig.add_trace(go.Bar(name='Nouvelle-Aquitaine', x=df_rev_comp['Indicateur'],
+                                    y=df_rev_comp['Nouvelle-Aquitaine'], marker_color='steelblue'))
+                fig.add_trace(go.Bar(name='France', x=df_rev_comp['Indicateur'],
+                                    y=df_rev_comp['France'], marker_color='seagreen'))
+                fig.update_layout(barmode='group', yaxis_title="Revenu (€/an)", height=400)
+                return fig
+            show_figure(fig_demo_revenus, version)
             
             st.subheader("Taux de Pauvreté Comparé")
             df_pov = df_revenus[df_revenus['Indicateur'] == 'Taux de pauvreté']
-            fig = go.Figure(go.Bar(
-                x=['Creuse', 'Nouvelle-Aquitaine', 'France'],
-                y=[df_pov['Creuse'].values[0], df_pov['Nouvelle-Aquitaine'].values[0], 
-                   df_pov['France'].values[0]],
-                marker_color=['coral', 'steelblue', 'seagreen'],
-                text=[f"{v}%" for v in [df_pov['Creuse'].values[0], 
-                      df_pov['Nouvelle-Aquitaine'].values[0], df_pov['France'].values[0]]],
-                textposition='outside'))
-            fig.update_layout(yaxis_title="Taux de pauvreté (%)", height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_demo_pauvrete():
+                fig = go.Figure(go.Bar(
+                    x=['Creuse', 'Nouvelle-Aquitaine', 'France'],
+                    y=[df_pov['Creuse'].values[0], df_pov['Nouvelle-Aquitaine'].values[0], 
+                       df_pov['France'].values[0]],
+                    marker_color=['coral', 'steelblue', 'seagreen'],
+                    text=[f"{v}%" for v in [df_pov['Creuse'].values[0], 
+                          df_pov['Nouvelle-Aquitaine'].values[0], df_pov['France'].values[0]]],
+                    textposition='outside'))
+                fig.update_layout(yaxis_title="Taux de pauvreté (%)", height=400)
+                return fig
+            show_figure(fig_demo_pauvrete, version)
         
         with tab3:
             st.subheader("Répartition des Catégories Socioprofessionnelles")
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Creuse', x=df_csp['CSP'], y=df_csp['Creuse_%'], 
-                                marker_color='coral'))
-            fig.add_trace(go.Bar(name='France', x=df_csp['CSP'], y=df_csp['France_%'],
-                                marker_color='steelblue'))
-            fig.update_layout(barmode='group', xaxis_tickangle=-45, 
-                             yaxis_title="Pourcentage (%)", height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_demo_csp():
+                fig = go.Figure()
+                fig.add_trace(go.Bar(name='Creuse', x=df_csp['CSP'], y=df_csp['Creuse_%'], 
+                                    marker_color='coral'))
+                fig.add_trace(go.Bar(name='France', x=df_csp['CSP'], y=df_csp['France_%'],
+                                    marker_color='steelblue'))
+                fig.update_layout(barmode='group', xaxis_tickangle=-45, 
+                                 yaxis_title="Pourcentage (%)", height=500)
+                return fig
+            show_figure(fig_demo_csp, version)
             
             st.warning("""
             **Observations :**
@@ -491,22 +604,26 @@ elif menu == "Étude de Marché":
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.bar(df_internet, x='Type_zone', y='Taux_acces_%',
-                            color='Taux_acces_%', color_continuous_scale='Greens',
-                            text='Taux_acces_%')
-                fig.update_traces(texttemplate='%{text}%', textposition='outside')
-                fig.update_layout(xaxis_title="Type de Zone", yaxis_title="Taux d'accès (%)",
-                                 showlegend=False, height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_demo_internet_acces():
+                    fig = px.bar(df_internet, x='Type_zone', y='Taux_acces_%',
+                                color='Taux_acces_%', color_continuous_scale='Greens',
+                                text='Taux_acces_%')
+                    fig.update_traces(texttemplate='%{text}%', textposition='outside')
+                    fig.update_layout(xaxis_title="Type de Zone", yaxis_title="Taux d'accès (%)",
+                                     showlegend=False, height=400)
+                    return fig
+                show_figure(fig_demo_internet_acces, version)
             
             with col2:
-                fig = px.bar(df_internet, x='Type_zone', y='Débit_moyen_Mbps',
-                            color='Débit_moyen_Mbps', color_continuous_scale='Purples',
-                            text='Débit_moyen_Mbps')
-                fig.update_traces(texttemplate='%{text} Mbps', textposition='outside')
-                fig.update_layout(xaxis_title="Type de Zone", yaxis_title="Débit Moyen (Mbps)",
-                                 showlegend=False, height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_demo_internet_debit():
+                    fig = px.bar(df_internet, x='Type_zone', y='Débit_moyen_Mbps',
+                                color='Débit_moyen_Mbps', color_continuous_scale='Purples',
+                                text='Débit_moyen_Mbps')
+                    fig.update_traces(texttemplate='%{text} Mbps', textposition='outside')
+                    fig.update_layout(xaxis_title="Type de Zone", yaxis_title="Débit Moyen (Mbps)",
+                                     showlegend=False, height=400)
+                    return fig
+                show_figure(fig_demo_internet_debit, version)
     
     # FRÉQUENTATION CINÉMAS
     elif section == "Fréquentation Cinémas":
@@ -519,27 +636,31 @@ elif menu == "Étude de Marché":
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                fig = px.bar(df_freq_creuse.sort_values('Entrées_2024', ascending=True),
-                            x='Entrées_2024', y='Cinema', orientation='h', color='Evolution_%',
-                            color_continuous_scale='RdYlGn', text='Entrées_2024',
-                            hover_data=['Ville', 'Nb_salles', 'Evolution_%'])
-                fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_freq_cinemas():
+                    fig = px.bar(df_freq_creuse.sort_values('Entrées_2024', ascending=True),
+                                x='Entrées_2024', y='Cinema', orientation='h', color='Evolution_%',
+                                color_continuous_scale='RdYlGn', text='Entrées_2024',
+                                hover_data=['Ville', 'Nb_salles', 'Evolution_%'])
+                    fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+                    fig.update_layout(height=400)
+                    return fig
+                show_figure(fig_freq_cinemas, version)
             
             with col2:
                 st.dataframe(df_freq_creuse[['Cinema', 'Ville', 'Nb_salles', 'Entrées_2024', 'Evolution_%']],
                            hide_index=True, use_container_width=True)
             
             st.subheader("Évolution 2023 → 2024")
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='2023', x=df_freq_creuse['Cinema'],
-                                y=df_freq_creuse['Entrées_2023'], marker_color='lightcoral'))
-            fig.add_trace(go.Bar(name='2024', x=df_freq_creuse['Cinema'],
-                                y=df_freq_creuse['Entrées_2024'], marker_color='darkturquoise'))
-            fig.update_layout(barmode='group', xaxis_tickangle=-45,
-                             yaxis_title="Nombre d'entrées", height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_freq_evolution():
+                fig = go.Figure()
+                fig.add_trace(go.Bar(name='2023', x=df_freq_creuse['Cinema'],
+                                    y=df_freq_creuse['Entrées_2023'], marker_color='lightcoral'))
+                fig.add_trace(go.Bar(name='2024', x=df_freq_creuse['Cinema'],
+                                    y=df_freq_creuse['Entrées_2024'], marker_color='darkturquoise'))
+                fig.update_layout(barmode='group', xaxis_tickangle=-45,
+                                 yaxis_title="Nombre d'entrées", height=400)
+                return fig
+            show_figure(fig_freq_evolution, version)
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -551,18 +672,20 @@ elif menu == "Étude de Marché":
         
         with tab2:
             st.subheader("Évolution de la Fréquentation Nationale")
-            fig = make_subplots(specs=[[{"secondary_y": True}]])
-            fig.add_trace(go.Bar(name='Entrées (millions)', x=df_freq_nat['Année'],
-                                y=df_freq_nat['Entrées_millions'], marker_color='steelblue'),
-                         secondary_y=False)
-            fig.add_trace(go.Scatter(name='Nombre de films', x=df_freq_nat['Année'],
-                                    y=df_freq_nat['Nombre_films'], mode='lines+markers',
-                                    marker_color='coral', line=dict(width=3)), secondary_y=True)
-            fig.update_xaxes(title_text="Année")
-            fig.update_yaxes(title_text="Entrées (millions)", secondary_y=False)
-            fig.update_yaxes(title_text="Nombre de films", secondary_y=True)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_freq_nationale():
+                fig = make_subplots(specs=[[{"secondary_y": True}]])
+                fig.add_trace(go.Bar(name='Entrées (millions)', x=df_freq_nat['Année'],
+                                    y=df_freq_nat['Entrées_millions'], marker_color='steelblue'),
+                             secondary_y=False)
+                fig.add_trace(go.Scatter(name='Nombre de films', x=df_freq_nat['Année'],
+                                        y=df_freq_nat['Nombre_films'], mode='lines+markers',
+                                        marker_color='coral', line=dict(width=3)), secondary_y=True)
+                fig.update_xaxes(title_text="Année")
+                fig.update_yaxes(title_text="Entrées (millions)", secondary_y=False)
+                fig.update_yaxes(title_text="Nombre de films", secondary_y=True)
+                fig.update_layout(height=500)
+                return fig
+            show_figure(fig_freq_nationale, version)
             
             st.info("""
             **Tendances :**
@@ -573,17 +696,19 @@ elif menu == "Étude de Marché":
         
         with tab3:
             st.subheader("Saisonnalité de la Fréquentation")
-            colors = ['#ff6b6b' if v == 'Oui' else '#4ecdc4' for v in df_saison['Vacances_scolaires']]
-            fig = go.Figure()
-            fig.add_trace(go.Bar(x=df_saison['Mois'], y=df_saison['Indice_freq'],
-                                marker_color=colors, text=df_saison['Indice_freq'],
-                                textposition='outside',
-                                hovertemplate='<b>%{x}</b><br>Indice: %{y}<br>Vacances: %{customdata}<extra></extra>',
-                                customdata=df_saison['Vacances_scolaires']))
-            fig.add_hline(y=100, line_dash="dash", line_color="red", annotation_text="Moyenne (100)")
-            fig.update_layout(xaxis_tickangle=-45, yaxis_title="Indice de fréquentation",
-                             height=500, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_freq_saison():
+                colors = ['#ff6b6b' if v == 'Oui' else '#4ecdc4' for v in df_saison['Vacances_scolaires']]
+                fig = go.Figure()
+                fig.add_trace(go.Bar(x=df_saison['Mois'], y=df_saison['Indice_freq'],
+                                    marker_color=colors, text=df_saison['Indice_freq'],
+                                    textposition='outside',
+                                    hovertemplate='<b>%{x}</b><br>Indice: %{y}<br>Vacances: %{customdata}<extra></extra>',
+                                    customdata=df_saison['Vacances_scolaires']))
+                fig.add_hline(y=100, line_dash="dash", line_color="red", annotation_text="Moyenne (100)")
+                fig.update_layout(xaxis_tickangle=-45, yaxis_title="Indice de fréquentation",
+                                 height=500, showlegend=False)
+                return fig
+            show_figure(fig_freq_saison, version)
             
             col1, col2 = st.columns(2)
             with col1:
@@ -608,23 +733,25 @@ elif menu == "Étude de Marché":
             st.subheader("Préférences de Genres par Segment de Public")
             df_genres_sorted = df_genres.sort_values('Moyenne_%', ascending=True)
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Jeunes (18-30)', y=df_genres_sorted['Genre'],
-                                x=df_genres_sorted['Preference_jeunes_%'], orientation='h',
-                                marker_color='coral'))
-            fig.add_trace(go.Bar(name='Seniors (50+)', y=df_genres_sorted['Genre'],
-                                x=df_genres_sorted['Preference_seniors_%'], orientation='h',
-                                marker_color='steelblue'))
-            fig.add_trace(go.Bar(name='Familles', y=df_genres_sorted['Genre'],
-                                x=df_genres_sorted['Preference_familles_%'], orientation='h',
-                                marker_color='seagreen'))
-            fig.add_trace(go.Bar(name='Moyenne', y=df_genres_sorted['Genre'],
-                                x=df_genres_sorted['Moyenne_%'], orientation='h',
-                                marker_color='gold'))
-            fig.update_layout(barmode='group', xaxis_title="Pourcentage de préférence (%)",
-                             height=600, legend=dict(orientation="h", yanchor="bottom", 
-                                                    y=1.02, xanchor="right", x=1))
-            st.plotly_chart(fig, use_container_width=True)
+            def fig_genres_segments():
+                fig = go.Figure()
+                fig.add_trace(go.Bar(name='Jeunes (18-30)', y=df_genres_sorted['Genre'],
+                                    x=df_genres_sorted['Preference_jeunes_%'], orientation='h',
+                                    marker_color='coral'))
+                fig.add_trace(go.Bar(name='Seniors (50+)', y=df_genres_sorted['Genre'],
+                                    x=df_genres_sorted['Preference_seniors_%'], orientation='h',
+                                    marker_color='steelblue'))
+                fig.add_trace(go.Bar(name='Familles', y=df_genres_sorted['Genre'],
+                                    x=df_genres_sorted['Preference_familles_%'], orientation='h',
+                                    marker_color='seagreen'))
+                fig.add_trace(go.Bar(name='Moyenne', y=df_genres_sorted['Genre'],
+                                    x=df_genres_sorted['Moyenne_%'], orientation='h',
+                                    marker_color='gold'))
+                fig.update_layout(barmode='group', xaxis_title="Pourcentage de préférence (%)",
+                                 height=600, legend=dict(orientation="h", yanchor="bottom", 
+                                                        y=1.02, xanchor="right", x=1))
+                return fig
+            show_figure(fig_genres_segments, version)
             
             st.subheader("Analyse Détaillée par Genre")
             df_display = df_genres[['Genre', 'Preference_jeunes_%', 'Preference_seniors_%',
@@ -647,14 +774,16 @@ elif menu == "Étude de Marché":
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                fig = px.bar(df_top_films, x='Entrées_millions', y='Film', orientation='h',
-                            color='Type',
-                            color_discrete_map={'Français': 'steelblue', 'US': 'coral', 'UK': 'seagreen'},
-                            text='Entrées_millions', hover_data=['Genre'])
-                fig.update_traces(texttemplate='%{text:.2f}M', textposition='outside')
-                fig.update_layout(xaxis_title="Entrées (millions)",
-                                 yaxis={'categoryorder':'total ascending'}, height=500)
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_top_films():
+                    fig = px.bar(df_top_films, x='Entrées_millions', y='Film', orientation='h',
+                                color='Type',
+                                color_discrete_map={'Français': 'steelblue', 'US': 'coral', 'UK': 'seagreen'},
+                                text='Entrées_millions', hover_data=['Genre'])
+                    fig.update_traces(texttemplate='%{text:.2f}M', textposition='outside')
+                    fig.update_layout(xaxis_title="Entrées (millions)",
+                                     yaxis={'categoryorder':'total ascending'}, height=500)
+                    return fig
+                show_figure(fig_top_films, version)
             
             with col2:
                 st.dataframe(df_top_films[['Film', 'Genre', 'Entrées_millions', 'Type']],
@@ -664,20 +793,24 @@ elif menu == "Étude de Marché":
             col1, col2 = st.columns(2)
             
             with col1:
-                type_sum = df_top_films.groupby('Type')['Entrées_millions'].sum().reset_index()
-                fig = px.pie(type_sum, values='Entrées_millions', names='Type', hole=0.4,
-                            color_discrete_map={'Français': 'steelblue', 'US': 'coral', 'UK': 'seagreen'})
-                fig.update_traces(textposition='inside', textinfo='percent+label')
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_top_origine():
+                    type_sum = df_top_films.groupby('Type')['Entrées_millions'].sum().reset_index()
+                    fig = px.pie(type_sum, values='Entrées_millions', names='Type', hole=0.4,
+                                color_discrete_map={'Français': 'steelblue', 'US': 'coral', 'UK': 'seagreen'})
+                    fig.update_traces(textposition='inside', textinfo='percent+label')
+                    return fig
+                show_figure(fig_top_origine, version)
             
             with col2:
-                genre_sum = df_top_films.groupby('Genre')['Entrées_millions'].sum().reset_index()
-                genre_sum = genre_sum.sort_values('Entrées_millions', ascending=False)
-                fig = px.bar(genre_sum, x='Genre', y='Entrées_millions',
-                            color='Entrées_millions', color_continuous_scale='Viridis')
-                fig.update_layout(xaxis_tickangle=-45, showlegend=False,
-                                 yaxis_title="Entrées (millions)")
-                st.plotly_chart(fig, use_container_width=True)
+                def fig_top_genres():
+                    genre_sum = df_top_films.groupby('Genre')['Entrées_millions'].sum().reset_index()
+                    genre_sum = genre_sum.sort_values('Entrées_millions', ascending=False)
+                    fig = px.bar(genre_sum, x='Genre', y='Entrées_millions',
+                                color='Entrées_millions', color_continuous_scale='Viridis')
+                    fig.update_layout(xaxis_tickangle=-45, showlegend=False,
+                                     yaxis_title="Entrées (millions)")
+                    return fig
+                show_figure(fig_top_genres, version)
     
     # ANALYSES APPROFONDIES
     elif section == "Analyses Approfondies":
@@ -800,25 +933,21 @@ elif menu == "Étude de Marché":
 # =========================
 
 elif menu == "KPI Stratégiques":
+    with timed_imports(menu):
+        import plotly.express as px
+        from creuze.catalog_store import CATALOG_CSV_URL, CATALOG_PATH, ensure_catalog, read_catalog_version
     st.title("Dashboard Stratégique : Cinéma en Creuse (23)")
     
-    # Initialisation
-    cnc = CNCDataExtractor()
-    insee = INSEEDataExtractor()
-    
-    df_top = cnc.get_top_films_2024()
-    df_nat = cnc.get_frequentation_nationale()
-    df_creuse = cnc.get_frequentation_creuse()
-    df_pop = insee.get_population_data()
+    # Initialisation : agrégats du catalogue lus dans ses métadonnées, sans relire les films
+    (df_top, df_nat, df_creuse, df_pop), kpis, version = load_kpi_data()
+    catalog_version = read_catalog_version(ensure_catalog(CATALOG_PATH, CATALOG_CSV_URL))
+    aggregates = load_catalog_aggregates(catalog_version)
+    figure_format_selector()
     
     # Ligne 1 : Les chiffres clés du CNC
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Part Films FR (23)", "56%", "+11.2% vs Nat")
-    with col2:
-        st.metric("Part Art & Essai (23)", "30.5%", "+5.4% vs Nat")
-    with col3:
-        st.metric("Entrées Nat. 2024", "181.5M", "+0.6%")
+    for col, (label, value, delta) in zip(st.columns(len(kpis)), kpis):
+        with col:
+            st.metric(label, value, delta)
     
     st.divider()
     
@@ -827,105 +956,219 @@ elif menu == "KPI Stratégiques":
 
     with col_a:
         st.subheader("Profil Démographique (Creuse)")
-        fig_pop = px.pie(df_pop, values='Pourcentage', names='Tranche_age', hole=0.4,
-                     title="Répartition de la population par âge",
-                     color_discrete_sequence=px.colors.sequential.Greens_r)
-        st.plotly_chart(fig_pop, use_container_width=True)
+        def fig_kpi_population():
+            fig_pop = px.pie(df_pop, values='Pourcentage', names='Tranche_age', hole=0.4,
+                         title="Répartition de la population par âge",
+                         color_discrete_sequence=px.colors.sequential.Greens_r)
+            return fig_pop
+        show_figure(fig_kpi_population, version)
 
     with col_b:
         st.subheader("Comparatif Marché")
-        fig_bar = px.bar(df_creuse, x='Catégorie', y='Part de marché (%)', color='Entité',
-            barmode='group', text_auto=True, title="Creuse vs Moyenne Nationale",
-            color_discrete_sequence=['#2E4A3F', '#A9FFB9'])
-        st.plotly_chart(fig_bar, use_container_width=True)
+        def fig_kpi_marche():
+            fig_bar = px.bar(df_creuse, x='Catégorie', y='Part de marché (%)', color='Entité',
+                barmode='group', text_auto=True, title="Creuse vs Moyenne Nationale",
+                color_discrete_sequence=['#2E4A3F', '#A9FFB9'])
+            return fig_bar
+        show_figure(fig_kpi_marche, version)
 
 # Centrer la composition de la base de données
     st.markdown("### Composition de la Base de Données")
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        st.success("""
-        - **8126** : Films Base de Données
-        - **4077** : Films Art et Essai
-        - **2940** : Films Français 
-        - **1109** : Blockbusters Américains
-        """)
+        st.success("\n".join([f"- **{aggregates['films']}** : Films Base de Données"]
+                             + [f"- **{count}** : {category}"
+                                for category, count in aggregates.get('categories', {}).items()]))
+        note, duree = aggregates.get('note', {}), aggregates.get('duree', {})
+        if note.get('mean') is not None and duree.get('median') is not None:
+            st.caption(f"Note moyenne : {note['mean']}/10 | Durée médiane : {duree['median']:.0f} min")
+    
+    col_c, col_d = st.columns(2)
+    with col_c:
+        def fig_kpi_decennies():
+            decades = aggregates.get('decades', {})
+            return px.bar(x=[f"{decade}s" for decade in decades], y=list(decades.values()),
+                          labels={'x': "Décennie", 'y': "Films"}, title="Films par décennie",
+                          color_discrete_sequence=['#2E4A3F'])
+        show_figure(fig_kpi_decennies, catalog_version)
+    with col_d:
+        def fig_kpi_genres():
+            # Les plus fréquents en haut du graphique
+            genres = dict(reversed(list(aggregates.get('genres', {}).items())[:10]))
+            return px.bar(x=list(genres.values()), y=list(genres), orientation='h',
+                          labels={'x': "Films", 'y': "Genre"}, title="Genres les plus représentés",
+                          color_discrete_sequence=['#228B22'])
+        show_figure(fig_kpi_genres, catalog_version)
 
 # =========================
 # PAGE RECOMMANDATION DE FILMS
 # =========================
 
 elif menu == "Recommandation de Films":
+    with timed_imports(menu):
+        import pandas as pd
+        from creuze.catalog_store import (CATALOG_PATH, FULL_CATALOG_CSV, FULL_CATALOG_PATH,
+                                          read_catalog_version)
+        from creuze.poster_cache import POSTER_BASE_URL, is_valid_poster
+        from creuze.recommender import get_recommendations
+        import creuze.title_search
+        import creuze.translation_store
     st.title("Movie Finder & Recommender")
     
-    # Chargement des données
-    df = load_movie_data()
-    base_url = "https://image.tmdb.org/t/p/w500"
+    # Chargement des données (catalogue complet si l'ETL l'a produit localement)
+    catalogue = "Sélection"
+    if os.path.exists(FULL_CATALOG_PATH) or os.path.exists(FULL_CATALOG_CSV):
+        catalogue = st.radio("Catalogue :", ["Sélection", "Complet (1960+)"], horizontal=True)
+    posters = get_poster_cache()
+    
+    # Moteur TF-IDF (mis en cache entre les reruns et les sessions)
+    if catalogue == "Sélection":
+        df = load_movie_data()
+        version = read_catalog_version(CATALOG_PATH)
+        engine = load_recommender(version, df, CATALOG_PATH)
+    else:
+        df = load_full_catalog()
+        version = read_catalog_version(FULL_CATALOG_PATH)
+        engine = load_recommender(version, df, FULL_CATALOG_PATH)
+    title_index = load_title_index(version, df)
+    facets = load_facets(version, df)
+    with st.expander("Mémoire utilisée par le catalogue et le moteur"):
+        report = load_memory_report(version, df, engine, title_index, facets)
+        st.caption(f"Total : {report['Octets'].sum() / 1e6:.1f} Mo")
+        st.dataframe(report[['Structure', 'Groupe', 'Mo']], hide_index=True)
     
-    # Préparation du moteur TF-IDF
-    tfidf = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = tfidf.fit_transform(df['features'])
-    cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+    # Filtres appliqués avant la sélection des voisins : seuls les réglages modifiés comptent
+    # (une borne laissée à son extrême garde les films sans valeur)
+    filters = {}
+    with st.expander("Filtrer les recommandations"):
+        for name, label in (('annee', "Année de sortie"), ('duree', "Durée (min)")):
+            bounds = facets.bounds(name)
+            if bounds and bounds[0] < bounds[1]:
+                low, high = st.slider(label, bounds[0], bounds[1], bounds)
+                filters[f'{name}_min'] = low if low > bounds[0] else None
+                filters[f'{name}_max'] = high if high < bounds[1] else None
+        if facets.bounds('note'):
+            note_min = st.slider("Note minimale", 0.0, 10.0, 0.0, step=0.1)
+            filters['note_min'] = note_min or None
+        filters['genre'] = st.multiselect("Genres", facets.options('genre'))
+        if facets.options('categorie'):
+            filters['categorie'] = st.multiselect("Catégories", facets.options('categorie'))
+    allowed = facets.mask(filters)
     
-    # Barre de sélection
-    selected_movie_name = st.selectbox(
-        "Recherchez ou sélectionnez un film :",
-        df['Titre'].values
+    # Similarité pondérée par champ : changer un poids ne relance pas la vectorisation
+    score = None
+    with st.expander("Pondération des champs"):
+        if st.toggle("Pondérer genre, réalisateur, distribution et synopsis"):
+            weights = {name: st.slider(label, 0.0, 3.0, 1.0, step=0.5)
+                       for name, label in (('genre', "Genre"), ('realisateur', "Réalisateur"),
+                                           ('acteur', "Acteurs"), ('actrice', "Actrices"),
+                                           ('synopsis', "Synopsis"))}
+            if any(weights.values()):
+                score = load_field_index(version, df).scorer(weights)
+            else:
+                st.warning("Au moins un poids doit être non nul.")
+    
+    # Recherche côté serveur : seuls les meilleurs résultats sont envoyés au navigateur
+    # (sélection par identifiant : les titres peuvent se répéter)
+    query = st.text_input("Recherchez un film :", placeholder="Titre (accents et majuscules facultatifs)")
+    selected_movie_id = st.selectbox(
+        "Sélectionnez un film :",
+        engine.ids[title_index.search(query)],
+        format_func=lambda film_id: film_label(df, engine.id_to_row[film_id])
     )
+    if selected_movie_id is None:
+        st.info(f"Aucun film ne correspond à « {query} »." if query.strip()
+                else "Aucun film dans ce catalogue.")
     
-    # SECTION 1 : DÉTAILS DU FILM SÉLECTIONNÉ
-    if selected_movie_name:
-        movie_info = df[df['Titre'] == selected_movie_name].iloc[0]
-        
-        st.markdown("---")
-        col_img, col_det = st.columns([1, 2])
-        
-        with col_img:
-            path = movie_info['Affiche_de_Film']
-            img_url = base_url + str(path) if pd.notnull(path) else "https://via.placeholder.com/500x750?text=No+Image"
-            st.image(img_url, use_container_width=True)
-        
-        with col_det:
-            st.header(movie_info['Titre'])
-            st.subheader(f"Année : {int(movie_info['Année_de_Sortie']) if pd.notnull(movie_info['Année_de_Sortie']) else 'N/A'}")
-            
-            m1, m2, m3 = st.columns(3)
-            m1.metric("Note", f" {movie_info['Note']:.1f}/10")
-            m2.metric("Durée", f" {movie_info['Durée']} min")
-            
-            st.write(f"**Genre :** {traduire_en_francais(movie_info['Genre'])}")
-            st.write(f"**Réalisateur :** {movie_info['Réalisateur']}")
-            st.write(f"**Casting :** {movie_info['Acteur']}, {movie_info['Actrice']}")
-            st.write("**Synopsis :**")
-            st.write(traduire_en_francais(movie_info['Synopsis']))
+    # SECTION 1 : DÉTAILS DU FILM SÉLECTIONNÉ (rempli une fois les traductions prêtes)
+    if selected_movie_id is not None:
+        selected_row = engine.lookup(selected_movie_id)
+        movie_info = df.iloc[selected_row]
+        details = st.container()
+        # Affiches du film et de ses voisins préparées en arrière-plan avant le clic
+        neighbours, _ = engine.top_k(selected_row, allowed=allowed, score=score)
+        posters.prefetch([movie_info['Affiche_de_Film']] + list(df['Affiche_de_Film'].iloc[neighbours]))
     
     # SECTION 2 : RECOMMANDATIONS
     st.markdown("---")
-    if st.button('Obtenir des recommandations similaires'):
-        recommendations = get_recommendations(selected_movie_name, df, cosine_sim)
-        
+    show_recommendations = st.button('Obtenir des recommandations similaires',
+                                     disabled=selected_movie_id is None)
+    
+    # Toutes les traductions (film choisi + cartes) partent en parallèle,
+    # chaque bloc s'affiche dès que les siennes sont prêtes
+    translation_groups = {}
+    if selected_movie_id is not None:
+        translation_groups['film'] = [movie_info['Genre'], movie_info['Synopsis']]
+    if show_recommendations:
+        recommendations = get_recommendations(selected_movie_id, df, engine, allowed=allowed, score=score)
+        for i, (index, row) in enumerate(recommendations.iterrows()):
+            translation_groups[i] = [row['Genre'], row['Synopsis']]
+    
+    store = get_translation_store()
+    textes = [texte for group in translation_groups.values() for texte in group]
+    futures = iter(store.submit_many(textes, target="fr"))
+    translation_groups = {key: [(next(futures), texte) for texte in group]
+                          for key, group in translation_groups.items()}
+    
+    card_slots = []
+    if show_recommendations and recommendations.empty:
+        st.info("Aucun film ne correspond aux filtres choisis.")
+    elif show_recommendations:
         st.subheader("Les utilisateurs ont aussi aimé :")
         
         rec_cols = st.columns(3)
-        for i, (index, row) in enumerate(recommendations.iterrows()):
+        for i in range(len(recommendations)):
             with rec_cols[i % 3]:
-                placeholder_url = "https://image.noelshack.com/fichiers/2026/05/3/1769612385-adobe-express-file.png"
-                
-                r_path = row['Affiche_de_Film']
-                path_str = str(r_path).strip().lower()
-                
-                if pd.notnull(r_path) and path_str != "" and "unknown" not in path_str:
-                    r_img_url = base_url + str(r_path)
-                else:
-                    r_img_url = placeholder_url
+                card_slots.append(st.empty())
+    
+    for key, (genre_fr, synopsis_fr) in store.iter_completed(translation_groups):
+        if key == 'film':
+            with details:
+                st.markdown("---")
+                col_img, col_det = st.columns([1, 2])
                 
-                st.image(r_img_url, use_container_width=True)
-                st.write(f"**{row['Titre']}**")
-                st.write(f"**Genre :** {traduire_en_francais(row['Genre'])}")
-                st.write(f"**Réalisateur :** {row['Réalisateur']}")
-                st.caption(f"Note: {row['Note']:.1f} | {int(row['Année_de_Sortie']) if pd.notnull(row['Année_de_Sortie']) else ''}")
+                with col_img:
+                    path = movie_info['Affiche_de_Film']
+                    if is_valid_poster(path):
+                        img_url = posters.thumbnail(path) or POSTER_BASE_URL + path
+                    else:
+                        img_url = "https://via.placeholder.com/500x750?text=No+Image"
+                    st.image(img_url, use_container_width=True)
                 
-                with st.expander("Lire le synopsis"):
-                    st.write(traduire_en_francais(row['Synopsis']))
+                with col_det:
+                    st.header(movie_info['Titre'])
+                    st.subheader(f"Année : {int(movie_info['Année_de_Sortie']) if pd.notnull(movie_info['Année_de_Sortie']) else 'N/A'}")
+                    
+                    m1, m2, m3 = st.columns(3)
+                    m1.metric("Note", f" {movie_info['Note']:.1f}/10")
+                    m2.metric("Durée", f" {movie_info['Durée']} min")
+                    
+                    st.write(f"**Genre :** {genre_fr}")
+                    st.write(f"**Réalisateur :** {movie_info['Réalisateur']}")
+                    st.write(f"**Casting :** {movie_info['Acteur']}, {movie_info['Actrice']}")
+                    st.write("**Synopsis :**")
+                    st.write(synopsis_fr)
+            continue
+        
+        row = recommendations.iloc[key]
+        with card_slots[key].container():
+            placeholder_url = "https://image.noelshack.com/fichiers/2026/05/3/1769612385-adobe-express-file.png"
+            
+            r_path = row['Affiche_de_Film']
+            
+            if is_valid_poster(r_path):
+                r_img_url = posters.thumbnail(r_path) or POSTER_BASE_URL + r_path
+            else:
+                r_img_url = placeholder_url
+            
+            st.image(r_img_url, use_container_width=True)
+            st.write(f"**{row['Titre']}**")
+            st.write(f"**Genre :** {genre_fr}")
+            st.write(f"**Réalisateur :** {row['Réalisateur']}")
+            st.caption(f"Note: {row['Note']:.1f} | {int(row['Année_de_Sortie']) if pd.notnull(row['Année_de_Sortie']) else ''}")
+            
+            with st.expander("Lire le synopsis"):
+                st.write(synopsis_fr)
 
 # =========================
 # FOOTER
@@ -940,34 +1183,34 @@ st.markdown("""
 
 """, unsafe_allow_html=True)
 
+# =========================
+# TEMPS DE CHARGEMENT DES PAGES
+# =========================
 
+# Imports à froid de chaque page visitée depuis le démarrage du serveur
+with st.sidebar.expander("Temps de chargement"):
+    for page, seconds in IMPORT_TIMES.items():
+        st.write(f"**{page}** : {1000 * seconds:.0f} ms")
+    st.caption(f"Budget du premier affichage : {1000 * STARTUP_BUDGET:.0f} ms "
+               f"(mesure à froid : `python -m creuze.imports`)")
 
+# =========================
+# PANNEAU DE DÉBOGAGE (?debug=1)
+# =========================
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+run = METRICS.end_run(page=menu)
+if st.query_params.get('debug') == '1':
+    import pandas as pd
+    with st.sidebar.expander("Performances", expanded=True):
+        st.caption(f"Dernier rerun : {run['total_ms']:.0f} ms")
+        st.dataframe(pd.DataFrame([{'section': '  ' * span['depth'] + span['name'], 'ms': span['ms']}
+                                   for span in run['spans']]), hide_index=True)
+        st.markdown("**Caches**")
+        st.dataframe(pd.DataFrame(METRICS.cache_summary()), hide_index=True)
+        st.markdown("**Cumul depuis le démarrage**")
+        st.dataframe(pd.DataFrame(METRICS.summary()), hide_index=True)
+        st.download_button("Exécutions (JSON lines)",
+                           "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in METRICS.runs),
+                           file_name="creuze_runs.jsonl", mime="application/x-ndjson")
+        st.download_button("Métriques (Prometheus)", METRICS.to_prometheus(),
+                           file_name="creuze.prom", mime="text/plain")
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from creuze.etl.afcae import AfcaeScraper, parse_page
+
+# =========================
+# SCRAPER AFCAE CONTRE UN SERVEUR HTTP LOCAL
+# =========================
+
+ROWS = 3
+BLOCKED_ONCE = 2      # 403 à la première requête, puis page normale
+MISSING = 3           # 404
+CHALLENGE = 4         # 200 sans tableau de résultats (défi Cloudflare)
+
+OVERLAP = 1           # première ligne = dernière de la page précédente
+
+def row(page, i):
+    return (f'<tr><td class="views-field views-field-title"> Film {page}-{i} </td>'
+            f'<td class="views-field views-field-field-director-text">NOM{i} Prénom</td>'
+            f'<td class="views-field views-field-field-release-date">01/02/2020</td>'
+            f'<td class="views-field views-field-field-label">Recherche</td>'
+            f'<td class="views-field views-field-field-visa">{page * 100 + i}</td></tr>')
+
+def html(page):
+    rows = "".join(row(page, i) for i in range(ROWS))
+    if page == OVERLAP:
+        # Pagination décalée : un film de la page précédente revient en tête
+        rows = row(page - 1, ROWS - 1) + "".join(row(page, i) for i in range(ROWS - 1))
+    return f"<html><body><table><thead><tr><th>Titre</th></tr></thead><tbody>{rows}</tbody></table></body></html>"
+
+class Handler(BaseHTTPRequestHandler):
+    hits = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query)['page'][0])
+        self.hits[page] = self.hits.get(page, 0) + 1
+        if page == BLOCKED_ONCE and self.hits[page] == 1:
+            return self._send(403)
+        if page == MISSING:
+            return self._send(404)
+        if page == CHALLENGE:
+            return self._send(200, b"<html><body>Just a moment...</body></html>")
+        body = html(page).encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304)
+        self._send(200, body, [('ETag', etag), ('Content-Type', 'text/html; charset=utf-8')])
+
+@pytest.fixture
+def server():
+    Handler.hits = {}
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/films"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def scraper(server, tmp_path):
+    return AfcaeScraper(cache_dir=str(tmp_path), base_url=server, workers=2, rate=0,
+                        timeout=5, blocked_pause=0.01, log=lambda message: None)
+
+def test_parse_page():
+    films = parse_page(html(5), 5)
+    assert len(films) == ROWS
+    assert films[0]['Titre'] == "Film 5-0"
+    assert films[0]['VISA'] == "500"
+    # Cellule absente du gabarit
+    assert films[0]['Distributeur'] == "N/A"
+    assert {film['Source_Page'] for film in films} == {5}
+
+def test_parse_page_without_table():
+    with pytest.raises(ValueError):
+        parse_page("<html><body>Just a moment...</body></html>", 4)
+
+def test_run_checkpoints_and_retries(scraper):
+    stats = scraper.run(range(5))
+    assert stats == {'en cache': 0, 'téléchargées': 3, 'inchangées': 0, 'échecs': 2}
+    # Page bloquée une fois : retentée puis sauvegardée
+    assert Handler.hits[BLOCKED_ONCE] == 2
+    assert len(scraper.checkpoint(BLOCKED_ONCE)['films']) == ROWS
+    # Échecs (404, page sans tableau) jamais sauvegardés
+    assert scraper.checkpoint(MISSING) is None
+    assert scraper.checkpoint(CHALLENGE) is None
+    films = scraper.films(range(5))
+    # Film revu sur la page suivante gardé une seule fois, à sa première page
+    assert len(films) == 3 * ROWS - 1
+    assert not films.duplicated(['Titre', 'VISA']).any()
+    assert (films['Titre'] == f"Film 0-{ROWS - 1}").sum() == 1
+    assert list(films['Source_Page'].unique()) == [0, 1, BLOCKED_ONCE]
+
+def test_rerun_resumes_from_checkpoints(scraper):
+    scraper.run(range(5))
+    hits = dict(Handler.hits)
+    stats = scraper.run(range(5))
+    assert stats == {'en cache': 3, 'téléchargées': 0, 'inchangées': 0, 'échecs': 2}
+    # Seules les pages en échec sont redemandées
+    assert {page for page in hits if Handler.hits[page] > hits[page]} == {MISSING, CHALLENGE}
+
+def test_refresh_revalidates_with_etag(scraper):
+    scraper.run(range(3))
+    stats = scraper.run(range(3), refresh=True)
+    assert stats == {'en cache': 0, 'téléchargées': 0, 'inchangées': 3, 'échecs': 0}
+    assert len(scraper.films(range(3))) == 3 * ROWS - 1
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+from creuze.catalog_store import CATALOG_PATH, ingest_catalog
+
+# =========================
+# APPLICATION STREAMLIT (APPTEST) : PAGE DE RECOMMANDATION
+# =========================
+
+AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+
+APP = __file__.rsplit('tests', 1)[0] + 'creuze_final.py'
+GENRES = ['Drama', 'Comedy', 'Horror', 'Documentary']
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Catalogue local déjà converti : l'application ne télécharge rien
+    films = pd.DataFrame({
+        'Titre': [f"Film {i}" for i in range(40)],
+        'Genre': [GENRES[i % 4] for i in range(40)],
+        'Réalisateur': [f"Réalisateur {i % 7}" for i in range(40)],
+        'Acteur': [f"Acteur {i % 5}|Acteur {i % 3}" for i in range(40)],
+        'Actrice': [f"Actrice {i % 6}" for i in range(40)],
+        'Synopsis': [f"histoire {i % 9} ville {i % 4}" for i in range(40)],
+        'Note': [5 + i % 5 for i in range(40)],
+        'Durée': [90 + i for i in range(40)],
+        'Année_de_Sortie': [1980 + i for i in range(40)],
+        'Affiche_de_Film': ['UNKNOWN'] * 40,
+        'Catégorie': ['Art et Essai'] * 40,
+        'Id_film': range(1000, 1040),
+    })
+    films.to_csv(tmp_path / 'films.csv', index=False)
+    ingest_catalog(str(tmp_path / 'films.csv'), str(tmp_path / CATALOG_PATH))
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    at.sidebar.radio[0].set_value("Recommandation de Films").run()
+    assert not at.exception, at.exception
+    return at
+
+def test_search_without_match(app):
+    app.text_input[0].input("zzzzqqq").run()
+    assert not app.exception, app.exception
+    assert app.selectbox[0].value is None
+    assert any("Aucun film ne correspond" in info.value for info in app.info)
+    # Sans film choisi, le bouton de recommandation ne peut pas être cliqué
+    assert app.button[0].disabled
@@ -0,0 +1,43 @@
+import threading
+import time
+from creuze.figures import FigureCache
+
+# =========================
+# CACHE DES FIGURES PARTAGÉ ENTRE SESSIONS
+# =========================
+
+def test_figure_built_once_per_version():
+    cache = FigureCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    threads = [threading.Thread(target=cache.figure, args=('ventes', 'v1', build)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert cache.figure('ventes', 'v1', build) is cache.figure('ventes', 'v1', build)
+    cache.figure('ventes', 'v2', build)
+    assert len(calls) == 2
+
+def test_slow_build_does_not_block_other_figures():
+    cache = FigureCache()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(1)
+        return 'lente'
+
+    thread = threading.Thread(target=cache.figure, args=('lente', 'v1', slow))
+    thread.start()
+    started.wait()
+    start = time.perf_counter()
+    assert cache.figure('rapide', 'v1', lambda: 'rapide') == 'rapide'
+    assert time.perf_counter() - start < 0.5
+    thread.join()
@@ -0,0 +1,92 @@
+import gzip
+import pandas as pd
+import pytest
+from creuze.etl.imdb import BASICS, NAMES, PRINCIPALS, imdb_source, run_imdb_pipeline
+
+# =========================
+# ETL IMDB EN FLUX SUR DE PETITS TSV
+# =========================
+
+BASICS_ROWS = [
+    ('tconst', 'titleType', 'primaryTitle', 'originalTitle', 'isAdult', 'startYear', 'endYear',
+     'runtimeMinutes', 'genres'),
+    ('tt0000001', 'movie', 'Premier Film', 'Premier Film', '0', '1990', '\\N', '95', 'Drama'),
+    ('tt0000002', 'tvSeries', 'Une Série', 'Une Série', '0', '2000', '2004', '50', 'Drama'),
+    ('tt0000003', 'movie', 'Trop Ancien', 'Trop Ancien', '0', '1940', '\\N', '80', 'Comedy'),
+    ('tt0000004', 'movie', 'Sans Année', 'Sans Année', '0', '\\N', '\\N', '90', '\\N'),
+    ('tt0000005', 'movie', 'Le "Grand" Film', 'Le "Grand" Film', '0', '2005', '\\N', '\\N',
+     'Comedy,Romance'),
+    ('tt0000006', 'movie', 'Hors TMDB', 'Hors TMDB', '0', '2010', '\\N', '100', 'Action'),
+]
+PRINCIPALS_ROWS = [
+    ('tconst', 'ordering', 'nconst', 'category', 'job', 'characters'),
+    # Deux réalisateurs : seul le premier du générique est gardé
+    ('tt0000001', '1', 'nm0000001', 'director', '\\N', '\\N'),
+    ('tt0000001', '9', 'nm0000009', 'director', '\\N', '\\N'),
+    *[('tt0000001', str(ordering), f'nm00000{10 + ordering}', 'actor', '\\N', '["A"]')
+      for ordering in range(2, 8)],
+    ('tt0000001', '10', 'nm0000020', 'actress', '\\N', '["B"]'),
+    ('tt0000001', '11', 'nm0000021', 'composer', '\\N', '\\N'),
+    ('tt0000002', '1', 'nm0000001', 'director', '\\N', '\\N'),
+    ('tt0000006', '1', 'nm0000022', 'director', '\\N', '\\N'),
+]
+NAMES_ROWS = [
+    ('nconst', 'primaryName', 'birthYear', 'deathYear', 'primaryProfession', 'knownForTitles'),
+    ('nm0000001', 'Réalisatrice Une', '1950', '\\N', 'director', 'tt0000001'),
+    ('nm0000009', 'Réalisateur Deux', '\\N', '\\N', 'director', 'tt0000001'),
+    # nm0000014 absent de name.basics
+    *[(f'nm00000{10 + ordering}', f'Acteur {ordering}', '\\N' if ordering == 6 else '1970', '\\N',
+       'actor', 'tt0000001') for ordering in (2, 3, 5, 6, 7)],
+    ('nm0000020', 'Actrice 1', '1980', '\\N', 'actress', 'tt0000001'),
+    ('nm0000022', 'Réalisateur Hors TMDB', '1960', '\\N', 'director', 'tt0000006'),
+]
+
+def write_tsv(path, rows, compress):
+    text = "".join("\t".join(row) + "\n" for row in rows).encode('utf-8')
+    with (gzip.open if compress else open)(path, 'wb') as f:
+        f.write(text)
+
+@pytest.fixture
+def imdb_dir(tmp_path):
+    write_tsv(tmp_path / f"{BASICS}.tsv.gz", BASICS_ROWS, compress=True)
+    write_tsv(tmp_path / f"{PRINCIPALS}.tsv", PRINCIPALS_ROWS, compress=False)
+    write_tsv(tmp_path / f"{NAMES}.tsv.gz", NAMES_ROWS, compress=True)
+    return str(tmp_path)
+
+def run(imdb_dir, **kwargs):
+    # Blocs minuscules : le filtrage traverse plusieurs lots
+    films = run_imdb_pipeline(imdb_source(BASICS, imdb_dir), imdb_source(PRINCIPALS, imdb_dir),
+                              imdb_source(NAMES, imdb_dir), block_size=256, **kwargs)
+    return films.set_index('tconst')
+
+def test_filters(imdb_dir):
+    films = run(imdb_dir, year_min=1950)
+    # Séries, films trop anciens et sans année exclus
+    assert list(films.index) == ['tt0000001', 'tt0000005', 'tt0000006']
+    films = run(imdb_dir, year_min=1950, tconsts=['tt0000001', 'tt0000005', 'tt0000003'])
+    assert list(films.index) == ['tt0000001', 'tt0000005']
+    assert list(run(imdb_dir, year_min=2006).index) == ['tt0000006']
+
+def test_columns_and_nulls(imdb_dir):
+    films = run(imdb_dir, year_min=1950)
+    assert {'primaryTitle', 'startYear', 'runtimeMinutes', 'genres', 'director_id', 'director_name',
+            'director_birth', 'actors_ids', 'actors_names', 'actresses_ids',
+            'actresses_names'} <= set(films.columns)
+    assert 'titleType' not in films.columns
+    film = films.loc['tt0000005']
+    # Guillemets littéraux, `\N` lu comme valeur manquante
+    assert film['primaryTitle'] == 'Le "Grand" Film'
+    assert pd.isna(film['runtimeMinutes'])
+    assert pd.isna(film['director_id']) and pd.isna(film['actors_ids'])
+    assert films.loc['tt0000001', 'runtimeMinutes'] == 95
+
+def test_crew(imdb_dir):
+    film = run(imdb_dir, year_min=1950).loc['tt0000001']
+    assert film['director_id'] == 'nm0000001'
+    assert film['director_name'] == 'Réalisatrice Une'
+    assert film['director_birth'] == 1950
+    # Cinq premiers acteurs dans l'ordre du générique ; un nom inconnu manque aux noms seulement
+    assert film['actors_ids'] == 'nm0000012|nm0000013|nm0000014|nm0000015|nm0000016'
+    assert film['actors_names'] == 'Acteur 2|Acteur 3|Acteur 5|Acteur 6'
+    assert film['actresses_ids'] == 'nm0000020'
+    assert film['actresses_names'] == 'Actrice 1'
@@ -0,0 +1,49 @@
+import pandas as pd
+from creuze.etl.linkage import afcae_records, catalog_records, link_records
+
+# =========================
+# RAPPROCHEMENT AFCAE <-> CATALOGUE SUR DES COUPLES ÉTIQUETÉS
+# =========================
+
+CATALOG = pd.DataFrame([
+    # original_title, title (TMDB), director_name, release_date, startYear
+    ("The Godfather", "The Godfather", "Francis Ford Coppola", "1972-03-14", 1972),
+    ("Yi Yi", "Yi Yi", "Edward Yang", "2000-05-14", 2000),
+    ("Portrait de la jeune fille en feu", "Portrait of a Lady on Fire", "Céline Sciamma", "2019-05-19", 2019),
+    ("Kôhî jikô", "Café Lumière", "Hou Hsiao-hsien", "2003-08-31", 2003),
+    ("Drive My Car", "Drive My Car", "Ryūsuke Hamaguchi", "2021-07-11", 2021),
+    ("Wheel of Fortune and Fantasy", "Wheel of Fortune and Fantasy", "Ryūsuke Hamaguchi",
+     "2021-03-04", 2021),
+    ("Paterson", "Paterson", "Jim Jarmusch", "2016-11-17", 2016),
+], columns=['original_title', 'title', 'director_name', 'release_date', 'startYear'])
+
+AFCAE = pd.DataFrame([
+    # Titre, Réalisateur (NOM Prénom), Date_Sortie, film attendu (None : aucun)
+    ("Le Parrain", "COPPOLA Francis Ford", "18/10/1972", 0),
+    ("Yi Yi", "YANG Edward", "20/09/2000", 1),
+    ("Portrait de la jeune fille en feu", "SCIAMMA Céline", "18/09/2019", 2),
+    # Titre TMDB, sorti deux ans plus tard en France
+    ("Café Lumière", "HOU Hsiao-hsien", "12/01/2005", 3),
+    # Deux films du réalisateur la même année : le titre traduit ne suffit pas à choisir
+    ("Contes du hasard et autres fantaisies", "HAMAGUCHI Ryusuke", "06/04/2022", None),
+    # Même titre, autre réalisateur
+    ("Paterson", "DUPONT Jean", "21/12/2016", None),
+], columns=['Titre', 'Réalisateur', 'Date_Sortie', 'expected'])
+
+def test_labelled_pairs():
+    matches, stats = link_records(afcae_records(AFCAE), catalog_records(CATALOG))
+    found = dict(zip(matches['row_left'], matches['row_right']))
+    for row, expected in AFCAE['expected'].items():
+        if pd.isna(expected):
+            assert row not in found, AFCAE.loc[row, 'Titre']
+        else:
+            assert found.get(row) == expected, AFCAE.loc[row, 'Titre']
+    # Seul « Le Parrain » est retenu par réalisateur et année
+    assert stats['par_réalisateur'] == 1
+
+def test_translated_title_needs_director_and_year():
+    afcae = pd.DataFrame({'Titre': ["Le Parrain", "Le Parrain"],
+                          'Réalisateur': ["COPPOLA Francis Ford", "COPPOLA Sofia"],
+                          'Date_Sortie': ["18/10/1976", "18/10/1972"]})
+    matches, _ = link_records(afcae_records(afcae), catalog_records(CATALOG))
+    assert matches.empty
@@ -0,0 +1,41 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+# =========================
+# EMPREINTE DU CODE DES ÉTAPES ETL
+# =========================
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Empreintes des étapes importées, puis sous `python -m creuze.etl.catalog` (module '__main__')
+SCRIPT = """
+import json, runpy, sys
+from creuze.etl.catalog import STAGES
+imported = {stage.name: stage.code_hash for stage in STAGES}
+sys.argv = ['catalog', '--status', '--workdir', sys.argv[1]]
+main = runpy.run_module('creuze.etl.catalog', run_name='__main__', alter_sys=True)
+print(json.dumps({'import': imported, 'main': {stage.name: stage.code_hash for stage in main['STAGES']}}))
+"""
+
+def code_hashes(root, workdir):
+    result = subprocess.run([sys.executable, '-c', SCRIPT, str(workdir)], cwd=root, check=True,
+                            capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': str(root)})
+    return json.loads(result.stdout.splitlines()[-1])
+
+def test_helper_change_invalidates_dependent_stage(tmp_path):
+    root = tmp_path / 'src'
+    shutil.copytree(os.path.join(ROOT, 'creuze'), root / 'creuze',
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    before = code_hashes(root, tmp_path / 'etl')
+    # Même empreinte en import et en ligne de commande : pas de reconstruction en changeant de mode
+    assert before['import'] == before['main']
+
+    with open(root / 'creuze' / 'etl' / 'linkage.py', 'a', encoding='utf-8') as f:
+        f.write("\nMATCH_THRESHOLD = 0.85\n")
+    after = code_hashes(root, tmp_path / 'etl')
+    for mode in ('import', 'main'):
+        changed = {name for name in before[mode] if before[mode][name] != after[mode][name]}
+        assert changed == {'art_essai'}, mode
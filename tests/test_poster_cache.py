@@ -0,0 +1,69 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from PIL import Image
+from creuze.poster_cache import PosterCache
+
+# =========================
+# CACHE DES AFFICHES CONTRE UN SERVEUR HTTP LOCAL
+# =========================
+
+class Handler(SimpleHTTPRequestHandler):
+    requests = []
+    delay = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        time.sleep(self.delay)
+        super().do_GET()
+
+@pytest.fixture
+def server(tmp_path):
+    posters = tmp_path / 'tmdb'
+    posters.mkdir()
+    Image.new('RGB', (500, 750), (200, 30, 30)).save(posters / 'affiche.png')
+    Handler.requests, Handler.delay = [], 0.0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(Handler, directory=str(posters)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def cache(server, tmp_path):
+    return PosterCache(str(tmp_path / 'posters'), base_url=server, width=320, wait=5)
+
+def test_thumbnail_written_and_reused(cache):
+    path = cache.thumbnail('/affiche.png')
+    assert path.endswith(f".{cache.extension}")
+    with Image.open(path) as image:
+        assert image.format == cache.format
+        assert image.size == (320, 480)
+    # Deuxième demande (ou autre session) : lu sur disque, sans requête
+    assert cache.thumbnail('/affiche.png') == path
+    assert Handler.requests == ['/affiche.png']
+    assert os.path.exists(cache.original('/affiche.png'))
+
+def test_unavailable_posters(cache):
+    assert cache.thumbnail('UNKNOWN') is None
+    assert cache.thumbnail('') is None
+    assert cache.thumbnail('/absente.png') is None
+
+def test_slow_download_falls_back_then_completes(cache):
+    Handler.delay = 1.0
+    cache.wait = 0.1
+    start = time.perf_counter()
+    # Pas prête à temps : l'appelant affiche l'URL distante
+    assert cache.thumbnail('/affiche.png') is None
+    assert time.perf_counter() - start < 0.5
+    # La vignette se termine en arrière-plan, sans nouvelle requête
+    for future in cache.prefetch(['/affiche.png']):
+        future.result(timeout=5)
+    assert cache.thumbnail('/affiche.png') is not None
+    assert Handler.requests == ['/affiche.png']
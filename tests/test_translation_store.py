@@ -0,0 +1,75 @@
+import threading
+from creuze.metrics import METRICS
+from creuze.translation_store import TranslationStore
+
+# =========================
+# CACHE DE TRADUCTIONS AVEC UN BACKEND DE SUBSTITUTION
+# =========================
+
+class StubBackend:
+    """Traduction factice ; `release` retient les appels pour simuler un backend lent"""
+
+    def __init__(self, fail=False, release=None):
+        self.calls = []
+        self.fail = fail
+        self.release = release
+
+    def __call__(self, texts, target):
+        self.calls.append(list(texts))
+        if self.release is not None:
+            self.release.wait(5)
+        if self.fail:
+            raise ConnectionError("backend indisponible")
+        return [f"{target}:{text}" for text in texts]
+
+def counter(result):
+    return METRICS.counters[('translations', result)]
+
+def test_persisted_between_stores(tmp_path):
+    path = str(tmp_path / 'translations.sqlite')
+    backend = StubBackend()
+    store = TranslationStore(path, backend=backend)
+    assert store.translate_many(["Drama", "A story", "Drama", "", None]) == \
+        ["fr:Drama", "fr:A story", "fr:Drama", "", ""]
+    # Un seul appel pour les textes absents, doublons et vides exclus
+    assert backend.calls == [["Drama", "A story"]]
+
+    # Autre worker, même fichier : tout vient du cache
+    other = StubBackend()
+    hits, misses = counter('hit'), counter('miss')
+    assert TranslationStore(path, backend=other).translate("A story") == "fr:A story"
+    assert other.calls == []
+    assert (counter('hit') - hits, counter('miss') - misses) == (1, 0)
+    # Une autre langue cible est une autre entrée
+    assert TranslationStore(path, backend=other).translate("A story", target='de') == "de:A story"
+
+def test_backend_failure_not_cached(tmp_path):
+    path = str(tmp_path / 'translations.sqlite')
+    assert TranslationStore(path, backend=StubBackend(fail=True)).translate("Drama") == "Drama"
+    backend = StubBackend()
+    assert TranslationStore(path, backend=backend).translate("Drama") == "fr:Drama"
+    assert backend.calls == [["Drama"]]
+
+def test_submit_many_and_iter_completed(tmp_path):
+    store = TranslationStore(str(tmp_path / 'translations.sqlite'), backend=StubBackend())
+    store.store({"Drama": "Drame"})
+    futures = store.submit_many(["Drama", "Comedy", "Comedy"])
+    assert futures[1] is futures[2]
+    groups = {'film': [(futures[0], "Drama")], 'carte': [(futures[1], "Comedy")]}
+    assert dict(store.iter_completed(groups, timeout=5)) == {'film': ["Drame"], 'carte': ["fr:Comedy"]}
+
+def test_slow_backend_falls_back_to_original(tmp_path):
+    release = threading.Event()
+    backend = StubBackend(release=release)
+    store = TranslationStore(str(tmp_path / 'translations.sqlite'), backend=backend, timeout=0.1)
+    store.store({"Drama": "Drame"})
+    futures = store.submit_many(["Drama", "A slow synopsis"])
+    groups = {'film': [(futures[0], "Drama"), (futures[1], "A slow synopsis")]}
+    timeouts = counter('timeout')
+    # Passé le délai : le texte d'origine, la traduction déjà connue est gardée
+    assert dict(store.iter_completed(groups)) == {'film': ["Drame", "A slow synopsis"]}
+    assert counter('timeout') - timeouts == 1
+    # La traduction se termine en arrière-plan et sert à l'affichage suivant
+    release.set()
+    futures[1].result(timeout=5)
+    assert store.lookup(["A slow synopsis"]) == {"A slow synopsis": "fr:A slow synopsis"}